@@ -0,0 +1,66 @@
+"""restaurant_completed_partial_index
+
+Revision ID: 2c9d4b7e6a15
+Revises: f08a3c5e7d19
+Create Date: 2026-10-16 14:51:09.283746
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c9d4b7e6a15'
+down_revision: Union[str, Sequence[str], None] = 'f08a3c5e7d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace idx_completed_at with a per-restaurant completed index.
+
+    Reporting on a restaurant's recently completed authorizations could not
+    use either existing index without a sort: idx_restaurant_created is
+    ordered by creation time and idx_completed_at ignores the restaurant.
+    (restaurant_id, completed_at DESC) matches that query's WHERE and ORDER BY.
+
+    Nothing queries completed_at across all restaurants, so idx_completed_at
+    is dropped. idx_restaurant_created is kept for listings that include
+    in-flight requests.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_restaurant_completed',
+            'auth_request_state',
+            ['restaurant_id', sa.text('completed_at DESC')],
+            postgresql_where=sa.text('completed_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_completed_at',
+            table_name='auth_request_state',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the restaurant-agnostic idx_completed_at index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_completed_at',
+            'auth_request_state',
+            [sa.text('completed_at DESC')],
+            postgresql_where=sa.text('completed_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_restaurant_completed',
+            table_name='auth_request_state',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
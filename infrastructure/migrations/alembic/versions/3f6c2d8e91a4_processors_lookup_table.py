@@ -0,0 +1,65 @@
+"""processors_lookup_table
+
+Revision ID: 3f6c2d8e91a4
+Revises: e4a9c1f07b52
+Create Date: 2026-10-16 11:20:45.381902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2d8e91a4'
+down_revision: Union[str, Sequence[str], None] = 'e4a9c1f07b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the check_processor CHECK constraint with a processors lookup table.
+
+    Every new processor used to require dropping and re-creating the CHECK
+    constraint, which revalidates all of restaurant_payment_configs. With a
+    foreign key to a lookup table, adding a processor is a one-row INSERT:
+
+        INSERT INTO processors (name) VALUES ('new_processor');
+    """
+    processors = op.create_table(
+        'processors',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    op.bulk_insert(
+        processors,
+        [
+            {'name': 'stripe'},
+            {'name': 'chase'},
+            {'name': 'worldpay'},
+            {'name': 'mock'},
+        ]
+    )
+
+    op.drop_constraint('check_processor', 'restaurant_payment_configs', type_='check')
+    op.create_foreign_key(
+        'fk_processor',
+        'restaurant_payment_configs',
+        'processors',
+        ['processor_name'],
+        ['name']
+    )
+
+
+def downgrade() -> None:
+    """Restore the check_processor CHECK constraint."""
+    op.drop_constraint('fk_processor', 'restaurant_payment_configs', type_='foreignkey')
+    op.create_check_constraint(
+        'check_processor',
+        'restaurant_payment_configs',
+        "processor_name IN ('stripe', 'chase', 'worldpay', 'mock')"
+    )
+
+    op.drop_table('processors')
@@ -0,0 +1,73 @@
+"""sequence_ordered_event_indexes
+
+Revision ID: 5d1e7a93b0c4
+Revises: c20f251409fa
+Create Date: 2026-10-16 09:40:51.102847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7a93b0c4'
+down_revision: Union[str, Sequence[str], None] = 'c20f251409fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Order event indexes by the identity column instead of created_at.
+
+    created_at is the inserting transaction's start time, so it is not
+    monotonic across concurrent writers. The identity column `id` is, which
+    makes it the right cursor for catch-up reads (`WHERE id > $1 ORDER BY id`).
+    The primary key already indexes `id`, so idx_created_at is simply dropped.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_event_type_id',
+            'payment_events',
+            ['event_type', sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_event_type_created',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'idx_created_at',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the created_at ordered indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_created_at',
+            'payment_events',
+            [sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'idx_event_type_created',
+            'payment_events',
+            ['event_type', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_event_type_id',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
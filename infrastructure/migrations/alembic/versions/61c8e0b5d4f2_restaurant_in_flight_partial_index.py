@@ -0,0 +1,48 @@
+"""restaurant_in_flight_partial_index
+
+Revision ID: 61c8e0b5d4f2
+Revises: d92b6f4a1e37
+Create Date: 2026-10-16 12:58:26.094431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '61c8e0b5d4f2'
+down_revision: Union[str, Sequence[str], None] = 'd92b6f4a1e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a per-restaurant index over in-flight auth requests.
+
+    Listing a restaurant's PENDING/PROCESSING requests newest-first otherwise
+    has to combine idx_restaurant_created with the restaurant-agnostic
+    idx_status partial index and sort the result. This index matches the
+    WHERE and ORDER BY of that query directly, and only holds in-flight rows.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_restaurant_pending',
+            'auth_request_state',
+            ['restaurant_id', sa.text('created_at DESC')],
+            postgresql_where=sa.text("status IN ('PENDING', 'PROCESSING')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the in-flight per-restaurant index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_restaurant_pending',
+            table_name='auth_request_state',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""unlogged_auth_processing_locks
+
+Revision ID: 7e3b5a0d9c21
+Revises: 2c9d4b7e6a15
+Create Date: 2026-10-16 15:22:37.604918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3b5a0d9c21'
+down_revision: Union[str, Sequence[str], None] = '2c9d4b7e6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Stop WAL-logging the worker lock table.
+
+    Every auth request inserts, takes over or deletes a row in
+    auth_processing_locks, and each of those writes was WAL-logged and
+    replicated although the rows only matter while a worker is running.
+    An unlogged table skips WAL entirely.
+
+    The table is truncated after a crash of the database server, which
+    releases every lock at once. That is the same outcome as all locks
+    reaching their TTL: the PROCESSING state is still recorded in the
+    (logged) event store, and SQS redelivers the messages. Unlogged
+    tables are not replicated, but only the workers read this table and
+    they always use the primary.
+
+    SET UNLOGGED rewrites the table under an ACCESS EXCLUSIVE lock; the
+    table only ever holds in-flight requests, so this is brief.
+    """
+    op.execute('ALTER TABLE auth_processing_locks SET UNLOGGED')
+
+
+def downgrade() -> None:
+    """WAL-log the worker lock table again."""
+    op.execute('ALTER TABLE auth_processing_locks SET LOGGED')
@@ -0,0 +1,63 @@
+"""outbox_pending_partial_index_by_id
+
+Revision ID: 8b3f40e6a2d7
+Revises: 5d1e7a93b0c4
+Create Date: 2026-10-16 10:05:17.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3f40e6a2d7'
+down_revision: Union[str, Sequence[str], None] = '5d1e7a93b0c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index pending outbox rows by id to match the publisher's poll order.
+
+    The publisher polls `WHERE processed_at IS NULL ORDER BY id LIMIT N FOR
+    UPDATE SKIP LOCKED`. A partial index on id walks the pending set in poll
+    order with no sort, and stays small however many rows have already been
+    published. No INCLUDE columns: FOR UPDATE has to visit the heap to lock
+    each row anyway, so an index-only scan is not possible.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_outbox_unprocessed',
+            'outbox',
+            ['id'],
+            postgresql_where=sa.text('processed_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_unprocessed',
+            table_name='outbox',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the created_at partial index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_unprocessed',
+            'outbox',
+            ['created_at'],
+            postgresql_where=sa.text('processed_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_outbox_unprocessed',
+            table_name='outbox',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,50 @@
+"""drop_auth_request_state_updated_at_trigger
+
+Revision ID: a71d5e2c3b08
+Revises: 3f6c2d8e91a4
+Create Date: 2026-10-16 11:52:09.226714
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71d5e2c3b08'
+down_revision: Union[str, Sequence[str], None] = '3f6c2d8e91a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop the BEFORE UPDATE trigger that maintained auth_request_state.updated_at.
+
+    Every UPDATE of auth_request_state (the worker's read model writers in
+    auth_processor_worker.infrastructure.read_model) already sets updated_at
+    explicitly, so the row-level PL/pgSQL trigger only added per-row overhead.
+    Writers MUST keep setting updated_at themselves.
+    """
+    op.execute('DROP TRIGGER IF EXISTS update_auth_request_state_updated_at ON auth_request_state;')
+    op.execute('DROP FUNCTION IF EXISTS update_updated_at_column();')
+
+
+def downgrade() -> None:
+    """Recreate the updated_at trigger and its function."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+           NEW.updated_at = NOW();
+           RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER update_auth_request_state_updated_at
+            BEFORE UPDATE ON auth_request_state
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
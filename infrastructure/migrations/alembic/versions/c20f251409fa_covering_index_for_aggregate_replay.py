@@ -0,0 +1,65 @@
+"""covering_index_for_aggregate_replay
+
+Revision ID: c20f251409fa
+Revises: 09c2b295afcd
+Create Date: 2026-10-16 09:12:04.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c20f251409fa'
+down_revision: Union[str, Sequence[str], None] = '09c2b295afcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace idx_aggregate_events with a covering index for aggregate replay.
+
+    Replay and void detection read event_id/event_type for every event of an
+    aggregate in sequence order. Including them in the index lets PostgreSQL
+    answer those reads with an index-only scan instead of a heap fetch per
+    event. event_data is deliberately left out: protobuf payloads can exceed
+    the btree tuple size limit and would bloat the index.
+
+    The covering index is built before the old one is dropped so replay is
+    never left without an index.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_aggregate_events_covering',
+            'payment_events',
+            ['aggregate_id', 'sequence_number'],
+            postgresql_include=['event_id', 'event_type'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_aggregate_events',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the plain (aggregate_id, sequence_number) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_aggregate_events',
+            'payment_events',
+            ['aggregate_id', 'sequence_number'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_aggregate_events_covering',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,50 @@
+"""brin_index_on_payment_events_created_at
+
+Revision ID: d92b6f4a1e37
+Revises: a71d5e2c3b08
+Create Date: 2026-10-16 12:31:40.750118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd92b6f4a1e37'
+down_revision: Union[str, Sequence[str], None] = 'a71d5e2c3b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a BRIN index on payment_events.created_at for time-range scans.
+
+    payment_events is append-only, so created_at follows the physical row
+    order closely. A BRIN index stores one min/max summary per block range,
+    which keeps it a few kilobytes in size however large the table grows,
+    while still pruning most of the heap for `WHERE created_at > $1` scans.
+    Latest-N reads should order by the primary key `id` instead.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_created_at_brin',
+            'payment_events',
+            ['created_at'],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the BRIN index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_created_at_brin',
+            table_name='payment_events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
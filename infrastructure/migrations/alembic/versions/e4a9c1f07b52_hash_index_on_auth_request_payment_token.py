@@ -0,0 +1,60 @@
+"""hash_index_on_auth_request_payment_token
+
+Revision ID: e4a9c1f07b52
+Revises: 8b3f40e6a2d7
+Create Date: 2026-10-16 10:48:33.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c1f07b52'
+down_revision: Union[str, Sequence[str], None] = '8b3f40e6a2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Switch the auth_request_state.payment_token index from btree to hash.
+
+    Payment tokens (pt_<uuid>) are high-entropy and only ever looked up by
+    equality, never by prefix or range. A hash index answers those lookups
+    with a single bucket probe and is smaller than the equivalent btree.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_payment_token_hash',
+            'auth_request_state',
+            ['payment_token'],
+            postgresql_using='hash',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_payment_token',
+            table_name='auth_request_state',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the btree index on payment_token."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_payment_token',
+            'auth_request_state',
+            ['payment_token'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_payment_token_hash',
+            table_name='auth_request_state',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
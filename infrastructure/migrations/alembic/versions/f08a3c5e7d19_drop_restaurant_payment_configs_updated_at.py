@@ -0,0 +1,36 @@
+"""drop_restaurant_payment_configs_updated_at
+
+Revision ID: f08a3c5e7d19
+Revises: b4e7f19a0c63
+Create Date: 2026-10-16 14:22:37.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f08a3c5e7d19'
+down_revision: Union[str, Sequence[str], None] = 'b4e7f19a0c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop the unused restaurant_payment_configs.updated_at column.
+
+    Nothing reads it: the worker looks configs up by restaurant_id only, and
+    no trigger maintains it, so it was only ever set by its default on insert.
+    config_version remains the record of which configuration is live.
+    """
+    op.drop_column('restaurant_payment_configs', 'updated_at')
+
+
+def downgrade() -> None:
+    """Restore updated_at, backfilled with the migration time."""
+    op.add_column(
+        'restaurant_payment_configs',
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+    )
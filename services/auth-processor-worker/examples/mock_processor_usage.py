@@ -10,13 +10,17 @@ import asyncio
 from auth_processor_worker.models import AuthStatus, PaymentData
 from auth_processor_worker.processors import MockProcessor
 
+# MockProcessor holds no per-request state, so examples that use the default
+# configuration share a single instance.
+default_processor = MockProcessor()
+
 
 async def example_basic_usage():
     """Basic mock processor usage - success scenario."""
     print("=== Example 1: Basic Usage (Success) ===\n")
 
-    # Create mock processor with default settings
-    processor = MockProcessor()
+    # Use the shared mock processor with default settings
+    processor = default_processor
 
     # Create payment data with a success test card
     payment_data = PaymentData(
@@ -50,7 +54,7 @@ async def example_decline_scenario():
     """Test card decline scenario."""
     print("=== Example 2: Card Decline (Insufficient Funds) ===\n")
 
-    processor = MockProcessor()
+    processor = default_processor
 
     # Use a test card that simulates insufficient funds
     payment_data = PaymentData(
@@ -79,7 +83,7 @@ async def example_timeout_scenario():
     """Test timeout scenario (retryable error)."""
     print("=== Example 3: Timeout (Retryable Error) ===\n")
 
-    processor = MockProcessor()
+    processor = default_processor
 
     # Use a test card that simulates timeout
     payment_data = PaymentData(
@@ -141,7 +145,7 @@ async def example_with_metadata():
     """Include metadata in authorization request."""
     print("=== Example 5: Authorization with Metadata ===\n")
 
-    processor = MockProcessor()
+    processor = default_processor
 
     payment_data = PaymentData(
         card_number="4242424242424242",
@@ -175,57 +179,71 @@ async def example_with_metadata():
     print()
 
 
+# Test card scenarios for example 6: (card number, description)
+TEST_CARD_SCENARIOS = [
+    ("4242424242424242", "Success - Visa"),
+    ("5555555555554444", "Success - Mastercard"),
+    ("378282246310005", "Success - Amex"),
+    ("4000000000000002", "Decline - Generic"),
+    ("4000000000009995", "Decline - Insufficient Funds"),
+    ("4000000000000069", "Decline - Expired Card"),
+    ("4000000000000127", "Decline - Incorrect CVC"),
+    ("4000000000000341", "Decline - Lost Card"),
+    ("4000000000000226", "Decline - Fraudulent"),
+    ("4000002500003155", "Requires Action - 3D Secure"),
+    ("4000000000000119", "Timeout - Retryable Error"),
+    ("4000000000009987", "Rate Limit - Retryable Error"),
+]
+
+# PaymentData is immutable, so the per-card payloads are built once up front
+TEST_CARD_PAYMENTS = [
+    PaymentData(
+        card_number=card_number,
+        exp_month=12,
+        exp_year=2025,
+        cvv="1234" if card_number.startswith("37") else "123",  # Amex uses 4-digit CVV
+        cardholder_name="Test User",
+    )
+    for card_number, _ in TEST_CARD_SCENARIOS
+]
+
+
 async def example_all_test_cards():
     """Demonstrate all available test card scenarios."""
     print("=== Example 6: All Test Card Scenarios ===\n")
 
-    processor = MockProcessor()
-
-    test_scenarios = [
-        ("4242424242424242", "Success - Visa"),
-        ("5555555555554444", "Success - Mastercard"),
-        ("378282246310005", "Success - Amex"),
-        ("4000000000000002", "Decline - Generic"),
-        ("4000000000009995", "Decline - Insufficient Funds"),
-        ("4000000000000069", "Decline - Expired Card"),
-        ("4000000000000127", "Decline - Incorrect CVC"),
-        ("4000000000000341", "Decline - Lost Card"),
-        ("4000000000000226", "Decline - Fraudulent"),
-        ("4000002500003155", "Requires Action - 3D Secure"),
-        ("4000000000000119", "Timeout - Retryable Error"),
-        ("4000000000009987", "Rate Limit - Retryable Error"),
-    ]
-
-    for card_number, description in test_scenarios:
-        payment_data = PaymentData(
-            card_number=card_number,
-            exp_month=12,
-            exp_year=2025,
-            cvv="123" if not card_number.startswith("37") else "1234",
-            cardholder_name="Test User",
-        )
+    processor = default_processor
 
-        try:
-            result = await processor.authorize(
+    # The authorizations are independent, so issue them concurrently and
+    # report the results in scenario order once they have all completed.
+    results = await asyncio.gather(
+        *(
+            processor.authorize(
                 payment_data=payment_data,
                 amount_cents=1000,
                 currency="USD",
                 config={},
             )
+            for payment_data in TEST_CARD_PAYMENTS
+        ),
+        return_exceptions=True,
+    )
 
-            print(f"✓ {description}")
-            print(f"  Card: {card_number}")
-            print(f"  Status: {result.status}")
-            if result.status == AuthStatus.DENIED:
-                print(f"  Reason: {result.denial_reason}")
-            print()
-
-        except Exception as e:
+    for (card_number, description), result in zip(TEST_CARD_SCENARIOS, results):
+        if isinstance(result, Exception):
             print(f"✗ {description}")
             print(f"  Card: {card_number}")
-            print(f"  Exception: {type(e).__name__}")
-            print(f"  Message: {e}")
+            print(f"  Exception: {type(result).__name__}")
+            print(f"  Message: {result}")
             print()
+            continue
+
+        print(f"✓ {description}")
+        print(f"  Card: {card_number}")
+        print(f"  Status: {result.status}")
+        if result.status == AuthStatus.DENIED:
+            print(f"  Reason: {result.denial_reason}")
+        print()
 
 
 async def example_custom_card_behaviors():
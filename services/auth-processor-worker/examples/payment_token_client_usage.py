@@ -5,14 +5,9 @@ to decrypt payment tokens in the auth processor worker.
 """
 
 import asyncio
-import sys
-from pathlib import Path
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from auth_processor_worker.clients.payment_token_client import PaymentTokenServiceClient
-from auth_processor_worker.config import settings
+from auth_processor_worker.config import PTS
 from auth_processor_worker.models.exceptions import (
     Forbidden,
     ProcessorTimeout,
@@ -26,9 +21,9 @@ async def example_successful_decrypt():
     print("\n=== Example 1: Successful Decryption ===\n")
 
     async with PaymentTokenServiceClient(
-        base_url=settings.payment_token_service.base_url,
-        service_auth_token=settings.payment_token_service.service_auth_token,
-        timeout_seconds=settings.payment_token_service.timeout_seconds,
+        base_url=PTS.base_url,
+        service_auth_token=PTS.service_auth_token,
+        timeout_seconds=PTS.timeout_seconds,
     ) as client:
         try:
             payment_data = await client.decrypt(
@@ -64,9 +59,9 @@ async def example_token_not_found():
     print("\n=== Example 2: Token Not Found ===\n")
 
     async with PaymentTokenServiceClient(
-        base_url=settings.payment_token_service.base_url,
-        service_auth_token=settings.payment_token_service.service_auth_token,
-        timeout_seconds=settings.payment_token_service.timeout_seconds,
+        base_url=PTS.base_url,
+        service_auth_token=PTS.service_auth_token,
+        timeout_seconds=PTS.timeout_seconds,
     ) as client:
         try:
             await client.decrypt(
@@ -80,46 +75,40 @@ async def example_token_not_found():
 
 
 async def example_with_retry_logic():
-    """Example: Implement retry logic for transient errors."""
+    """Example: Let the client retry transient errors."""
     print("\n=== Example 3: Retry Logic for Transient Errors ===\n")
 
-    max_retries = 3
-    retry_count = 0
-
+    # ProcessorTimeout (5xx, timeouts, connection errors) is retried inside
+    # decrypt() with jittered exponential backoff; terminal errors are not.
     async with PaymentTokenServiceClient(
-        base_url=settings.payment_token_service.base_url,
-        service_auth_token=settings.payment_token_service.service_auth_token,
-        timeout_seconds=settings.payment_token_service.timeout_seconds,
+        base_url=PTS.base_url,
+        service_auth_token=PTS.service_auth_token,
+        timeout_seconds=PTS.timeout_seconds,
+        max_retries=PTS.max_retries,
+        base_delay_seconds=PTS.retry_base_delay_seconds,
+        max_delay_seconds=PTS.retry_max_delay_seconds,
+        jitter=PTS.retry_jitter,
     ) as client:
-        while retry_count < max_retries:
-            try:
-                payment_data = await client.decrypt(
-                    payment_token="pt_example",
-                    restaurant_id="rest_abc",
-                    requesting_service="auth-processor-worker",
-                )
-
-                print(f"✅ Success on attempt {retry_count + 1}")
-                return payment_data
-
-            except ProcessorTimeout as e:
-                retry_count += 1
-                print(f"⚠️  Attempt {retry_count} failed: {e}")
-
-                if retry_count < max_retries:
-                    # Exponential backoff
-                    wait_time = 2**retry_count
-                    print(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print("❌ Max retries exceeded, sending to DLQ")
-                    raise
-
-            except (TokenNotFound, TokenExpired, Forbidden) as e:
-                # Terminal errors - don't retry
-                print(f"❌ Terminal error: {e}")
-                print("Action: Send to DLQ immediately (no retry)")
-                raise
+        try:
+            payment_data = await client.decrypt(
+                payment_token="pt_example",
+                restaurant_id="rest_abc",
+                requesting_service="auth-processor-worker",
+            )
+
+            print("✅ Token decrypted")
+            return payment_data
+
+        except ProcessorTimeout as e:
+            print(f"❌ Still failing after retries: {e}")
+            print("Action: Leave the message on the queue for redelivery")
+            raise
+
+        except (TokenNotFound, TokenExpired, Forbidden) as e:
+            # Terminal errors - never retried
+            print(f"❌ Terminal error: {e}")
+            print("Action: Send to DLQ immediately (no retry)")
+            raise
 
 
 async def example_configuration():
@@ -128,9 +117,9 @@ async def example_configuration():
 
     # Option 1: Use settings from .env
     client1 = PaymentTokenServiceClient(
-        base_url=settings.payment_token_service.base_url,
-        service_auth_token=settings.payment_token_service.service_auth_token,
-        timeout_seconds=settings.payment_token_service.timeout_seconds,
+        base_url=PTS.base_url,
+        service_auth_token=PTS.service_auth_token,
+        timeout_seconds=PTS.timeout_seconds,
     )
     print(f"Client 1 (from settings): {client1.base_url}")
     await client1.close()
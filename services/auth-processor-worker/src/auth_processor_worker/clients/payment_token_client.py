@@ -1,19 +1,18 @@
 """Payment Token Service client for decrypting payment tokens."""
 
-import sys
-import uuid
-from pathlib import Path
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
 
 import httpx
 import structlog
 
-# Add shared proto directory to Python path
-_shared_proto_path = Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import payment_token_pb2
 
+from auth_processor_worker.config import settings
 from auth_processor_worker.models.exceptions import (
     Forbidden,
     ProcessorTimeout,
@@ -23,6 +22,152 @@ from auth_processor_worker.models.exceptions import (
 
 logger = structlog.get_logger(__name__)
 
+# structlog renders through stdlib logging; checking the stdlib level first lets
+# the per-decrypt INFO logs skip building their kwargs when INFO is disabled
+_stdlib_logger = logging.getLogger(__name__)
+
+# Content type of the protobuf decrypt request and response bodies
+_PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+# Terminal (non-retryable) error statuses: exception, log event, message
+_TERMINAL_STATUS_ERRORS: dict[int, tuple[type[Exception], str, str]] = {
+    404: (TokenNotFound, "payment_token_not_found", "Token {payment_token} not found"),
+    410: (TokenExpired, "payment_token_expired", "Token {payment_token} expired"),
+    403: (Forbidden, "payment_token_forbidden", "Unauthorized access to token {payment_token}"),
+}
+
+# HTTP client shared by all PaymentTokenServiceClient instances in the worker
+_shared_http_client: httpx.AsyncClient | None = None
+
+# Worker-wide client built from settings (see get_shared_client)
+_shared_client: "PaymentTokenServiceClient | None" = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client for the Payment Token Service.
+
+    Created on first use from settings.payment_token_service. Reusing one
+    client keeps connections (and TLS sessions) to the Payment Token Service
+    alive across auth requests instead of reconnecting for every decrypt.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        token_settings = settings.payment_token_service
+        limits = httpx.Limits(
+            max_connections=token_settings.max_connections,
+            max_keepalive_connections=token_settings.max_keepalive_connections,
+            keepalive_expiry=token_settings.keepalive_expiry_seconds,
+        )
+        # A co-located Payment Token Service can be reached over a Unix domain
+        # socket, skipping loopback TCP. The transport owns the pool, so limits
+        # and http2 go on it; requests still use base_url for the Host header.
+        transport = None
+        if token_settings.uds_path:
+            transport = httpx.AsyncHTTPTransport(
+                uds=token_settings.uds_path,
+                limits=limits,
+                http2=token_settings.http2,
+                retries=0,
+            )
+        _shared_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                token_settings.timeout_seconds,
+                connect=token_settings.connect_timeout_seconds,
+                write=token_settings.write_timeout_seconds,
+                pool=token_settings.pool_timeout_seconds,
+            ),
+            limits=limits,
+            http2=token_settings.http2,
+            transport=transport,
+        )
+        logger.info(
+            "payment_token_shared_http_client_created",
+            max_connections=token_settings.max_connections,
+            http2=token_settings.http2,
+            uds_path=token_settings.uds_path,
+        )
+    return _shared_http_client
+
+
+def get_shared_client() -> "PaymentTokenServiceClient":
+    """
+    Get the worker-wide PaymentTokenServiceClient configured from settings.
+
+    Uses the shared HTTP client, and holds the decrypt cache (if enabled) so
+    that it lives across auth requests.
+
+    Returns:
+        Shared PaymentTokenServiceClient
+    """
+    global _shared_client
+    if _shared_client is None:
+        token_settings = settings.payment_token_service
+        _shared_client = PaymentTokenServiceClient(
+            base_url=token_settings.base_url,
+            service_auth_token=token_settings.service_auth_token,
+            timeout_seconds=token_settings.timeout_seconds,
+            http_client=get_shared_http_client(),
+            connect_timeout_seconds=token_settings.connect_timeout_seconds,
+            write_timeout_seconds=token_settings.write_timeout_seconds,
+            pool_timeout_seconds=token_settings.pool_timeout_seconds,
+            max_retries=token_settings.max_retries,
+            base_delay_seconds=token_settings.retry_base_delay_seconds,
+            max_delay_seconds=token_settings.retry_max_delay_seconds,
+            jitter=token_settings.retry_jitter,
+            cache_ttl_seconds=token_settings.cache_ttl_seconds,
+        )
+    return _shared_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared HTTP client, if it was created, and drop the shared client."""
+    global _shared_client, _shared_http_client
+    _shared_client = None
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+        logger.info("payment_token_shared_http_client_closed")
+
+
+class _DecryptCache:
+    """Bounded TTL cache of decrypted PaymentData, least recently used evicted first."""
+
+    def __init__(self, ttl_seconds: float, max_size: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[float, payment_token_pb2.PaymentData]
+        ] = OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> payment_token_pb2.PaymentData | None:
+        """Return a copy of the cached PaymentData, or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payment_data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        cached = payment_token_pb2.PaymentData()
+        cached.CopyFrom(payment_data)
+        return cached
+
+    def put(self, key: tuple[str, str], payment_data: payment_token_pb2.PaymentData) -> None:
+        """Store a copy of payment_data, evicting the least recently used entry if full."""
+        stored = payment_token_pb2.PaymentData()
+        stored.CopyFrom(payment_data)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, stored)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
 
 class PaymentTokenServiceClient:
     """
@@ -40,6 +185,16 @@ class PaymentTokenServiceClient:
         base_url: str,
         service_auth_token: str,
         timeout_seconds: float = 5.0,
+        http_client: httpx.AsyncClient | None = None,
+        connect_timeout_seconds: float = 1.0,
+        write_timeout_seconds: float = 1.0,
+        pool_timeout_seconds: float = 0.5,
+        max_retries: int = 0,
+        base_delay_seconds: float = 0.2,
+        max_delay_seconds: float = 2.0,
+        jitter: float = 0.5,
+        cache_ttl_seconds: float = 0,
+        cache_max_size: int = 1024,
     ):
         """
         Initialize the Payment Token Service client.
@@ -47,39 +202,146 @@ class PaymentTokenServiceClient:
         Args:
             base_url: Base URL of the Payment Token Service (e.g., "http://localhost:8000")
             service_auth_token: Service authentication token for X-Service-Auth header
-            timeout_seconds: Request timeout in seconds (default: 5.0)
+            timeout_seconds: Read timeout in seconds, i.e. how long to wait for
+                the service to respond (default: 5.0)
+            http_client: Optional HTTP client to send requests with (e.g.
+                get_shared_http_client()). The caller keeps ownership of it. If
+                None, the client creates and owns its own.
+            connect_timeout_seconds: Connect (and TLS handshake) timeout of the
+                client's own HTTP client (default: 1.0)
+            write_timeout_seconds: Request send timeout of the client's own
+                HTTP client (default: 1.0)
+            pool_timeout_seconds: How long the client's own HTTP client waits
+                for a free pooled connection (default: 0.5)
+            max_retries: Extra attempts after a retryable failure (default: 0)
+            base_delay_seconds: Backoff before the first retry
+            max_delay_seconds: Upper bound on any single backoff
+            jitter: Random fraction (0-1) added to each backoff
+            cache_ttl_seconds: How long successful decrypts are cached in
+                process, keyed by (payment_token, restaurant_id). 0 (the
+                default) disables the cache. Cached entries hold card data in
+                worker memory, so only enable this where PCI DSS scope allows
+                card data to outlive the request.
+            cache_max_size: Maximum number of cached decrypts
         """
         self.base_url = base_url.rstrip("/")
+        # Parsed once; httpx sends an httpx.URL as-is instead of reparsing a str
+        self._decrypt_url = httpx.URL(f"{self.base_url}/internal/v1/decrypt")
         self.service_auth_token = service_auth_token
         self.timeout_seconds = timeout_seconds
-        self.http_client = httpx.AsyncClient(timeout=timeout_seconds)
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.jitter = jitter
+        # Un-jittered, capped backoff per retry, computed once per client
+        self._retry_delays = tuple(
+            min(max_delay_seconds, base_delay_seconds * 2**attempt)
+            for attempt in range(max_retries)
+        )
+        self._owns_http_client = http_client is None
+        # Static per-client headers; decrypt() only adds X-Request-ID
+        self._headers = {
+            "Content-Type": _PROTOBUF_CONTENT_TYPE,
+            "Accept": _PROTOBUF_CONTENT_TYPE,
+            "X-Service-Auth": service_auth_token,
+        }
+        # Connect/write/pool fail fast so a hung connect cannot use up the
+        # whole budget; the read timeout bounds the service's own latency
+        self.http_client = http_client or httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                timeout_seconds,
+                connect=connect_timeout_seconds,
+                write=write_timeout_seconds,
+                pool=pool_timeout_seconds,
+            )
+        )
+        # Reused for parsing every decrypt response (see _post_decrypt)
+        self._scratch_response = payment_token_pb2.DecryptPaymentTokenResponse()
+        self._cache = (
+            _DecryptCache(cache_ttl_seconds, cache_max_size) if cache_ttl_seconds > 0 else None
+        )
+        # In-flight decrypts by cache key, so concurrent misses share one request
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
 
         logger.info(
             "payment_token_service_client_initialized",
             base_url=base_url,
+            decrypt_url=str(self._decrypt_url),
             timeout_seconds=timeout_seconds,
+            max_retries=max_retries,
         )
 
     async def close(self) -> None:
-        """Close the HTTP client connection pool."""
-        await self.http_client.aclose()
+        """Close the HTTP client connection pool, unless it was injected."""
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def warmup(self) -> None:
+        """
+        Open a connection to the Payment Token Service ahead of the first decrypt.
+
+        Sends GET /health so the TCP (and TLS) handshake happens at worker
+        startup instead of on the first auth request. The connection is then
+        kept alive in the pool. Failures are logged and ignored; decrypt()
+        connects on demand as usual.
+        """
+        try:
+            response = await self.http_client.get(f"{self.base_url}/health")
+            logger.info("payment_token_service_warmed_up", status_code=response.status_code)
+        except httpx.HTTPError as e:
+            logger.warning("payment_token_service_warmup_failed", error=str(e))
+
+    @staticmethod
+    def serialize_decrypt_request(
+        payment_token: str,
+        restaurant_id: str,
+        requesting_service: str,
+    ) -> bytes:
+        """
+        Serialize a DecryptPaymentTokenRequest for decrypt(request_body=...).
+
+        Callers that retry the same decrypt can serialize once and reuse the
+        bytes on every attempt.
+
+        Args:
+            payment_token: Payment token to decrypt (format: pt_<uuid>)
+            restaurant_id: Restaurant ID for authorization check
+            requesting_service: Name of the requesting service
+
+        Returns:
+            Serialized protobuf request body
+        """
+        return payment_token_pb2.DecryptPaymentTokenRequest(
+            payment_token=payment_token,
+            restaurant_id=restaurant_id,
+            requesting_service=requesting_service,
+        ).SerializeToString()
 
     async def decrypt(
         self,
         payment_token: str,
         restaurant_id: str,
         requesting_service: str,
+        request_body: bytes | None = None,
     ) -> payment_token_pb2.PaymentData:
         """
         Decrypt a payment token to retrieve payment card data.
 
         Calls the Payment Token Service /internal/v1/decrypt endpoint with
-        proper authentication and serialization.
+        proper authentication and serialization. Retryable failures are
+        retried up to max_retries times with jittered exponential backoff,
+        reusing the serialized request; terminal errors are raised at once.
+
+        If the decrypt cache is enabled, a cached result is returned without
+        calling the service, and concurrent calls for the same token share a
+        single request.
 
         Args:
             payment_token: Payment token to decrypt (format: pt_<uuid>)
             restaurant_id: Restaurant ID for authorization check
             requesting_service: Name of the requesting service (e.g., "auth-processor-worker")
+            request_body: Optional body from serialize_decrypt_request() for the
+                same arguments. If None, the request is serialized here.
 
         Returns:
             PaymentData protobuf message with decrypted card details
@@ -88,95 +350,192 @@ class PaymentTokenServiceClient:
             TokenNotFound: 404 - token doesn't exist (TERMINAL error)
             TokenExpired: 410 - token expired (TERMINAL error)
             Forbidden: 403 - restaurant mismatch or unauthorized (TERMINAL error)
-            ProcessorTimeout: 5xx or timeout (RETRYABLE error)
+            ProcessorTimeout: 5xx or timeout (RETRYABLE error), after retries
         """
-        correlation_id = str(uuid.uuid4())
-
-        # Build protobuf request
-        request_proto = payment_token_pb2.DecryptPaymentTokenRequest(
-            payment_token=payment_token,
-            restaurant_id=restaurant_id,
-            requesting_service=requesting_service,
-        )
+        if self._cache is None:
+            return await self._decrypt_with_retries(
+                payment_token, restaurant_id, requesting_service, request_body
+            )
 
-        url = f"{self.base_url}/internal/v1/decrypt"
+        key = (payment_token, restaurant_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("payment_token_decrypt_cache_hit", payment_token=payment_token)
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._decrypt_with_retries(
+                    payment_token, restaurant_id, requesting_service, request_body
+                )
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
 
-        logger.info(
-            "payment_token_decrypt_request",
-            payment_token=payment_token,
-            restaurant_id=restaurant_id,
-            requesting_service=requesting_service,
-            correlation_id=correlation_id,
-            url=url,
-        )
+        # Shield so one cancelled caller does not cancel the shared request
+        payment_data = await asyncio.shield(inflight)
+        self._cache.put(key, payment_data)
+        return self._cache.get(key)
 
-        try:
-            response = await self.http_client.post(
-                url,
-                headers={
-                    "Content-Type": "application/x-protobuf",
-                    "X-Service-Auth": self.service_auth_token,
-                    "X-Request-ID": correlation_id,
-                },
-                content=request_proto.SerializeToString(),
+    async def _decrypt_with_retries(
+        self,
+        payment_token: str,
+        restaurant_id: str,
+        requesting_service: str,
+        request_body: bytes | None,
+    ) -> payment_token_pb2.PaymentData:
+        """Decrypt via the service, retrying retryable failures (no caching)."""
+        if request_body is None:
+            request_body = self.serialize_decrypt_request(
+                payment_token, restaurant_id, requesting_service
             )
 
-            # Handle error responses
-            if response.status_code == 404:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._post_decrypt(
+                    request_body, payment_token, restaurant_id, requesting_service
+                )
+            except ProcessorTimeout as e:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = min(
+                    self.max_delay_seconds,
+                    self._retry_delays[attempt] * (1 + random.random() * self.jitter),
+                )
                 logger.warning(
-                    "payment_token_not_found",
+                    "payment_token_decrypt_retrying",
                     payment_token=payment_token,
-                    correlation_id=correlation_id,
+                    attempt=attempt + 1,
+                    delay_seconds=round(delay, 3),
+                    error=str(e),
                 )
-                raise TokenNotFound(f"Token {payment_token} not found")
+                await asyncio.sleep(delay)
 
-            elif response.status_code == 410:
-                logger.warning(
-                    "payment_token_expired",
+    async def decrypt_batch(
+        self,
+        items: list[tuple[str, str]],
+        requesting_service: str,
+    ) -> list[payment_token_pb2.PaymentData | Exception]:
+        """
+        Decrypt several payment tokens concurrently.
+
+        Each (payment_token, restaurant_id) pair is sent as its own request via
+        decrypt() (with the usual retries), but all requests are in flight at
+        once over the client's connection pool instead of one after another.
+
+        Args:
+            items: (payment_token, restaurant_id) pairs
+            requesting_service: Name of the requesting service
+
+        Returns:
+            One entry per item, in order: the decrypted PaymentData, or the
+            exception decrypt() raised for that item (TokenNotFound,
+            ProcessorTimeout, ...). Failures do not cancel the other items.
+        """
+        return await asyncio.gather(
+            *(
+                self.decrypt(
                     payment_token=payment_token,
-                    correlation_id=correlation_id,
+                    restaurant_id=restaurant_id,
+                    requesting_service=requesting_service,
                 )
-                raise TokenExpired(f"Token {payment_token} expired")
+                for payment_token, restaurant_id in items
+            ),
+            return_exceptions=True,
+        )
+
+    async def _post_decrypt(
+        self,
+        request_body: bytes,
+        payment_token: str,
+        restaurant_id: str,
+        requesting_service: str,
+    ) -> payment_token_pb2.PaymentData:
+        """Send one decrypt request and map the response (no retries)."""
+        # Opaque 128-bit request ID; the Payment Token Service only logs/audits it
+        correlation_id = os.urandom(16).hex()
 
-            elif response.status_code == 403:
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "payment_token_decrypt_request",
+                payment_token=payment_token,
+                restaurant_id=restaurant_id,
+                requesting_service=requesting_service,
+                correlation_id=correlation_id,
+            )
+
+        try:
+            response = await self.http_client.post(
+                self._decrypt_url,
+                headers={**self._headers, "X-Request-ID": correlation_id},
+                content=request_body,
+            )
+
+            status_code = response.status_code
+
+            # Success is by far the most common outcome, so it is checked first
+            if status_code < 300:
+                # Fail fast on a non-protobuf body (e.g. a proxy's HTML or JSON
+                # error page served with 200) instead of handing it to the parser
+                content_type = response.headers.get("content-type", "")
+                if not content_type.startswith(_PROTOBUF_CONTENT_TYPE):
+                    logger.error(
+                        "payment_token_unexpected_content_type",
+                        content_type=content_type,
+                        correlation_id=correlation_id,
+                    )
+                    raise ProcessorTimeout(
+                        f"Payment Token Service returned unexpected content type: {content_type!r}"
+                    )
+
+                # Parse successful response into the reusable scratch message and
+                # hand the caller a detached copy of payment_data. There is no
+                # await between Clear() and CopyFrom(), so concurrent decrypts on
+                # this client cannot interleave on the scratch message.
+                response_proto = self._scratch_response
+                response_proto.Clear()
+                response_proto.ParseFromString(response.content)
+                payment_data = payment_token_pb2.PaymentData()
+                payment_data.CopyFrom(response_proto.payment_data)
+                response_proto.Clear()
+
+                if _stdlib_logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "payment_token_decrypt_success",
+                        payment_token=payment_token,
+                        correlation_id=correlation_id,
+                        card_last4=(
+                            payment_data.card_number[-4:] if payment_data.card_number else None
+                        ),
+                    )
+
+                return payment_data
+
+            # Error responses
+            terminal_error = _TERMINAL_STATUS_ERRORS.get(status_code)
+            if terminal_error is not None:
+                exc_class, log_event, message = terminal_error
                 logger.warning(
-                    "payment_token_forbidden",
+                    log_event,
                     payment_token=payment_token,
                     restaurant_id=restaurant_id,
                     correlation_id=correlation_id,
                 )
-                raise Forbidden(f"Unauthorized access to token {payment_token}")
+                raise exc_class(message.format(payment_token=payment_token))
 
-            elif response.status_code >= 500:
+            if status_code >= 500:
                 logger.error(
                     "payment_token_service_error",
-                    status_code=response.status_code,
+                    status_code=status_code,
                     correlation_id=correlation_id,
                 )
-                raise ProcessorTimeout(
-                    f"Payment Token Service unavailable (status: {response.status_code})"
-                )
+                raise ProcessorTimeout(f"Payment Token Service unavailable (status: {status_code})")
 
             # Raise for other error status codes
             response.raise_for_status()
 
-            # Parse successful response
-            response_proto = payment_token_pb2.DecryptPaymentTokenResponse()
-            response_proto.ParseFromString(response.content)
-
-            logger.info(
-                "payment_token_decrypt_success",
-                payment_token=payment_token,
-                correlation_id=correlation_id,
-                card_last4=(
-                    response_proto.payment_data.card_number[-4:]
-                    if response_proto.payment_data.card_number
-                    else None
-                ),
-            )
-
-            return response_proto.payment_data
-
         except httpx.TimeoutException as e:
             logger.error(
                 "payment_token_service_timeout",
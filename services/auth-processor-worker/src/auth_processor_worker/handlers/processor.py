@@ -10,24 +10,23 @@ This module implements the main workflow that ties together all components:
 - Error handling and retries
 """
 
-import sys
+import time
 import uuid
-from datetime import datetime
-from pathlib import Path
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Any
 
 import structlog
 
-# Add shared proto directory to Python path
-_shared_proto_path = Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import authorization_pb2, events_pb2
 
-from auth_processor_worker.clients.payment_token_client import PaymentTokenServiceClient
+from auth_processor_worker.clients.payment_token_client import (
+    PaymentTokenServiceClient,
+    get_shared_client,
+)
 from auth_processor_worker.config import settings
-from auth_processor_worker.infrastructure import database, event_store, locking, read_model, transaction
+from auth_processor_worker.infrastructure import database, locking, read_model, transaction
+from auth_processor_worker.infrastructure.locking import LockStartResult
 from auth_processor_worker.models.authorization import AuthStatus, PaymentData
 from auth_processor_worker.models.exceptions import (
     Forbidden,
@@ -39,6 +38,16 @@ from auth_processor_worker.processors.factory import get_processor
 
 logger = structlog.get_logger(__name__)
 
+# AuthRequestExpired.reason when a void beats the worker to the request
+VOID_BEFORE_PROCESSING_REASON = "Void detected before processing could begin"
+
+# Auth requests that failed terminally because the request or its restaurant
+# config was missing, remembered so redeliveries skip the lock, the started
+# event and the lookup. Bounded; oldest entries are evicted first.
+NEGATIVE_CACHE_TTL_SECONDS = 60
+NEGATIVE_CACHE_MAX_SIZE = 10_000
+_negative_cache: OrderedDict[uuid.UUID, float] = OrderedDict()
+
 
 class ProcessingResult:
     """Result of processing an auth request."""
@@ -62,12 +71,14 @@ async def process_auth_request(
     This function implements the complete processing workflow:
     1. Acquire distributed lock
     2. Check for void event (race condition)
-    3. Emit AuthAttemptStarted event + update read model
-    4. Fetch auth request details and restaurant config
+    3. Emit AuthAttemptStarted event + update read model, or for a voided
+       request AuthRequestExpired + release the lock
+       (steps 1-3 run in a single transaction)
+    4. Fetch auth request details and restaurant config in one query
     5. Call Payment Token Service to decrypt token
     6. Call payment processor (Stripe)
     7. Atomically record result event + update read model
-    8. Release lock
+    8. Release lock (with the step 7 write for terminal outcomes)
 
     Args:
         auth_request_id: Authorization request ID
@@ -80,109 +91,94 @@ async def process_auth_request(
 
     Error Handling:
         - Lock not acquired → skip (another worker processing)
-        - Void detected → write AuthRequestExpired + update to EXPIRED
+        - Void detected → write AuthRequestExpired + update to EXPIRED (lock released at once)
         - Token errors (404, 410, 403) → terminal failure
         - Processor timeout → retryable failure (up to MAX_RETRIES)
         - Processor decline → write DENIED status (not a failure)
     """
+    # Converted once; used for the log context and event payloads below
+    auth_request_id_str = str(auth_request_id)
+    # Bound once for every log line of this request, including those from the
+    # clients it calls; reset in the finally block below
+    log_context = structlog.contextvars.bind_contextvars(
+        auth_request_id=auth_request_id_str,
+        worker_id=worker_id,
+        receive_count=receive_count,
+    )
     lock_acquired = False
     max_retries = settings.worker.max_retries
 
     try:
-        # Step 1: Acquire distributed lock
-        lock_acquired = await locking.acquire_lock(
+        if _is_known_missing(auth_request_id):
+            # The terminal failure was already recorded on the first delivery
+            logger.info("processing_skipped_known_missing")
+            return ProcessingResult.TERMINAL_FAILURE
+
+        # Steps 1-3: Acquire distributed lock, check for void event (race
+        # condition) and emit AuthAttemptStarted + update read model, all in
+        # one transaction. A voided request is recorded as expired and its
+        # lock released in that same transaction.
+        now = time.time()
+        started_event = _create_attempt_started_event(auth_request_id_str, worker_id, now)
+        expired_event = _create_expired_event(auth_request_id_str, worker_id, now)
+        lock_result = await locking.acquire_and_start(
             auth_request_id=auth_request_id,
             worker_id=worker_id,
             ttl_seconds=settings.worker.lock_ttl_seconds,
+            started_event_data=started_event.SerializeToString(),
+            expired_event_data=expired_event.SerializeToString(),
+            metadata=_create_metadata(worker_id, now),
         )
 
-        if not lock_acquired:
-            logger.info(
-                "processing_skipped_lock_not_acquired",
-                auth_request_id=str(auth_request_id),
-                worker_id=worker_id,
-            )
+        if lock_result == LockStartResult.LOCK_HELD:
+            logger.info("processing_skipped_lock_not_acquired")
             return ProcessingResult.SKIPPED_LOCK_NOT_ACQUIRED
 
-        logger.info(
-            "processing_started",
-            auth_request_id=str(auth_request_id),
-            worker_id=worker_id,
-            receive_count=receive_count,
-        )
+        if lock_result == LockStartResult.VOIDED:
+            logger.info("void_detected_before_processing")
+            return ProcessingResult.SKIPPED_VOID_DETECTED
 
-        # Step 2: Check for void event (race condition)
+        lock_acquired = True
+        logger.debug("processing_started")
+
+        # Step 4: Fetch auth request details and restaurant config in a single
+        # round trip (only immutable request fields are used below)
         async with database.get_connection() as conn:
-            void_detected = await event_store.check_for_void_event(
+            bundle = await read_model.get_processing_bundle(
                 conn=conn,
-                aggregate_id=auth_request_id,
+                auth_request_id=auth_request_id,
             )
 
-        if void_detected:
-            logger.info(
-                "void_detected_before_processing",
-                auth_request_id=str(auth_request_id),
+        if bundle["auth_request_id"] is None:
+            logger.error("auth_request_not_found")
+            # Record terminal failure
+            await _record_failure(
+                auth_request_id=auth_request_id,
                 worker_id=worker_id,
+                error_message="Auth request not found in database",
+                error_code="NOT_FOUND",
             )
+            lock_acquired = False
+            _remember_missing(auth_request_id)
+            return ProcessingResult.TERMINAL_FAILURE
+        auth_details = bundle
 
-            # Record AuthRequestExpired event
-            event_data = _create_expired_event(auth_request_id, worker_id)
-            await transaction.record_auth_request_expired(
-                auth_request_id=auth_request_id,
-                event_data=event_data.SerializeToString(),
-                metadata=_create_metadata(worker_id),
+        if bundle["processor_name"] is None:
+            logger.error(
+                "restaurant_config_not_found",
+                restaurant_id=str(auth_details["restaurant_id"]),
             )
-
-            return ProcessingResult.SKIPPED_VOID_DETECTED
-
-        # Step 3: Emit AuthAttemptStarted event + update read model
-        event_data = _create_attempt_started_event(auth_request_id, worker_id)
-        await transaction.record_auth_attempt_started(
-            auth_request_id=auth_request_id,
-            event_data=event_data.SerializeToString(),
-            metadata=_create_metadata(worker_id),
-        )
-
-        # Step 4: Fetch auth request details and restaurant config
-        async with database.get_connection() as conn:
-            auth_details = await read_model.get_auth_request_details(
-                conn=conn,
+            # Record terminal failure
+            await _record_failure(
                 auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                error_message="Restaurant configuration not found",
+                error_code="CONFIG_NOT_FOUND",
             )
-
-            if not auth_details:
-                logger.error(
-                    "auth_request_not_found",
-                    auth_request_id=str(auth_request_id),
-                )
-                # Record terminal failure
-                await _record_terminal_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message="Auth request not found in database",
-                    error_code="NOT_FOUND",
-                )
-                return ProcessingResult.TERMINAL_FAILURE
-
-            restaurant_config = await read_model.get_restaurant_config(
-                conn=conn,
-                restaurant_id=auth_details["restaurant_id"],
-            )
-
-            if not restaurant_config:
-                logger.error(
-                    "restaurant_config_not_found",
-                    auth_request_id=str(auth_request_id),
-                    restaurant_id=str(auth_details["restaurant_id"]),
-                )
-                # Record terminal failure
-                await _record_terminal_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message="Restaurant configuration not found",
-                    error_code="CONFIG_NOT_FOUND",
-                )
-                return ProcessingResult.TERMINAL_FAILURE
+            lock_acquired = False
+            _remember_missing(auth_request_id)
+            return ProcessingResult.TERMINAL_FAILURE
+        restaurant_config = bundle
 
         # Step 5: Call Payment Token Service to decrypt token
         try:
@@ -195,47 +191,38 @@ async def process_auth_request(
             # Terminal errors - cannot recover
             logger.error(
                 "token_service_terminal_error",
-                auth_request_id=str(auth_request_id),
                 error_type=type(e).__name__,
                 error=str(e),
             )
-            await _record_terminal_failure(
+            await _record_failure(
                 auth_request_id=auth_request_id,
                 worker_id=worker_id,
                 error_message=str(e),
                 error_code=type(e).__name__,
             )
+            lock_acquired = False
             return ProcessingResult.TERMINAL_FAILURE
 
         except ProcessorTimeout as e:
             # Retryable error - Payment Token Service unavailable
             logger.warning(
                 "token_service_timeout",
-                auth_request_id=str(auth_request_id),
-                receive_count=receive_count,
                 max_retries=max_retries,
                 error=str(e),
             )
 
-            if receive_count >= max_retries:
-                # Max retries exceeded - record terminal failure
-                await _record_terminal_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message=f"Max retries ({max_retries}) exceeded: {str(e)}",
-                    error_code="MAX_RETRIES_EXCEEDED",
-                )
-                return ProcessingResult.TERMINAL_FAILURE
-            else:
-                # Record retryable failure - message will be retried
-                await _record_retryable_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message=str(e),
-                    error_code="TOKEN_SERVICE_TIMEOUT",
-                    retry_count=receive_count,
-                )
-                return ProcessingResult.RETRYABLE_FAILURE
+            # Retryable until max_retries, then terminal
+            outcome = await _record_timeout_failure(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                error=e,
+                error_code="TOKEN_SERVICE_TIMEOUT",
+                receive_count=receive_count,
+                max_retries=max_retries,
+            )
+            if outcome == ProcessingResult.TERMINAL_FAILURE:
+                lock_acquired = False
+            return outcome
 
         # Step 6: Call payment processor
         processor_name = restaurant_config["processor_name"]
@@ -255,12 +242,14 @@ async def process_auth_request(
             )
 
             # Step 7: Atomically record result event + update read model
+            now = time.time()
             if result.status == AuthStatus.AUTHORIZED:
                 # Success - record AUTHORIZED response
                 event_data = _create_authorized_event(
-                    auth_request_id=auth_request_id,
+                    auth_request_id=auth_request_id_str,
                     worker_id=worker_id,
                     result=result,
+                    now=now,
                 )
                 await transaction.record_auth_response_authorized(
                     auth_request_id=auth_request_id,
@@ -269,12 +258,13 @@ async def process_auth_request(
                     processor_name=result.processor_name,
                     authorized_amount_cents=result.authorized_amount_cents,
                     authorization_code=result.authorization_code or "",
-                    metadata=_create_metadata(worker_id),
+                    metadata=_create_metadata(worker_id, now),
+                    release_lock_worker_id=worker_id,
                 )
+                lock_acquired = False
 
                 logger.info(
                     "processing_completed_authorized",
-                    auth_request_id=str(auth_request_id),
                     processor_name=processor_name,
                     processor_auth_id=result.processor_auth_id,
                 )
@@ -282,9 +272,10 @@ async def process_auth_request(
             else:  # AuthStatus.DENIED
                 # Decline - record DENIED response (not a failure)
                 event_data = _create_denied_event(
-                    auth_request_id=auth_request_id,
+                    auth_request_id=auth_request_id_str,
                     worker_id=worker_id,
                     result=result,
+                    now=now,
                 )
                 await transaction.record_auth_response_denied(
                     auth_request_id=auth_request_id,
@@ -292,12 +283,13 @@ async def process_auth_request(
                     processor_name=result.processor_name,
                     denial_code=result.denial_code or "",
                     denial_reason=result.denial_reason or "",
-                    metadata=_create_metadata(worker_id),
+                    metadata=_create_metadata(worker_id, now),
+                    release_lock_worker_id=worker_id,
                 )
+                lock_acquired = False
 
                 logger.info(
                     "processing_completed_denied",
-                    auth_request_id=str(auth_request_id),
                     processor_name=processor_name,
                     denial_code=result.denial_code,
                 )
@@ -308,54 +300,43 @@ async def process_auth_request(
             # Retryable error - Processor unavailable
             logger.warning(
                 "processor_timeout",
-                auth_request_id=str(auth_request_id),
                 processor_name=processor_name,
-                receive_count=receive_count,
                 max_retries=max_retries,
                 error=str(e),
             )
 
-            if receive_count >= max_retries:
-                # Max retries exceeded - record terminal failure
-                await _record_terminal_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message=f"Max retries ({max_retries}) exceeded: {str(e)}",
-                    error_code="MAX_RETRIES_EXCEEDED",
-                )
-                return ProcessingResult.TERMINAL_FAILURE
-            else:
-                # Record retryable failure - message will be retried
-                await _record_retryable_failure(
-                    auth_request_id=auth_request_id,
-                    worker_id=worker_id,
-                    error_message=str(e),
-                    error_code="PROCESSOR_TIMEOUT",
-                    retry_count=receive_count,
-                )
-                return ProcessingResult.RETRYABLE_FAILURE
+            # Retryable until max_retries, then terminal
+            outcome = await _record_timeout_failure(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                error=e,
+                error_code="PROCESSOR_TIMEOUT",
+                receive_count=receive_count,
+                max_retries=max_retries,
+            )
+            if outcome == ProcessingResult.TERMINAL_FAILURE:
+                lock_acquired = False
+            return outcome
 
     except Exception as e:
         # Unexpected error - log and record terminal failure
         logger.error(
             "processing_unexpected_error",
-            auth_request_id=str(auth_request_id),
-            worker_id=worker_id,
             error=str(e),
             exc_info=True,
         )
 
         try:
-            await _record_terminal_failure(
+            await _record_failure(
                 auth_request_id=auth_request_id,
                 worker_id=worker_id,
                 error_message=f"Unexpected error: {str(e)}",
                 error_code="UNEXPECTED_ERROR",
             )
+            lock_acquired = False
         except Exception as record_error:
             logger.error(
                 "failed_to_record_terminal_failure",
-                auth_request_id=str(auth_request_id),
                 error=str(record_error),
                 exc_info=True,
             )
@@ -363,105 +344,113 @@ async def process_auth_request(
         return ProcessingResult.TERMINAL_FAILURE
 
     finally:
-        # Step 8: Always release lock (even on errors)
+        # Step 8: Release the lock if it is still held. Terminal outcomes
+        # delete it in the transaction that records them (and clear
+        # lock_acquired), so this only runs after retryable failures or
+        # when recording the outcome itself failed
         if lock_acquired:
             try:
                 await locking.release_lock(
                     auth_request_id=auth_request_id,
                     worker_id=worker_id,
                 )
-                logger.info(
-                    "lock_released",
-                    auth_request_id=str(auth_request_id),
-                    worker_id=worker_id,
-                )
+                logger.debug("lock_released")
             except Exception as e:
                 logger.error(
                     "lock_release_failed",
-                    auth_request_id=str(auth_request_id),
-                    worker_id=worker_id,
                     error=str(e),
                     exc_info=True,
                 )
 
+        structlog.contextvars.reset_contextvars(**log_context)
+
 
 # Helper functions for creating events
 
-def _create_metadata(worker_id: str) -> dict[str, Any]:
-    """Create metadata dictionary for events."""
+def _create_metadata(worker_id: str, now: float) -> dict[str, Any]:
+    """Create metadata dictionary for events.
+
+    now is the time.time() value read once for the event, so the metadata
+    timestamp and the event's own timestamp field agree.
+    """
     return {
         "worker_id": worker_id,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
     }
 
 
 def _create_attempt_started_event(
-    auth_request_id: uuid.UUID,
+    auth_request_id: str,
     worker_id: str,
+    now: float,
 ) -> events_pb2.AuthAttemptStarted:
-    """Create AuthAttemptStarted event."""
+    """Create AuthAttemptStarted event.
+
+    restaurant_payment_config_version is left unset: the config is read
+    after the attempt has started.
+    """
     return events_pb2.AuthAttemptStarted(
-        auth_request_id=str(auth_request_id),
+        auth_request_id=auth_request_id,
         worker_id=worker_id,
-        restaurant_payment_config_version="",  # Optional field
-        started_at=int(datetime.utcnow().timestamp()),
+        started_at=int(now),
     )
 
 
 def _create_expired_event(
-    auth_request_id: uuid.UUID,
+    auth_request_id: str,
     worker_id: str,
+    now: float,
 ) -> events_pb2.AuthRequestExpired:
     """Create AuthRequestExpired event."""
     return events_pb2.AuthRequestExpired(
-        auth_request_id=str(auth_request_id),
-        reason="Void detected before processing could begin",
-        expired_at=int(datetime.utcnow().timestamp()),
+        auth_request_id=auth_request_id,
+        reason=VOID_BEFORE_PROCESSING_REASON,
+        expired_at=int(now),
     )
 
 
 def _create_authorized_event(
-    auth_request_id: uuid.UUID,
+    auth_request_id: str,
     worker_id: str,
     result: Any,  # AuthorizationResult
+    now: float,
 ) -> events_pb2.AuthResponseReceived:
     """Create AuthResponseReceived event for AUTHORIZED status."""
-    # Create the nested AuthorizationResult protobuf
-    auth_result_proto = authorization_pb2.AuthorizationResult(
-        processor_auth_id=result.processor_auth_id or "",
-        processor_name=result.processor_name,
-        authorized_amount_cents=result.authorized_amount_cents or 0,
-        currency=result.currency or "",
-        authorization_code=result.authorization_code or "",
-        authorized_at=int(result.authorized_at.timestamp()) if result.authorized_at else int(datetime.utcnow().timestamp()),
-    )
-
+    received_at = int(now)
+    # The nested AuthorizationResult is passed as a dict so it is built in
+    # place in the event instead of as a separate message that gets copied in
     return events_pb2.AuthResponseReceived(
-        auth_request_id=str(auth_request_id),
+        auth_request_id=auth_request_id,
         status=authorization_pb2.AUTH_STATUS_AUTHORIZED,
-        result=auth_result_proto,
-        received_at=int(datetime.utcnow().timestamp()),
+        result={
+            "processor_auth_id": result.processor_auth_id or "",
+            "processor_name": result.processor_name,
+            "authorized_amount_cents": result.authorized_amount_cents or 0,
+            "currency": result.currency or "",
+            "authorization_code": result.authorization_code or "",
+            "authorized_at": int(result.authorized_at.timestamp()) if result.authorized_at else received_at,
+        },
+        received_at=received_at,
     )
 
 
 def _create_denied_event(
-    auth_request_id: uuid.UUID,
+    auth_request_id: str,
     worker_id: str,
     result: Any,  # AuthorizationResult
+    now: float,
 ) -> events_pb2.AuthResponseReceived:
     """Create AuthResponseReceived event for DENIED status."""
-    # Create the nested AuthorizationResult protobuf
-    auth_result_proto = authorization_pb2.AuthorizationResult(
-        processor_name=result.processor_name,
-        denial_code=result.denial_code or "",
-        denial_reason=result.denial_reason or "",
-    )
-
+    # Nested AuthorizationResult built in place (see _create_authorized_event)
     return events_pb2.AuthResponseReceived(
-        auth_request_id=str(auth_request_id),
+        auth_request_id=auth_request_id,
         status=authorization_pb2.AUTH_STATUS_DENIED,
-        result=auth_result_proto,
-        received_at=int(datetime.utcnow().timestamp()),
+        result={
+            "processor_name": result.processor_name,
+            "denial_code": result.denial_code or "",
+            "denial_reason": result.denial_reason or "",
+        },
+        received_at=int(now),
     )
 
 
@@ -476,7 +465,8 @@ async def _decrypt_payment_token(
     Args:
         payment_token: Payment token to decrypt
         restaurant_id: Restaurant ID for authorization
-        client: Optional injected client (for testing). If None, creates a new client.
+        client: Optional injected client (for testing). If None, uses the
+            worker-wide client from get_shared_client().
 
     Returns:
         PaymentData with decrypted card information
@@ -487,78 +477,114 @@ async def _decrypt_payment_token(
         Forbidden: Unauthorized access (terminal error)
         ProcessorTimeout: Service unavailable (retryable error)
     """
-    # Use injected client if provided, otherwise create new one
-    client_provided = client is not None
-    if not client_provided:
-        client = PaymentTokenServiceClient(
-            base_url=settings.payment_token_service.base_url,
-            service_auth_token=settings.payment_token_service.service_auth_token,
-            timeout_seconds=settings.payment_token_service.timeout_seconds,
-        )
+    # Use injected client if provided, otherwise the worker-wide client
+    if client is None:
+        client = get_shared_client()
+
+    payment_data_proto = await client.decrypt(
+        payment_token=payment_token,
+        restaurant_id=restaurant_id,
+        requesting_service="auth-processor-worker",
+    )
 
-    try:
-        payment_data_proto = await client.decrypt(
-            payment_token=payment_token,
-            restaurant_id=restaurant_id,
-            requesting_service="auth-processor-worker",
-        )
+    # Convert protobuf to domain model
+    # Note: billing_zip field exists in domain model but not in protobuf, defaults to None
+    return PaymentData(
+        card_number=payment_data_proto.card_number,
+        exp_month=payment_data_proto.exp_month,
+        exp_year=payment_data_proto.exp_year,
+        cvv=payment_data_proto.cvv,
+        cardholder_name=payment_data_proto.cardholder_name,
+    )
 
-        # Convert protobuf to domain model
-        # Note: billing_zip field exists in domain model but not in protobuf, defaults to None
-        return PaymentData(
-            card_number=payment_data_proto.card_number,
-            exp_month=payment_data_proto.exp_month,
-            exp_year=payment_data_proto.exp_year,
-            cvv=payment_data_proto.cvv,
-            cardholder_name=payment_data_proto.cardholder_name,
-        )
-    finally:
-        # Only close if we created the client ourselves
-        if not client_provided:
-            await client.close()
+
+def _is_known_missing(auth_request_id: uuid.UUID) -> bool:
+    """Return True if auth_request_id recently failed with NOT_FOUND/CONFIG_NOT_FOUND."""
+    expires_at = _negative_cache.get(auth_request_id)
+    if expires_at is None:
+        return False
+    if expires_at <= time.monotonic():
+        del _negative_cache[auth_request_id]
+        return False
+    return True
+
+
+def _remember_missing(auth_request_id: uuid.UUID) -> None:
+    """Add auth_request_id to the negative cache, evicting the oldest entry if full."""
+    _negative_cache[auth_request_id] = time.monotonic() + NEGATIVE_CACHE_TTL_SECONDS
+    _negative_cache.move_to_end(auth_request_id)
+    while len(_negative_cache) > NEGATIVE_CACHE_MAX_SIZE:
+        _negative_cache.popitem(last=False)
 
 
-async def _record_terminal_failure(
+async def _record_failure(
     auth_request_id: uuid.UUID,
     worker_id: str,
     error_message: str,
     error_code: str,
+    retry_count: int | None = None,
 ) -> None:
-    """Record a terminal failure event (not retryable)."""
+    """Record an AuthAttemptFailed event.
+
+    Without retry_count the failure is terminal: status becomes FAILED and
+    the lock is released in the same transaction. With retry_count it is
+    retryable: status stays PROCESSING and the caller still holds the lock.
+    """
+    now = time.time()
     event_data = events_pb2.AuthAttemptFailed(
         auth_request_id=str(auth_request_id),
         error_message=error_message,
         error_code=error_code,
-        is_retryable=False,
-        failed_at=int(datetime.utcnow().timestamp()),
-    )
-
-    await transaction.record_auth_attempt_failed_terminal(
-        auth_request_id=auth_request_id,
-        event_data=event_data.SerializeToString(),
-        metadata=_create_metadata(worker_id),
-    )
+        is_retryable=retry_count is not None,
+        retry_count=retry_count or 0,
+        failed_at=int(now),
+    ).SerializeToString()
+    metadata = _create_metadata(worker_id, now)
+
+    if retry_count is None:
+        await transaction.record_auth_attempt_failed_terminal(
+            auth_request_id=auth_request_id,
+            event_data=event_data,
+            metadata=metadata,
+            release_lock_worker_id=worker_id,
+        )
+    else:
+        await transaction.record_auth_attempt_failed_retryable(
+            auth_request_id=auth_request_id,
+            event_data=event_data,
+            metadata=metadata,
+        )
 
 
-async def _record_retryable_failure(
+async def _record_timeout_failure(
     auth_request_id: uuid.UUID,
     worker_id: str,
-    error_message: str,
+    error: Exception,
     error_code: str,
-    retry_count: int,
-) -> None:
-    """Record a retryable failure event (status stays PROCESSING)."""
-    event_data = events_pb2.AuthAttemptFailed(
-        auth_request_id=str(auth_request_id),
-        error_message=error_message,
-        error_code=error_code,
-        is_retryable=True,
-        retry_count=retry_count,
-        failed_at=int(datetime.utcnow().timestamp()),
-    )
+    receive_count: int,
+    max_retries: int,
+) -> str:
+    """Record a timeout as retryable, or as terminal once retries run out.
+
+    Returns:
+        ProcessingResult.RETRYABLE_FAILURE, or ProcessingResult.TERMINAL_FAILURE
+        (lock released) when receive_count has reached max_retries
+    """
+    if receive_count >= max_retries:
+        await _record_failure(
+            auth_request_id=auth_request_id,
+            worker_id=worker_id,
+            error_message=f"Max retries ({max_retries}) exceeded: {error}",
+            error_code="MAX_RETRIES_EXCEEDED",
+        )
+        return ProcessingResult.TERMINAL_FAILURE
 
-    await transaction.record_auth_attempt_failed_retryable(
+    # Message will be retried
+    await _record_failure(
         auth_request_id=auth_request_id,
-        event_data=event_data.SerializeToString(),
-        metadata=_create_metadata(worker_id),
+        worker_id=worker_id,
+        error_message=str(error),
+        error_code=error_code,
+        retry_count=receive_count,
     )
+    return ProcessingResult.RETRYABLE_FAILURE
@@ -4,21 +4,56 @@ import asyncpg
 import json
 import structlog
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Any, AsyncIterator
 
 from auth_processor_worker.config import settings
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json text codec
+    orjson = None
+
 logger = structlog.get_logger()
 
 # Global connection pool
 _pool: asyncpg.Pool | None = None
 
+# Prepared statements cached per connection; comfortably above the number of
+# distinct queries the worker issues
+STATEMENT_CACHE_SIZE = 100
+
+
+# Version byte that prefixes jsonb values in the binary wire format
+_JSONB_BINARY_VERSION = b"\x01"
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a value as binary jsonb: the version byte, then UTF-8 JSON."""
+    return _JSONB_BINARY_VERSION + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a binary jsonb value (see _encode_jsonb)."""
+    return orjson.loads(data[1:])
+
 
 async def _init_connection(conn: asyncpg.Connection) -> None:
     """Initialize connection with custom type codecs.
 
-    Sets up automatic JSON parsing for JSONB columns.
+    Sets up automatic JSON parsing for JSONB columns. With orjson installed
+    the binary format is used, so event metadata goes straight from dict to
+    wire bytes without an intermediate str.
     """
+    if orjson is not None:
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=_encode_jsonb,
+            decoder=_decode_jsonb,
+            schema="pg_catalog",
+            format="binary",
+        )
+        return
+
     await conn.set_type_codec(
         "jsonb",
         encoder=json.dumps,
@@ -40,9 +75,15 @@ async def create_pool() -> asyncpg.Pool:
 
     pool = await asyncpg.create_pool(
         dsn=settings.database_url,
-        min_size=2,
-        max_size=10,
+        min_size=settings.database_pool_min_size,
+        max_size=settings.database_pool_max_size,
         command_timeout=30.0,
+        # Queries are issued as constant SQL text, so asyncpg's per-connection
+        # statement cache (keyed by that text) prepares each one once. Keep
+        # cached plans for the connection's lifetime instead of re-preparing
+        # every 5 minutes (the default max_cached_statement_lifetime).
+        statement_cache_size=STATEMENT_CACHE_SIZE,
+        max_cached_statement_lifetime=0,
         server_settings={
             "application_name": "auth-processor-worker",
         },
@@ -101,6 +142,10 @@ async def get_connection() -> AsyncIterator[asyncpg.Connection]:
 async def transaction() -> AsyncIterator[asyncpg.Connection]:
     """Get a database connection with an active transaction.
 
+    Runs at READ COMMITTED whatever the server default is. Writers rely on
+    unique constraints, not serializable isolation, to detect conflicts
+    (see transaction.append_in_transaction).
+
     Yields:
         asyncpg.Connection: Database connection with transaction
 
@@ -111,5 +156,5 @@ async def transaction() -> AsyncIterator[asyncpg.Connection]:
             # Auto-commits on success, auto-rolls back on exception
     """
     async with get_connection() as conn:
-        async with conn.transaction():
+        async with conn.transaction(isolation="read_committed"):
             yield conn
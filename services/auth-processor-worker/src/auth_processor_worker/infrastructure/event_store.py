@@ -1,119 +1,95 @@
-"""Event store implementation for writing and reading events."""
+"""Event store helpers: event IDs and the statement that appends an event.
 
-import json
+Events are appended by the read model updates (read_model), which embed
+append_event_statement so that the event and its projection are written
+in a single statement.
+"""
+
+import os
+import time
 import uuid
+from dataclasses import dataclass, field
 from typing import Any
 
-import asyncpg
-import structlog
-
-logger = structlog.get_logger()
 
+def new_event_id() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 event ID (RFC 9562).
 
-async def write_event(
-    conn: asyncpg.Connection,
-    event_id: uuid.UUID,
-    aggregate_id: uuid.UUID,
-    aggregate_type: str,
-    event_type: str,
-    event_data: bytes,
-    sequence_number: int,
-    metadata: dict[str, Any] | None = None,
-) -> None:
-    """Write an event to the event store.
+    The leading 48 bits are the Unix timestamp in milliseconds, so IDs
+    generated later sort later. This keeps inserts into the unique index on
+    payment_events.event_id append-mostly instead of scattering them across
+    the btree like random UUIDv4s.
 
-    Args:
-        conn: Database connection (must be in transaction)
-        event_id: Unique event ID
-        aggregate_id: Aggregate ID (e.g., auth_request_id)
-        aggregate_type: Type of aggregate (e.g., 'auth_request')
-        event_type: Type of event (e.g., 'AuthAttemptStarted')
-        event_data: Serialized protobuf event data
-        sequence_number: Sequence number for this aggregate
-        metadata: Optional metadata (correlation_id, causation_id, worker_id, etc.)
+    Returns:
+        New UUIDv7
     """
-    metadata_json = json.dumps(metadata or {})
-
-    await conn.execute(
-        """
-        INSERT INTO payment_events (
-            event_id,
-            aggregate_id,
-            aggregate_type,
-            event_type,
-            event_data,
-            sequence_number,
-            metadata
-        )
-        VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """,
-        event_id,
-        aggregate_id,
-        aggregate_type,
-        event_type,
-        event_data,
-        sequence_number,
-        metadata_json,
-    )
-
-    logger.info(
-        "event_written",
-        event_id=str(event_id),
-        aggregate_id=str(aggregate_id),
-        event_type=event_type,
-        sequence_number=sequence_number,
-    )
-
-
-async def get_next_sequence_number(
-    conn: asyncpg.Connection,
-    aggregate_id: uuid.UUID,
-) -> int:
-    """Get the next sequence number for an aggregate.
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 9562 variant
+    return uuid.UUID(int=value)
 
-    Must be called within a transaction to ensure consistency.
 
-    Args:
-        conn: Database connection (should be in transaction)
-        aggregate_id: Aggregate ID
+@dataclass(frozen=True, slots=True)
+class NewEvent:
+    """An event to append as the next in its aggregate's sequence.
 
-    Returns:
-        Next sequence number (1 if no events exist)
+    Passed to the read model updates, which append it and project it onto
+    auth_request_state in a single statement (see append_event_statement).
     """
-    result = await conn.fetchval(
-        """
-        SELECT COALESCE(MAX(sequence_number), 0) + 1
-        FROM payment_events
-        WHERE aggregate_id = $1
-        """,
-        aggregate_id,
-    )
 
-    return result or 1
+    aggregate_id: uuid.UUID
+    aggregate_type: str
+    event_type: str
+    event_data: bytes
+    metadata: dict[str, Any] | None = None
+    event_id: uuid.UUID = field(default_factory=new_event_id)
+
+    def args(self) -> tuple[Any, ...]:
+        """Return the parameters of append_event_statement, in order."""
+        # The metadata dict is encoded by the pool's jsonb codec
+        return (
+            self.event_id,
+            self.aggregate_id,
+            self.aggregate_type,
+            self.event_type,
+            self.event_data,
+            self.metadata or {},
+        )
+
 
+def append_event_statement(first_param: int = 1) -> str:
+    """Return the INSERT that appends an event and returns its sequence number.
 
-async def check_for_void_event(
-    conn: asyncpg.Connection,
-    aggregate_id: uuid.UUID,
-) -> bool:
-    """Check if an AuthVoidRequested event exists for the given aggregate.
+    The next sequence number, COALESCE(MAX(sequence_number), 0) + 1, is
+    computed by the INSERT itself. Concurrent appends to one aggregate
+    collide on unique_aggregate_sequence rather than interleave. The six
+    parameters (NewEvent.args()) are numbered from first_param, so the
+    statement can be embedded as a CTE in a larger one.
 
     Args:
-        conn: Database connection
-        aggregate_id: Aggregate ID (auth_request_id)
+        first_param: Placeholder number of the first parameter (event_id)
 
     Returns:
-        True if void event exists, False otherwise
+        SQL text returning one row with sequence_number
     """
-    result = await conn.fetchval(
-        """
-        SELECT EXISTS (
-            SELECT 1 FROM payment_events
-            WHERE aggregate_id = $1
-              AND event_type = 'AuthVoidRequested'
-        )
-        """,
-        aggregate_id,
+    event_id, aggregate_id, aggregate_type, event_type, event_data, metadata = (
+        f"${n}" for n in range(first_param, first_param + 6)
     )
-
-    return result or False
+    return f"""
+        INSERT INTO payment_events (
+            event_id,
+            aggregate_id,
+            aggregate_type,
+            event_type,
+            event_data,
+            sequence_number,
+            metadata
+        )
+        SELECT {event_id}::uuid, {aggregate_id}::uuid, {aggregate_type}::text,
+               {event_type}::text, {event_data}::bytea,
+               COALESCE(MAX(sequence_number), 0) + 1, {metadata}::jsonb
+        FROM payment_events
+        WHERE aggregate_id = {aggregate_id}
+        RETURNING sequence_number
+    """
@@ -2,18 +2,40 @@
 
 This module provides distributed locking to ensure exactly-once processing
 of authorization requests across multiple worker instances.
+
+auth_processing_locks is an UNLOGGED table: lock writes skip the WAL, and a
+database crash empties it. Losing every lock at once is equivalent to all of
+them reaching their TTL - the event store still records each request as
+PROCESSING, SQS redelivers the messages, and the next acquire starts over.
 """
 
 import asyncio
 import uuid
+import asyncpg
 import structlog
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
 from auth_processor_worker.infrastructure.database import get_connection
+from auth_processor_worker.infrastructure.transaction import (
+    append_auth_attempt_started,
+    append_auth_request_expired,
+    append_in_transaction,
+)
 
 logger = structlog.get_logger()
 
+# Maximum number of expired locks removed per DELETE statement
+CLEANUP_BATCH_SIZE = 1000
+
+
+class LockStartResult:
+    """Outcome of acquire_and_start()."""
+
+    ACQUIRED_STARTED = "acquired_started"
+    VOIDED = "voided"
+    LOCK_HELD = "lock_held"
+
 
 async def acquire_lock(
     auth_request_id: uuid.UUID,
@@ -22,9 +44,11 @@ async def acquire_lock(
 ) -> bool:
     """Acquire a distributed lock for an auth request.
 
-    Uses PostgreSQL INSERT ... ON CONFLICT DO NOTHING to atomically
-    acquire a lock. This ensures only one worker can process a given
-    auth_request_id at a time.
+    Uses PostgreSQL INSERT ... ON CONFLICT to atomically acquire a lock.
+    This ensures only one worker can process a given auth_request_id at a
+    time. A lock whose expires_at has passed (e.g. its worker crashed) is
+    taken over in the same statement, so redelivered messages do not have
+    to wait for cleanup_expired_locks to sweep it.
 
     Args:
         auth_request_id: UUID of the authorization request
@@ -45,13 +69,18 @@ async def acquire_lock(
     """
     async with get_connection() as conn:
         try:
-            # Use INSERT ... ON CONFLICT DO NOTHING for atomic lock acquisition
-            # RETURNING clause will return the row if inserted, or nothing if conflict
+            # Insert the lock, or take over an expired one. RETURNING yields the
+            # row if this worker now holds the lock, or nothing if a live lock
+            # is held by another worker.
             result = await conn.fetchrow(
                 """
                 INSERT INTO auth_processing_locks (auth_request_id, worker_id, expires_at)
                 VALUES ($1, $2, NOW() + $3 * INTERVAL '1 second')
-                ON CONFLICT (auth_request_id) DO NOTHING
+                ON CONFLICT (auth_request_id) DO UPDATE
+                    SET worker_id = EXCLUDED.worker_id,
+                        locked_at = NOW(),
+                        expires_at = EXCLUDED.expires_at
+                    WHERE auth_processing_locks.expires_at < NOW()
                 RETURNING auth_request_id
                 """,
                 auth_request_id,
@@ -60,15 +89,15 @@ async def acquire_lock(
             )
 
             if result is not None:
-                logger.info(
+                logger.debug(
                     "lock_acquired",
-                    auth_request_id=str(auth_request_id),
+                    auth_request_id=auth_request_id,
                     worker_id=worker_id,
                     ttl_seconds=ttl_seconds,
                 )
                 return True
             else:
-                # Lock already exists - check if it's expired
+                # Lock is held and not expired - look up the holder for logging
                 existing_lock = await conn.fetchrow(
                     """
                     SELECT worker_id, expires_at
@@ -81,7 +110,7 @@ async def acquire_lock(
                 if existing_lock:
                     logger.debug(
                         "lock_already_held",
-                        auth_request_id=str(auth_request_id),
+                        auth_request_id=auth_request_id,
                         worker_id=worker_id,
                         held_by=existing_lock["worker_id"],
                         expires_at=existing_lock["expires_at"].isoformat(),
@@ -92,13 +121,133 @@ async def acquire_lock(
         except Exception as e:
             logger.error(
                 "lock_acquisition_failed",
-                auth_request_id=str(auth_request_id),
+                auth_request_id=auth_request_id,
                 worker_id=worker_id,
                 error=str(e),
             )
             raise
 
 
+async def acquire_and_start(
+    auth_request_id: uuid.UUID,
+    worker_id: str,
+    ttl_seconds: int,
+    started_event_data: bytes,
+    expired_event_data: bytes,
+    metadata: dict[str, Any] | None = None,
+) -> str:
+    """Acquire the lock, check for a void and record the outcome at once.
+
+    A single statement takes the lock (with the same expired-lock takeover
+    as acquire_lock) and checks for an AuthVoidRequested event. If the lock
+    is ours and the request is not voided, AuthAttemptStarted is written and
+    the read model moved to PROCESSING in the same transaction. If it was
+    voided, AuthRequestExpired is written and the lock deleted again before
+    the transaction commits, so the lock is never held past it. A held lock
+    is not looked up for diagnostics, unlike in acquire_lock.
+
+    An append that loses the race for a sequence number (e.g. against the
+    previous holder's terminal write after an expired-lock takeover) reruns
+    the whole transaction, lock statement included, since the rollback also
+    undid the lock write.
+
+    Args:
+        auth_request_id: UUID of the authorization request
+        worker_id: Identifier of the worker attempting to acquire the lock
+        ttl_seconds: Time-to-live for the lock in seconds
+        started_event_data: Serialized AuthAttemptStarted event
+        expired_event_data: Serialized AuthRequestExpired event, written
+            only if the request has been voided
+        metadata: Optional event metadata (worker_id, etc.)
+
+    Returns:
+        LockStartResult.LOCK_HELD if another worker holds a live lock;
+        LockStartResult.VOIDED if the request has been voided (recorded as
+        expired; the lock is already released);
+        LockStartResult.ACQUIRED_STARTED if the lock was acquired and the
+        attempt recorded.
+    """
+
+    async def lock_and_start(conn: asyncpg.Connection) -> str:
+        row = await conn.fetchrow(
+            """
+            WITH locked AS (
+                INSERT INTO auth_processing_locks (auth_request_id, worker_id, expires_at)
+                VALUES ($1, $2, NOW() + $3 * INTERVAL '1 second')
+                ON CONFLICT (auth_request_id) DO UPDATE
+                    SET worker_id = EXCLUDED.worker_id,
+                        locked_at = NOW(),
+                        expires_at = EXCLUDED.expires_at
+                    WHERE auth_processing_locks.expires_at < NOW()
+                RETURNING auth_request_id
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM locked) AS acquired,
+                EXISTS (
+                    SELECT 1 FROM payment_events
+                    WHERE aggregate_id = $1
+                      AND event_type = 'AuthVoidRequested'
+                ) AS void_detected
+            """,
+            auth_request_id,
+            worker_id,
+            ttl_seconds,
+        )
+
+        if not row["acquired"]:
+            return LockStartResult.LOCK_HELD
+        elif row["void_detected"]:
+            await append_auth_request_expired(
+                conn=conn,
+                auth_request_id=auth_request_id,
+                event_data=expired_event_data,
+                metadata=metadata,
+                release_lock_worker_id=worker_id,
+            )
+            return LockStartResult.VOIDED
+        else:
+            await append_auth_attempt_started(
+                conn=conn,
+                auth_request_id=auth_request_id,
+                event_data=started_event_data,
+                metadata=metadata,
+            )
+            return LockStartResult.ACQUIRED_STARTED
+
+    try:
+        result = await append_in_transaction(lock_and_start)
+    except Exception as e:
+        logger.error(
+            "lock_acquisition_failed",
+            auth_request_id=auth_request_id,
+            worker_id=worker_id,
+            error=str(e),
+        )
+        raise
+
+    if result == LockStartResult.LOCK_HELD:
+        logger.debug(
+            "lock_already_held",
+            auth_request_id=auth_request_id,
+            worker_id=worker_id,
+        )
+    elif result == LockStartResult.VOIDED:
+        logger.info(
+            "auth_request_expired_recorded",
+            auth_request_id=auth_request_id,
+            worker_id=worker_id,
+        )
+    else:
+        logger.debug(
+            "lock_acquired",
+            auth_request_id=auth_request_id,
+            worker_id=worker_id,
+            ttl_seconds=ttl_seconds,
+        )
+
+    return result
+
+
 async def release_lock(
     auth_request_id: uuid.UUID,
     worker_id: str,
@@ -133,34 +282,44 @@ async def release_lock(
             rows_deleted = int(result.split()[-1]) if result else 0
 
             if rows_deleted > 0:
-                logger.info(
+                logger.debug(
                     "lock_released",
-                    auth_request_id=str(auth_request_id),
+                    auth_request_id=auth_request_id,
                     worker_id=worker_id,
                 )
             else:
                 logger.warning(
                     "lock_not_found_on_release",
-                    auth_request_id=str(auth_request_id),
+                    auth_request_id=auth_request_id,
                     worker_id=worker_id,
                 )
 
         except Exception as e:
             logger.error(
                 "lock_release_failed",
-                auth_request_id=str(auth_request_id),
+                auth_request_id=auth_request_id,
                 worker_id=worker_id,
                 error=str(e),
             )
             raise
 
 
-async def cleanup_expired_locks() -> int:
+async def cleanup_expired_locks(batch_size: int = CLEANUP_BATCH_SIZE) -> int:
     """Clean up expired locks from the database.
 
     Deletes all locks where expires_at < NOW(). This should be called
     periodically (e.g., every 30 seconds) to prevent lock table bloat
-    and handle cases where workers crash without releasing locks.
+    from workers that crash without releasing locks. Expired locks are
+    also taken over directly by acquire_lock, so correctness does not
+    depend on this sweep.
+
+    Locks are deleted in batches of batch_size (each its own short
+    statement, driven by idx_lock_expires) until a batch comes back
+    short, so a large backlog never holds row locks long enough to stall
+    acquire_lock. Rows another transaction is taking over are skipped.
+
+    Args:
+        batch_size: Maximum number of locks deleted per statement
 
     Returns:
         int: Number of expired locks cleaned up
@@ -169,30 +328,44 @@ async def cleanup_expired_locks() -> int:
         >>> cleaned = await cleanup_expired_locks()
         >>> print(f"Cleaned up {cleaned} expired locks")
     """
+    total_deleted = 0
     async with get_connection() as conn:
         try:
-            result = await conn.execute(
-                """
-                DELETE FROM auth_processing_locks
-                WHERE expires_at < NOW()
-                """
-            )
+            while True:
+                result = await conn.execute(
+                    """
+                    DELETE FROM auth_processing_locks
+                    WHERE auth_request_id IN (
+                        SELECT auth_request_id
+                        FROM auth_processing_locks
+                        WHERE expires_at < NOW()
+                        LIMIT $1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    """,
+                    batch_size,
+                )
 
-            # Extract number of rows deleted from result string "DELETE N"
-            rows_deleted = int(result.split()[-1]) if result else 0
+                # Extract number of rows deleted from result string "DELETE N"
+                rows_deleted = int(result.split()[-1]) if result else 0
+                total_deleted += rows_deleted
 
-            if rows_deleted > 0:
+                if rows_deleted < batch_size:
+                    break
+
+            if total_deleted > 0:
                 logger.info(
                     "expired_locks_cleaned",
-                    count=rows_deleted,
+                    count=total_deleted,
                 )
 
-            return rows_deleted
+            return total_deleted
 
         except Exception as e:
             logger.error(
                 "lock_cleanup_failed",
                 error=str(e),
+                deleted_before_error=total_deleted,
             )
             raise
 
@@ -2,330 +2,477 @@
 
 These functions handle atomic updates to the read model based on event types.
 They must be called within a transaction context.
+
+Each update appends its event to the event store and projects it onto
+auth_request_state in one statement: a CTE named "event" runs the INSERT
+(event_store.append_event_statement) and yields the new sequence number,
+which the UPDATE in the same statement reads. Writing and projecting an
+event therefore costs one round trip.
+
+There is no database trigger maintaining auth_request_state.updated_at, so
+every UPDATE issued here must set updated_at itself. Timestamps come from the
+database clock (NOW() AT TIME ZONE 'UTC', the naive UTC the columns hold): one
+clock for every worker, and one value per transaction.
+
+Every UPDATE is guarded by last_event_sequence < the event's sequence number,
+so a redelivered or out-of-order event can never move the projection
+backwards (the event is still appended). The statements are built once at
+import, so asyncpg's per-connection statement cache prepares each once and
+reuses the plan on every later event.
+
+Terminal updates (AUTHORIZED, DENIED, FAILED, EXPIRED) also send NOTIFY on
+AUTH_COMPLETED_CHANNEL with the auth_request_id as payload, and can delete
+the worker's processing lock, all in the same statement as the UPDATE.
+PostgreSQL delivers notifications only when the transaction commits, so
+listeners never observe a status that is later rolled back.
 """
 
 import uuid
-from datetime import datetime
 
 import asyncpg
 import structlog
 
+from auth_processor_worker.infrastructure import event_store
+
 logger = structlog.get_logger()
 
+# NOTIFY channel the authorization API listens on for terminal status changes
+AUTH_COMPLETED_CHANNEL = "auth_completed"
 
-async def update_to_processing(
-    conn: asyncpg.Connection,
+
+def _log_stale_event(
     auth_request_id: uuid.UUID,
     sequence_number: int,
+    status: str,
 ) -> None:
-    """Update read model to PROCESSING status.
+    """Log an UPDATE skipped because the read model is already past the event."""
+    logger.warning(
+        "read_model_update_skipped",
+        auth_request_id=auth_request_id,
+        status=status,
+        sequence=sequence_number,
+        reason="read model already at or past this event sequence",
+    )
+
 
-    Called when AuthAttemptStarted event is recorded.
+def _appending_event(projection: str, first_event_param: int) -> str:
+    """Prefix projection with the CTE "event" that appends the new event.
+
+    Args:
+        projection: CTEs and final SELECT reading event.sequence_number
+        first_event_param: Placeholder number of the first NewEvent.args()
+            parameter, after the projection's own parameters
+
+    Returns:
+        The complete statement
+    """
+    append = event_store.append_event_statement(first_event_param)
+    return f"WITH event AS ({append}),{projection}"
+
+
+# Parameters: the projection's own ($1 is always the auth_request_id), then
+# NewEvent.args(). Each returns (sequence_number, projected).
+_PROCESSING = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET status = 'PROCESSING',
+                updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        )
+        SELECT event.sequence_number, EXISTS (SELECT 1 FROM updated) AS projected
+        FROM event
+    """,
+    first_event_param=2,
+)
+
+_RETRY_ATTEMPT = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        )
+        SELECT event.sequence_number, EXISTS (SELECT 1 FROM updated) AS projected
+        FROM event
+    """,
+    first_event_param=2,
+)
+
+_AUTHORIZED = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET status = 'AUTHORIZED',
+                processor_auth_id = $2,
+                processor_name = $3,
+                authorized_amount_cents = $4,
+                authorization_code = $5,
+                completed_at = NOW() AT TIME ZONE 'UTC',
+                updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        ),
+        released AS (
+            DELETE FROM auth_processing_locks
+            WHERE auth_request_id = $1 AND worker_id = $6
+        )
+        SELECT
+            event.sequence_number,
+            EXISTS (SELECT 1 FROM updated) AS projected,
+            pg_notify($7, $1::uuid::text)
+        FROM event
+    """,
+    first_event_param=8,
+)
+
+_DENIED = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET status = 'DENIED',
+                processor_name = $2,
+                denial_code = $3,
+                denial_reason = $4,
+                completed_at = NOW() AT TIME ZONE 'UTC',
+                updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        ),
+        released AS (
+            DELETE FROM auth_processing_locks
+            WHERE auth_request_id = $1 AND worker_id = $5
+        )
+        SELECT
+            event.sequence_number,
+            EXISTS (SELECT 1 FROM updated) AS projected,
+            pg_notify($6, $1::uuid::text)
+        FROM event
+    """,
+    first_event_param=7,
+)
+
+_FAILED = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET status = 'FAILED',
+                completed_at = NOW() AT TIME ZONE 'UTC',
+                updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        ),
+        released AS (
+            DELETE FROM auth_processing_locks
+            WHERE auth_request_id = $1 AND worker_id = $2
+        )
+        SELECT
+            event.sequence_number,
+            EXISTS (SELECT 1 FROM updated) AS projected,
+            pg_notify($3, $1::uuid::text)
+        FROM event
+    """,
+    first_event_param=4,
+)
+
+_EXPIRED = _appending_event(
+    """
+        updated AS (
+            UPDATE auth_request_state
+            SET status = 'EXPIRED',
+                completed_at = NOW() AT TIME ZONE 'UTC',
+                updated_at = NOW() AT TIME ZONE 'UTC',
+                last_event_sequence = event.sequence_number
+            FROM event
+            WHERE auth_request_id = $1
+              AND last_event_sequence < event.sequence_number
+            RETURNING 1
+        ),
+        released AS (
+            DELETE FROM auth_processing_locks
+            WHERE auth_request_id = $1 AND worker_id = $2
+        )
+        SELECT
+            event.sequence_number,
+            EXISTS (SELECT 1 FROM updated) AS projected,
+            pg_notify($3, $1::uuid::text)
+        FROM event
+    """,
+    first_event_param=4,
+)
+
+
+async def _append_and_project(
+    conn: asyncpg.Connection,
+    statement: str,
+    status: str,
+    event: event_store.NewEvent,
+    auth_request_id: uuid.UUID,
+    *args: object,
+) -> int:
+    """Run one of the statements above and log the outcome.
+
+    Returns:
+        Sequence number assigned to the event
+    """
+    row = await conn.fetchrow(statement, auth_request_id, *args, *event.args())
+    sequence_number = row["sequence_number"]
+
+    if not row["projected"]:
+        _log_stale_event(auth_request_id, sequence_number, status)
+    else:
+        logger.debug(
+            "read_model_updated",
+            auth_request_id=auth_request_id,
+            status=status,
+            event_type=event.event_type,
+            sequence=sequence_number,
+        )
+    return sequence_number
+
+
+async def update_to_processing(
+    conn: asyncpg.Connection,
+    auth_request_id: uuid.UUID,
+    event: event_store.NewEvent,
+) -> int:
+    """Append event and update read model to PROCESSING status.
+
+    Called to record the AuthAttemptStarted event.
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
-    """
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET status = 'PROCESSING',
-            updated_at = $2,
-            last_event_sequence = $3
-        WHERE auth_request_id = $1
-        """,
-        auth_request_id,
-        datetime.utcnow(),
-        sequence_number,
-    )
+        event: Event to append
 
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="PROCESSING",
-        sequence=sequence_number,
-    )
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(conn, _PROCESSING, "PROCESSING", event, auth_request_id)
 
 
 async def update_to_authorized(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-    sequence_number: int,
+    event: event_store.NewEvent,
     processor_auth_id: str,
     processor_name: str,
     authorized_amount_cents: int,
     authorization_code: str,
-) -> None:
-    """Update read model to AUTHORIZED status.
+    release_lock_worker_id: str | None = None,
+) -> int:
+    """Append event and update read model to AUTHORIZED status.
 
-    Called when AuthResponseReceived event with AUTHORIZED status is recorded.
+    Called to record the AuthResponseReceived event with AUTHORIZED status.
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
+        event: Event to append
         processor_auth_id: Processor's authorization ID
         processor_name: Name of payment processor
         authorized_amount_cents: Authorized amount in cents
         authorization_code: Authorization code from processor
-    """
-    now = datetime.utcnow()
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same statement
 
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET status = 'AUTHORIZED',
-            processor_auth_id = $2,
-            processor_name = $3,
-            authorized_amount_cents = $4,
-            authorization_code = $5,
-            completed_at = $6,
-            updated_at = $7,
-            last_event_sequence = $8
-        WHERE auth_request_id = $1
-        """,
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(
+        conn,
+        _AUTHORIZED,
+        "AUTHORIZED",
+        event,
         auth_request_id,
         processor_auth_id,
         processor_name,
         authorized_amount_cents,
         authorization_code,
-        now,
-        now,
-        sequence_number,
-    )
-
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="AUTHORIZED",
-        processor_name=processor_name,
-        sequence=sequence_number,
+        release_lock_worker_id,
+        AUTH_COMPLETED_CHANNEL,
     )
 
 
 async def update_to_denied(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-    sequence_number: int,
+    event: event_store.NewEvent,
     processor_name: str,
     denial_code: str,
     denial_reason: str,
-) -> None:
-    """Update read model to DENIED status.
+    release_lock_worker_id: str | None = None,
+) -> int:
+    """Append event and update read model to DENIED status.
 
-    Called when AuthResponseReceived event with DENIED status is recorded.
+    Called to record the AuthResponseReceived event with DENIED status.
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
+        event: Event to append
         processor_name: Name of payment processor
         denial_code: Denial code from processor
         denial_reason: Human-readable denial reason
-    """
-    now = datetime.utcnow()
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same statement
 
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET status = 'DENIED',
-            processor_name = $2,
-            denial_code = $3,
-            denial_reason = $4,
-            completed_at = $5,
-            updated_at = $6,
-            last_event_sequence = $7
-        WHERE auth_request_id = $1
-        """,
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(
+        conn,
+        _DENIED,
+        "DENIED",
+        event,
         auth_request_id,
         processor_name,
         denial_code,
         denial_reason,
-        now,
-        now,
-        sequence_number,
-    )
-
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="DENIED",
-        denial_code=denial_code,
-        sequence=sequence_number,
+        release_lock_worker_id,
+        AUTH_COMPLETED_CHANNEL,
     )
 
 
 async def update_to_failed(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-    sequence_number: int,
-) -> None:
-    """Update read model to FAILED status.
+    event: event_store.NewEvent,
+    release_lock_worker_id: str | None = None,
+) -> int:
+    """Append event and update read model to FAILED status.
 
-    Called when AuthAttemptFailed event with is_retryable=False is recorded.
+    Called to record the AuthAttemptFailed event with is_retryable=False.
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
-    """
-    now = datetime.utcnow()
+        event: Event to append
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same statement
 
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET status = 'FAILED',
-            completed_at = $2,
-            updated_at = $3,
-            last_event_sequence = $4
-        WHERE auth_request_id = $1
-        """,
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(
+        conn,
+        _FAILED,
+        "FAILED",
+        event,
         auth_request_id,
-        now,
-        now,
-        sequence_number,
-    )
-
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="FAILED",
-        sequence=sequence_number,
+        release_lock_worker_id,
+        AUTH_COMPLETED_CHANNEL,
     )
 
 
 async def update_retry_attempt(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-    sequence_number: int,
-) -> None:
-    """Update read model after retryable failure.
+    event: event_store.NewEvent,
+) -> int:
+    """Append event and update read model after retryable failure.
 
     Status remains PROCESSING - just updates sequence number and timestamp.
 
-    Called when AuthAttemptFailed event with is_retryable=True is recorded.
+    Called to record the AuthAttemptFailed event with is_retryable=True.
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
-    """
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET updated_at = $2,
-            last_event_sequence = $3
-        WHERE auth_request_id = $1
-        """,
-        auth_request_id,
-        datetime.utcnow(),
-        sequence_number,
-    )
+        event: Event to append
 
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="PROCESSING",
-        note="retry_attempt_recorded",
-        sequence=sequence_number,
-    )
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(conn, _RETRY_ATTEMPT, "PROCESSING", event, auth_request_id)
 
 
 async def update_to_expired(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-    sequence_number: int,
-) -> None:
-    """Update read model to EXPIRED status.
+    event: event_store.NewEvent,
+    release_lock_worker_id: str | None = None,
+) -> int:
+    """Append event and update read model to EXPIRED status.
 
-    Called when AuthRequestExpired event is recorded (void detected before processing).
+    Called to record the AuthRequestExpired event (void detected before
+    processing).
 
     Args:
         conn: Database connection (must be in transaction)
         auth_request_id: Authorization request ID
-        sequence_number: Event sequence number
-    """
-    now = datetime.utcnow()
+        event: Event to append
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same statement
 
-    await conn.execute(
-        """
-        UPDATE auth_request_state
-        SET status = 'EXPIRED',
-            completed_at = $2,
-            updated_at = $3,
-            last_event_sequence = $4
-        WHERE auth_request_id = $1
-        """,
+    Returns:
+        Sequence number assigned to the event
+    """
+    return await _append_and_project(
+        conn,
+        _EXPIRED,
+        "EXPIRED",
+        event,
         auth_request_id,
-        now,
-        now,
-        sequence_number,
-    )
-
-    logger.info(
-        "read_model_updated",
-        auth_request_id=str(auth_request_id),
-        status="EXPIRED",
-        sequence=sequence_number,
+        release_lock_worker_id,
+        AUTH_COMPLETED_CHANNEL,
     )
 
 
-async def get_auth_request_details(
+async def get_processing_bundle(
     conn: asyncpg.Connection,
     auth_request_id: uuid.UUID,
-) -> asyncpg.Record | None:
-    """Get auth request details from read model.
+) -> asyncpg.Record:
+    """Get everything the worker reads before processing, in one round trip.
+
+    Reads the auth request details and the restaurant's active processor
+    config in a single query, selecting only the columns processing uses
+    (the request metadata JSONB is not fetched, so it is never decoded).
+    The void check happens earlier, in locking.acquire_and_start.
 
     Args:
         conn: Database connection
         auth_request_id: Authorization request ID
 
     Returns:
-        Database record or None if not found
+        Exactly one record with:
+        - auth_request_id, restaurant_id, payment_token, amount_cents,
+          currency (all NULL if the auth request is not found)
+        - processor_name, processor_config (both NULL if the restaurant has
+          no active config)
     """
     return await conn.fetchrow(
         """
         SELECT
-            auth_request_id,
-            restaurant_id,
-            payment_token,
-            status,
-            amount_cents,
-            currency,
-            metadata,
-            created_at,
-            last_event_sequence
-        FROM auth_request_state
-        WHERE auth_request_id = $1
+            s.auth_request_id,
+            s.restaurant_id,
+            s.payment_token,
+            s.amount_cents,
+            s.currency,
+            c.processor_name,
+            c.processor_config
+        FROM (SELECT $1::uuid AS auth_request_id) AS req
+        LEFT JOIN auth_request_state s
+            ON s.auth_request_id = req.auth_request_id
+        LEFT JOIN restaurant_payment_configs c
+            ON c.restaurant_id = s.restaurant_id AND c.is_active = true
         """,
         auth_request_id,
     )
-
-
-async def get_restaurant_config(
-    conn: asyncpg.Connection,
-    restaurant_id: uuid.UUID,
-) -> asyncpg.Record | None:
-    """Get restaurant payment processor configuration.
-
-    Args:
-        conn: Database connection
-        restaurant_id: Restaurant ID
-
-    Returns:
-        Database record with processor_name and processor_config, or None if not found
-    """
-    return await conn.fetchrow(
-        """
-        SELECT
-            restaurant_id,
-            config_version,
-            processor_name,
-            processor_config,
-            is_active
-        FROM restaurant_payment_configs
-        WHERE restaurant_id = $1 AND is_active = true
-        """,
-        restaurant_id,
-    )
@@ -1,7 +1,8 @@
 """SQS FIFO consumer for auth request processing."""
 
 import asyncio
-import base64
+import binascii
+import contextlib
 import json
 from typing import Any, Awaitable, Callable
 
@@ -13,6 +14,12 @@ from auth_processor_worker.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum number of entries SQS accepts in one DeleteMessageBatch call
+DELETE_BATCH_MAX_ENTRIES = 10
+
+# Maximum number of entries SQS accepts in one ChangeMessageVisibilityBatch call
+VISIBILITY_BATCH_MAX_ENTRIES = 10
+
 
 class SQSConsumer:
     """
@@ -20,17 +27,22 @@ class SQSConsumer:
 
     Implements:
     - Long polling with 20-second wait time
-    - Batch size: 1 (for simplicity)
-    - Visibility timeout: 30 seconds
-    - Message deletion after successful processing
+    - Batches of up to batch_size messages, with different message groups
+      processed concurrently and each group in order
+    - Visibility timeout: 30 seconds, extended every third of it while a
+      batch is still being processed
+    - Message deletion after successful processing, one DeleteMessageBatch
+      call per received batch
     - Graceful shutdown
     - Error handling and retry logic based on ApproximateReceiveCount
     """
 
+    logger = get_logger("SQSConsumer")
+
     def __init__(
         self,
         queue_url: str,
-        batch_size: int = 1,
+        batch_size: int = 10,
         wait_time_seconds: int = 20,
         visibility_timeout: int = 30,
         aws_region: str = "us-east-1",
@@ -43,7 +55,7 @@ class SQSConsumer:
 
         Args:
             queue_url: SQS queue URL
-            batch_size: Number of messages to fetch per batch (default: 1)
+            batch_size: Number of messages to fetch per batch (default: 10, the SQS maximum)
             wait_time_seconds: Long polling wait time (default: 20)
             visibility_timeout: Message visibility timeout in seconds (default: 30)
             aws_region: AWS region (default: us-east-1)
@@ -63,7 +75,8 @@ class SQSConsumer:
         self._session: aioboto3.Session | None = None
         self._sqs_client: Any = None
         self._injected_client: Any = sqs_client  # Store injected client for tests
-        self.logger = get_logger(self.__class__.__name__)
+        self._polling_task: asyncio.Task[None] | None = None
+        self._processing_batch = False
 
     async def start(self) -> None:
         """
@@ -88,13 +101,7 @@ class SQSConsumer:
         if self._injected_client:
             # Test mode: use provided client
             self._sqs_client = self._injected_client
-            try:
-                await self._polling_loop()
-            except Exception as e:
-                self.logger.error("sqs_consumer_error", error=str(e), exc_info=True)
-                raise
-            finally:
-                self.logger.info("sqs_consumer_stopped")
+            await self._run_polling_loop()
         else:
             # Production mode: create and manage our own session
             self._session = aioboto3.Session()
@@ -104,25 +111,43 @@ class SQSConsumer:
                 endpoint_url=self.aws_endpoint_url,
             ) as sqs_client:
                 self._sqs_client = sqs_client
-
-                try:
-                    await self._polling_loop()
-                except Exception as e:
-                    self.logger.error("sqs_consumer_error", error=str(e), exc_info=True)
-                    raise
-                finally:
-                    self.logger.info("sqs_consumer_stopped")
+                await self._run_polling_loop()
 
     async def stop(self) -> None:
         """
         Gracefully stop the consumer.
 
-        Sets running flag to False, which will cause the polling loop to exit
-        after the current iteration completes.
+        Sets running flag to False and waits until start() is done with the
+        current iteration: a batch being processed is finished (including
+        its deletes), while an idle long poll is cancelled rather than
+        waited out. Messages received by a cancelled poll become visible
+        again after the visibility timeout.
         """
         self.logger.info("sqs_consumer_stopping")
         self.running = False
 
+        task = self._polling_task
+        if task is None:
+            return
+        if not self._processing_batch:
+            task.cancel()
+        await asyncio.wait({task})
+
+    async def _run_polling_loop(self) -> None:
+        """Run the polling loop in a task that stop() can wait for or cancel."""
+        self._polling_task = asyncio.create_task(self._polling_loop())
+        try:
+            await asyncio.wait({self._polling_task})
+            if not self._polling_task.cancelled():
+                self._polling_task.result()
+        except Exception as e:
+            self.logger.error("sqs_consumer_error", error=str(e), exc_info=True)
+            raise
+        finally:
+            # Only still running if start() itself was cancelled
+            self._polling_task.cancel()
+            self.logger.info("sqs_consumer_stopped")
+
     async def _polling_loop(self) -> None:
         """
         Main polling loop that fetches and processes messages.
@@ -148,8 +173,13 @@ class SQSConsumer:
            a. Parse message body
            b. Extract auth_request_id
            c. Call message handler
-           d. Delete message if processing succeeds
-        3. Handle errors and retry logic based on ApproximateReceiveCount
+        3. Delete every message that was processed (or was malformed) in a
+           single DeleteMessageBatch call
+        4. Handle errors and retry logic based on ApproximateReceiveCount
+
+        Messages from different message groups (restaurants) are processed
+        concurrently, so one batch overlaps its database and HTTP waits.
+        Messages within a group keep the FIFO order they were received in.
         """
         if not self._sqs_client:
             raise RuntimeError("SQS client not initialized. Call start() first.")
@@ -161,8 +191,8 @@ class SQSConsumer:
                 MaxNumberOfMessages=self.batch_size,
                 WaitTimeSeconds=self.wait_time_seconds,
                 VisibilityTimeout=self.visibility_timeout,
+                # Only the system attributes read below; message attributes are unused
                 AttributeNames=["ApproximateReceiveCount", "MessageGroupId"],
-                MessageAttributeNames=["All"],
             )
 
             messages = response.get("Messages", [])
@@ -172,11 +202,42 @@ class SQSConsumer:
                 self.logger.debug("no_messages_received")
                 return
 
+            # From here on stop() waits for the batch instead of cancelling it
+            self._processing_batch = True
             self.logger.info("messages_received", count=len(messages))
 
-            # Process each message
+            # Process message groups concurrently, each group in order
+            groups: dict[str | None, list[dict[str, Any]]] = {}
             for message in messages:
-                await self._process_single_message(message)
+                group_id = message.get("Attributes", {}).get("MessageGroupId")
+                groups.setdefault(group_id, []).append(message)
+
+            # Handled messages are only deleted once the whole batch is done,
+            # so every message stays invisible until then unless its group
+            # gave up on it
+            in_flight = {
+                message["ReceiptHandle"]: message
+                for message in messages
+                if message.get("ReceiptHandle")
+            }
+            heartbeat = asyncio.create_task(self._extend_visibility(in_flight))
+            try:
+                if len(groups) == 1:
+                    handled = await self._process_message_group(messages, in_flight)
+                else:
+                    results = await asyncio.gather(
+                        *(
+                            self._process_message_group(group, in_flight)
+                            for group in groups.values()
+                        )
+                    )
+                    handled = [message for group in results for message in group]
+            finally:
+                heartbeat.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await heartbeat
+
+            await self._delete_messages(handled)
 
         except (BotoCoreError, ClientError) as e:
             self.logger.error("sqs_receive_error", error=str(e), exc_info=True)
@@ -184,20 +245,113 @@ class SQSConsumer:
         except Exception as e:
             self.logger.error("unexpected_process_error", error=str(e), exc_info=True)
             # Don't raise - let the polling loop continue
+        finally:
+            self._processing_batch = False
 
-    async def _process_single_message(self, message: dict[str, Any]) -> None:
+    async def _process_message_group(
+        self,
+        messages: list[dict[str, Any]],
+        in_flight: dict[str, dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Process messages from one message group sequentially.
+
+        Stops at the first message that fails: it stays on the queue for
+        retry, and processing the messages behind it now would complete
+        them out of FIFO order. The rest of the group becomes visible again
+        after the visibility timeout, like the failed message.
+
+        Args:
+            messages: SQS messages sharing a MessageGroupId, in receive order
+            in_flight: Messages whose visibility is being extended, by receipt
+                handle; the failed message and the rest of the group are
+                removed so they are retried on time
+
+        Returns:
+            The messages that were handled and should be deleted
+        """
+        for index, message in enumerate(messages):
+            if not await self._process_single_message(message):
+                if index + 1 < len(messages):
+                    self.logger.warning(
+                        "message_group_halted",
+                        message_id=message.get("MessageId"),
+                        skipped=len(messages) - index - 1,
+                    )
+                if in_flight is not None:
+                    for unhandled in messages[index:]:
+                        in_flight.pop(unhandled.get("ReceiptHandle"), None)
+                return messages[:index]
+        return messages
+
+    async def _extend_visibility(self, in_flight: dict[str, dict[str, Any]]) -> None:
+        """
+        Keep in-flight messages invisible while their batch is processed.
+
+        Every third of the visibility timeout, resets the timeout of each
+        message still in in_flight with ChangeMessageVisibilityBatch, so a
+        slow batch is not redelivered to another worker mid-processing.
+        Runs until cancelled; errors are logged and retried on the next beat.
+
+        Args:
+            in_flight: Messages to keep invisible, by receipt handle (updated
+                by the caller as groups finish)
+        """
+        interval = self.visibility_timeout / 3
+        if interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+
+            entries = [
+                {
+                    "Id": message.get("MessageId") or str(index),
+                    "ReceiptHandle": receipt_handle,
+                    "VisibilityTimeout": self.visibility_timeout,
+                }
+                for index, (receipt_handle, message) in enumerate(list(in_flight.items()))
+            ]
+            for start in range(0, len(entries), VISIBILITY_BATCH_MAX_ENTRIES):
+                chunk = entries[start : start + VISIBILITY_BATCH_MAX_ENTRIES]
+                try:
+                    response = await self._sqs_client.change_message_visibility_batch(
+                        QueueUrl=self.queue_url,
+                        Entries=chunk,
+                    )
+                except (BotoCoreError, ClientError) as e:
+                    self.logger.warning(
+                        "visibility_extension_error",
+                        count=len(chunk),
+                        error=str(e),
+                    )
+                    continue
+
+                for failure in response.get("Failed", []):
+                    self.logger.warning(
+                        "visibility_extension_failed",
+                        message_id=failure.get("Id"),
+                        code=failure.get("Code"),
+                        error=failure.get("Message"),
+                    )
+            self.logger.debug("visibility_extended", count=len(entries))
+
+    async def _process_single_message(self, message: dict[str, Any]) -> bool:
         """
         Process a single SQS message.
 
         Args:
             message: SQS message dict containing Body, ReceiptHandle, Attributes, etc.
+
+        Returns:
+            True if the message should be deleted (processed, or malformed),
+            False if the handler failed and the message is left for retry
         """
         receipt_handle = message.get("ReceiptHandle")
         message_id = message.get("MessageId")
         attributes = message.get("Attributes", {})
         receive_count = int(attributes.get("ApproximateReceiveCount", 0))
 
-        self.logger.info(
+        self.logger.debug(
             "processing_message",
             message_id=message_id,
             receive_count=receive_count,
@@ -207,9 +361,9 @@ class SQSConsumer:
             # Parse message body - it's a base64-encoded protobuf message
             body_str = message["Body"]
 
-            # Decode base64
+            # Decode base64 (binascii directly: base64.b64decode only wraps it)
             try:
-                body_bytes = base64.b64decode(body_str)
+                body_bytes = binascii.a2b_base64(body_str)
             except Exception as e:
                 self.logger.error(
                     "base64_decode_error",
@@ -217,8 +371,7 @@ class SQSConsumer:
                     error=str(e),
                 )
                 # Delete malformed message
-                await self._delete_message(receipt_handle, message_id)
-                return
+                return True
 
             # Parse protobuf
             try:
@@ -232,8 +385,7 @@ class SQSConsumer:
                     error=str(e),
                 )
                 # Delete malformed message
-                await self._delete_message(receipt_handle, message_id)
-                return
+                return True
 
             if not auth_request_id:
                 self.logger.error(
@@ -241,8 +393,7 @@ class SQSConsumer:
                     message_id=message_id,
                 )
                 # Delete malformed message to avoid reprocessing
-                await self._delete_message(receipt_handle, message_id)
-                return
+                return True
 
             # Prepare message data for handler
             message_data = {
@@ -268,47 +419,72 @@ class SQSConsumer:
                     auth_request_id=auth_request_id,
                 )
 
-            # Delete message after successful processing
-            await self._delete_message(receipt_handle, message_id)
+            # Deleted with the rest of the batch after successful processing
+            return True
 
         except Exception as e:
+            # No traceback: handlers log their own errors, and raising is how
+            # a handler asks for a retry (every retryable failure lands here)
             self.logger.error(
                 "message_processing_error",
                 message_id=message_id,
                 error=str(e),
                 receive_count=receive_count,
-                exc_info=True,
             )
             # Don't delete - let visibility timeout expire for retry
             # The message will be reprocessed based on the queue's redrive policy
+            return False
 
-    async def _delete_message(self, receipt_handle: str | None, message_id: str) -> None:
+    async def _delete_messages(self, messages: list[dict[str, Any]]) -> None:
         """
-        Delete a message from SQS after successful processing.
+        Delete processed messages from SQS with DeleteMessageBatch.
+
+        Messages that SQS fails to delete are logged and become visible again
+        after the visibility timeout.
 
         Args:
-            receipt_handle: SQS receipt handle for the message
-            message_id: Message ID for logging
+            messages: SQS messages to delete (at most 10 per API call)
         """
-        if not receipt_handle:
-            self.logger.error("missing_receipt_handle", message_id=message_id)
+        # Entry ids only need to be unique within a call; the MessageId is,
+        # and lets failures be logged against the message
+        entries = []
+        for index, message in enumerate(messages):
+            message_id = message.get("MessageId")
+            receipt_handle = message.get("ReceiptHandle")
+            if not receipt_handle:
+                self.logger.error("missing_receipt_handle", message_id=message_id)
+                continue
+            entries.append({"Id": message_id or str(index), "ReceiptHandle": receipt_handle})
+
+        if not entries:
             return
 
         if not self._sqs_client:
             raise RuntimeError("SQS client not initialized")
 
-        try:
-            await self._sqs_client.delete_message(
-                QueueUrl=self.queue_url,
-                ReceiptHandle=receipt_handle,
-            )
-            self.logger.info("message_deleted", message_id=message_id)
+        for start in range(0, len(entries), DELETE_BATCH_MAX_ENTRIES):
+            chunk = entries[start : start + DELETE_BATCH_MAX_ENTRIES]
+            try:
+                response = await self._sqs_client.delete_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=chunk,
+                )
+            except (BotoCoreError, ClientError) as e:
+                self.logger.error(
+                    "message_delete_error",
+                    count=len(chunk),
+                    error=str(e),
+                    exc_info=True,
+                )
+                # Don't raise - messages will become visible again after timeout
+                continue
 
-        except (BotoCoreError, ClientError) as e:
-            self.logger.error(
-                "message_delete_error",
-                message_id=message_id,
-                error=str(e),
-                exc_info=True,
-            )
-            # Don't raise - message will become visible again after timeout
+            failed = response.get("Failed", [])
+            for failure in failed:
+                self.logger.error(
+                    "message_delete_failed",
+                    message_id=failure.get("Id"),
+                    code=failure.get("Code"),
+                    error=failure.get("Message"),
+                )
+            self.logger.info("messages_deleted", count=len(chunk) - len(failed))
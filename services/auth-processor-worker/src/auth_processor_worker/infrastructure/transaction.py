@@ -2,17 +2,34 @@
 
 This module implements the critical requirement: Events and read model updates
 MUST be in the same database transaction. If either fails, both rollback.
+
+Transactions run at READ COMMITTED. Per-aggregate event order is enforced
+by the unique_aggregate_sequence index, not by the isolation level: an
+append that loses a race for a sequence number fails with a unique
+violation and is retried in a new transaction (see append_in_transaction).
 """
 
+import functools
 import uuid
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 
+import asyncpg
 import structlog
 
 from auth_processor_worker.infrastructure import database, event_store, read_model
 
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+
+# Unique constraint on payment_events (aggregate_id, sequence_number)
+SEQUENCE_CONSTRAINT = "unique_aggregate_sequence"
+
+# Attempts per transaction when concurrent appends take the sequence number
+SEQUENCE_CONFLICT_ATTEMPTS = 3
+
 
 class EventType:
     """Event type constants."""
@@ -23,6 +40,48 @@ class EventType:
     AUTH_REQUEST_EXPIRED = "AuthRequestExpired"
 
 
+def _new_event(
+    auth_request_id: uuid.UUID,
+    event_type: str,
+    event_data: bytes,
+    metadata: dict[str, Any] | None,
+) -> event_store.NewEvent:
+    """Build the next event of an auth request for the read model updates to append."""
+    return event_store.NewEvent(
+        aggregate_id=auth_request_id,
+        aggregate_type="auth_request",
+        event_type=event_type,
+        event_data=event_data,
+        metadata=metadata,
+    )
+
+
+async def append_in_transaction(append: Callable[..., Awaitable[T]]) -> T:
+    """Run append(conn=...) in a new transaction and return its result.
+
+    The whole transaction is retried when another transaction appended to
+    the same aggregate first, since the failed INSERT aborts it. Any other
+    error, including other unique violations, is raised unchanged.
+
+    Args:
+        append: Coroutine function writing the event on the given connection
+
+    Returns:
+        The result of append, e.g. the sequence number of the recorded event
+    """
+    for attempt in range(1, SEQUENCE_CONFLICT_ATTEMPTS):
+        try:
+            async with database.transaction() as conn:
+                return await append(conn=conn)
+        except asyncpg.UniqueViolationError as e:
+            if e.constraint_name != SEQUENCE_CONSTRAINT:
+                raise
+            logger.warning("event_sequence_conflict", attempt=attempt)
+
+    async with database.transaction() as conn:
+        return await append(conn=conn)
+
+
 async def record_auth_attempt_started(
     auth_request_id: uuid.UUID,
     event_data: bytes,
@@ -44,38 +103,45 @@ async def record_auth_attempt_started(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_ATTEMPT_STARTED,
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            append_auth_attempt_started,
+            auth_request_id=auth_request_id,
             event_data=event_data,
-            sequence_number=sequence_number,
             metadata=metadata,
         )
+    )
 
-        # Update read model
-        await read_model.update_to_processing(
-            conn=conn,
-            auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
-        )
+    logger.debug("auth_attempt_started_recorded", sequence=sequence_number)
 
-        # Transaction commits here (or rolls back on exception)
+    return sequence_number
 
-    logger.info(
-        "auth_attempt_started_recorded",
-        auth_request_id=str(auth_request_id),
-        sequence=sequence_number,
+
+async def append_auth_attempt_started(
+    conn: asyncpg.Connection,
+    auth_request_id: uuid.UUID,
+    event_data: bytes,
+    metadata: dict[str, Any] | None = None,
+) -> int:
+    """Write AuthAttemptStarted and update status to PROCESSING on conn.
+
+    Like record_auth_attempt_started, but inside the caller's transaction
+    (see locking.acquire_and_start).
+
+    Args:
+        conn: Database connection with an active transaction
+        auth_request_id: Authorization request ID
+        event_data: Serialized protobuf event data
+        metadata: Optional metadata (worker_id, correlation_id, etc.)
+
+    Returns:
+        Sequence number of the recorded event
+    """
+    # Write event and update read model in one statement
+    sequence_number = await read_model.update_to_processing(
+        conn=conn,
+        auth_request_id=auth_request_id,
+        event=_new_event(auth_request_id, EventType.AUTH_ATTEMPT_STARTED, event_data, metadata),
     )
 
     return sequence_number
@@ -89,6 +155,7 @@ async def record_auth_response_authorized(
     authorized_amount_cents: int,
     authorization_code: str,
     metadata: dict[str, Any] | None = None,
+    release_lock_worker_id: str | None = None,
 ) -> int:
     """Record AuthResponseReceived (AUTHORIZED) event and update status.
 
@@ -103,6 +170,8 @@ async def record_auth_response_authorized(
         authorized_amount_cents: Authorized amount in cents
         authorization_code: Authorization code from processor
         metadata: Optional metadata
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same transaction
 
     Returns:
         Sequence number of the recorded event
@@ -110,41 +179,24 @@ async def record_auth_response_authorized(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_RESPONSE_RECEIVED,
-            event_data=event_data,
-            sequence_number=sequence_number,
-            metadata=metadata,
-        )
-
-        # Update read model
-        await read_model.update_to_authorized(
-            conn=conn,
+    # Write event and update read model in one statement
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            read_model.update_to_authorized,
             auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
+            event=_new_event(
+                auth_request_id, EventType.AUTH_RESPONSE_RECEIVED, event_data, metadata
+            ),
             processor_auth_id=processor_auth_id,
             processor_name=processor_name,
             authorized_amount_cents=authorized_amount_cents,
             authorization_code=authorization_code,
+            release_lock_worker_id=release_lock_worker_id,
         )
+    )
 
-        # Transaction commits here (or rolls back on exception)
-
-    logger.info(
+    logger.debug(
         "auth_response_authorized_recorded",
-        auth_request_id=str(auth_request_id),
         processor_name=processor_name,
         sequence=sequence_number,
     )
@@ -159,6 +211,7 @@ async def record_auth_response_denied(
     denial_code: str,
     denial_reason: str,
     metadata: dict[str, Any] | None = None,
+    release_lock_worker_id: str | None = None,
 ) -> int:
     """Record AuthResponseReceived (DENIED) event and update status.
 
@@ -172,6 +225,8 @@ async def record_auth_response_denied(
         denial_code: Denial code from processor
         denial_reason: Human-readable denial reason
         metadata: Optional metadata
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same transaction
 
     Returns:
         Sequence number of the recorded event
@@ -179,40 +234,23 @@ async def record_auth_response_denied(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_RESPONSE_RECEIVED,
-            event_data=event_data,
-            sequence_number=sequence_number,
-            metadata=metadata,
-        )
-
-        # Update read model
-        await read_model.update_to_denied(
-            conn=conn,
+    # Write event and update read model in one statement
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            read_model.update_to_denied,
             auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
+            event=_new_event(
+                auth_request_id, EventType.AUTH_RESPONSE_RECEIVED, event_data, metadata
+            ),
             processor_name=processor_name,
             denial_code=denial_code,
             denial_reason=denial_reason,
+            release_lock_worker_id=release_lock_worker_id,
         )
+    )
 
-        # Transaction commits here (or rolls back on exception)
-
-    logger.info(
+    logger.debug(
         "auth_response_denied_recorded",
-        auth_request_id=str(auth_request_id),
         denial_code=denial_code,
         sequence=sequence_number,
     )
@@ -224,6 +262,7 @@ async def record_auth_attempt_failed_terminal(
     auth_request_id: uuid.UUID,
     event_data: bytes,
     metadata: dict[str, Any] | None = None,
+    release_lock_worker_id: str | None = None,
 ) -> int:
     """Record terminal AuthAttemptFailed event and update status to FAILED.
 
@@ -234,6 +273,8 @@ async def record_auth_attempt_failed_terminal(
         auth_request_id: Authorization request ID
         event_data: Serialized protobuf event data (with is_retryable=False)
         metadata: Optional metadata
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same transaction
 
     Returns:
         Sequence number of the recorded event
@@ -241,40 +282,18 @@ async def record_auth_attempt_failed_terminal(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_ATTEMPT_FAILED,
-            event_data=event_data,
-            sequence_number=sequence_number,
-            metadata=metadata,
-        )
-
-        # Update read model to FAILED
-        await read_model.update_to_failed(
-            conn=conn,
+    # Write event and update read model to FAILED in one statement
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            read_model.update_to_failed,
             auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
+            event=_new_event(auth_request_id, EventType.AUTH_ATTEMPT_FAILED, event_data, metadata),
+            release_lock_worker_id=release_lock_worker_id,
         )
-
-        # Transaction commits here (or rolls back on exception)
-
-    logger.info(
-        "auth_attempt_failed_terminal_recorded",
-        auth_request_id=str(auth_request_id),
-        sequence=sequence_number,
     )
 
+    logger.debug("auth_attempt_failed_terminal_recorded", sequence=sequence_number)
+
     return sequence_number
 
 
@@ -299,40 +318,17 @@ async def record_auth_attempt_failed_retryable(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_ATTEMPT_FAILED,
-            event_data=event_data,
-            sequence_number=sequence_number,
-            metadata=metadata,
-        )
-
-        # Update retry attempt (status remains PROCESSING)
-        await read_model.update_retry_attempt(
-            conn=conn,
+    # Write event and update retry attempt in one statement (status stays PROCESSING)
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            read_model.update_retry_attempt,
             auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
+            event=_new_event(auth_request_id, EventType.AUTH_ATTEMPT_FAILED, event_data, metadata),
         )
-
-        # Transaction commits here (or rolls back on exception)
-
-    logger.info(
-        "auth_attempt_failed_retryable_recorded",
-        auth_request_id=str(auth_request_id),
-        sequence=sequence_number,
     )
 
+    logger.debug("auth_attempt_failed_retryable_recorded", sequence=sequence_number)
+
     return sequence_number
 
 
@@ -340,6 +336,7 @@ async def record_auth_request_expired(
     auth_request_id: uuid.UUID,
     event_data: bytes,
     metadata: dict[str, Any] | None = None,
+    release_lock_worker_id: str | None = None,
 ) -> int:
     """Record AuthRequestExpired event and update status to EXPIRED.
 
@@ -350,6 +347,8 @@ async def record_auth_request_expired(
         auth_request_id: Authorization request ID
         event_data: Serialized protobuf event data
         metadata: Optional metadata
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same transaction
 
     Returns:
         Sequence number of the recorded event
@@ -357,38 +356,50 @@ async def record_auth_request_expired(
     Raises:
         Exception: If transaction fails, both event and read model rollback
     """
-    async with database.transaction() as conn:
-        # Get next sequence number within transaction
-        sequence_number = await event_store.get_next_sequence_number(
-            conn, auth_request_id
-        )
-
-        # Write event
-        event_id = uuid.uuid4()
-        await event_store.write_event(
-            conn=conn,
-            event_id=event_id,
-            aggregate_id=auth_request_id,
-            aggregate_type="auth_request",
-            event_type=EventType.AUTH_REQUEST_EXPIRED,
+    sequence_number = await append_in_transaction(
+        functools.partial(
+            append_auth_request_expired,
+            auth_request_id=auth_request_id,
             event_data=event_data,
-            sequence_number=sequence_number,
             metadata=metadata,
+            release_lock_worker_id=release_lock_worker_id,
         )
+    )
 
-        # Update read model to EXPIRED
-        await read_model.update_to_expired(
-            conn=conn,
-            auth_request_id=auth_request_id,
-            sequence_number=sequence_number,
-        )
+    logger.debug("auth_request_expired_recorded", sequence=sequence_number)
 
-        # Transaction commits here (or rolls back on exception)
+    return sequence_number
 
-    logger.info(
-        "auth_request_expired_recorded",
-        auth_request_id=str(auth_request_id),
-        sequence=sequence_number,
+
+async def append_auth_request_expired(
+    conn: asyncpg.Connection,
+    auth_request_id: uuid.UUID,
+    event_data: bytes,
+    metadata: dict[str, Any] | None = None,
+    release_lock_worker_id: str | None = None,
+) -> int:
+    """Write AuthRequestExpired and update status to EXPIRED on conn.
+
+    Like record_auth_request_expired, but inside the caller's transaction
+    (see locking.acquire_and_start).
+
+    Args:
+        conn: Database connection with an active transaction
+        auth_request_id: Authorization request ID
+        event_data: Serialized protobuf event data
+        metadata: Optional metadata
+        release_lock_worker_id: If set, release this worker's processing lock
+            in the same transaction
+
+    Returns:
+        Sequence number of the recorded event
+    """
+    # Write event and update read model to EXPIRED in one statement
+    sequence_number = await read_model.update_to_expired(
+        conn=conn,
+        auth_request_id=auth_request_id,
+        event=_new_event(auth_request_id, EventType.AUTH_REQUEST_EXPIRED, event_data, metadata),
+        release_lock_worker_id=release_lock_worker_id,
     )
 
     return sequence_number
@@ -2,11 +2,17 @@
 
 import logging
 import sys
+import uuid
 from typing import Any
 
 import structlog
 from structlog.types import EventDict, Processor
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json encoder
+    orjson = None
+
 
 def add_correlation_id(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add correlation ID to log events if present in context."""
@@ -17,6 +23,30 @@ def add_correlation_id(logger: Any, method_name: str, event_dict: EventDict) ->
     return event_dict
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize values json cannot: UUIDs as their canonical string, the rest via repr()."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    return repr(obj)
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Encode a log line with orjson, as str for the stdlib logger.
+
+    orjson writes UUIDs in canonical form itself and only calls default
+    for types it does not support.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+
+
+def _json_renderer() -> Processor:
+    """Return the JSON renderer, backed by orjson when it is installed."""
+    if orjson is not None:
+        return structlog.processors.JSONRenderer(serializer=_orjson_dumps, default=_json_default)
+    # UUIDs are logged as-is and only stringified when a line is emitted
+    return structlog.processors.JSONRenderer(default=_json_default)
+
+
 def configure_logging(
     log_level: str = "INFO",
     format_as_json: bool = True,
@@ -30,15 +60,20 @@ def configure_logging(
         format_as_json: If True, output logs as JSON; otherwise use console format
         include_correlation_id: If True, include correlation IDs in logs
     """
+    level = getattr(logging, log_level.upper())
+
     # Configure standard logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
+        level=level,
     )
 
     # Build processor chain
     processors: list[Processor] = [
+        # Honour per-logger stdlib levels (the wrapper below already drops
+        # anything under the global level)
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
@@ -52,21 +87,23 @@ def configure_logging(
 
     # Add appropriate renderer
     if format_as_json:
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(_json_renderer())
     else:
         processors.append(structlog.dev.ConsoleRenderer())
 
     # Configure structlog
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Calls below the level are no-ops: no event dict is built and no
+        # processor runs, so per-request debug logs cost nothing in production
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str) -> structlog.typing.FilteringBoundLogger:
     """
     Get a structured logger instance.
 
@@ -6,8 +6,20 @@ import sys
 import uuid
 from typing import Any
 
+try:
+    import uvloop
+except ImportError:  # optional (e.g. Windows dev machines): use the default asyncio loop
+    uvloop = None
+
+from google.protobuf.internal import api_implementation
+
+from auth_processor_worker.clients.payment_token_client import (
+    close_shared_http_client,
+    get_shared_client,
+)
 from auth_processor_worker.config import settings
 from auth_processor_worker.handlers.processor import ProcessingResult, process_auth_request
+from auth_processor_worker.infrastructure import database
 from auth_processor_worker.infrastructure.sqs_consumer import SQSConsumer
 from auth_processor_worker.logging_config import configure_logging, get_logger
 
@@ -24,9 +36,11 @@ logger = get_logger(__name__)
 class Worker:
     """Main worker class that orchestrates auth request processing."""
 
+    # Shared by all instances; bound once at import, not per instance
+    logger = get_logger("Worker")
+
     def __init__(self) -> None:
         self.running = False
-        self.logger = get_logger(self.__class__.__name__)
         self.sqs_consumer: SQSConsumer | None = None
 
     async def _handle_message(self, message_data: dict[str, Any]) -> None:
@@ -65,23 +79,6 @@ class Worker:
                 worker_id=settings.worker.worker_id,
                 receive_count=receive_count,
             )
-
-            self.logger.info(
-                "auth_request_processed",
-                auth_request_id=auth_request_id_str,
-                result=result,
-                receive_count=receive_count,
-            )
-
-            # Note: SQS message deletion happens in the SQS consumer
-            # after this handler completes successfully. If we raise an
-            # exception, the message will not be deleted and will be retried.
-            #
-            # For RETRYABLE_FAILURE, we want the message to be retried,
-            # so we raise an exception to prevent deletion.
-            if result == ProcessingResult.RETRYABLE_FAILURE:
-                raise Exception("Retryable failure - message will be retried")
-
         except Exception as e:
             self.logger.error(
                 "message_handling_error",
@@ -92,6 +89,23 @@ class Worker:
             # Re-raise to prevent SQS message deletion
             raise
 
+        self.logger.info(
+            "auth_request_processed",
+            auth_request_id=auth_request_id_str,
+            result=result,
+            receive_count=receive_count,
+        )
+
+        # Note: SQS message deletion happens in the SQS consumer
+        # after this handler completes successfully. If we raise an
+        # exception, the message will not be deleted and will be retried.
+        #
+        # For RETRYABLE_FAILURE, we want the message to be retried,
+        # so we raise an exception to prevent deletion. The failure is
+        # already logged above, so this raise carries no traceback log.
+        if result == ProcessingResult.RETRYABLE_FAILURE:
+            raise Exception("Retryable failure - message will be retried")
+
     async def start(self) -> None:
         """Start the worker and begin processing messages."""
         self.running = True
@@ -100,7 +114,21 @@ class Worker:
             worker_id=settings.worker.worker_id,
             environment=settings.environment,
             sqs_queue_url=settings.worker.sqs_queue_url,
+            protobuf_backend=api_implementation.Type(),
         )
+        if api_implementation.Type() == "python":
+            # protobuf >= 4.21 defaults to upb; the pure-Python parser is many
+            # times slower on every SQS message
+            self.logger.warning(
+                "protobuf_pure_python_backend",
+                hint="unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION or install a binary wheel",
+            )
+
+        # Open the database pool and connect to the Payment Token Service
+        # before the first message arrives (concurrent first messages would
+        # otherwise race to create the pool)
+        await database.get_pool()
+        await get_shared_client().warmup()
 
         # Initialize SQS consumer
         self.sqs_consumer = SQSConsumer(
@@ -121,7 +149,12 @@ class Worker:
             raise
 
     async def stop(self) -> None:
-        """Gracefully stop the worker."""
+        """Gracefully stop the worker.
+
+        Waits for the batch in progress, so in-flight messages can still
+        record their results. The database pool and HTTP client stay open;
+        main() closes them once start() has returned.
+        """
         self.logger.info("worker_stopping")
         self.running = False
 
@@ -129,7 +162,7 @@ class Worker:
         if self.sqs_consumer:
             await self.sqs_consumer.stop()
 
-        # TODO: Clean up database connections, release locks, etc.
+        # TODO: Release locks held by in-flight messages
 
 
 async def main() -> None:
@@ -155,8 +188,15 @@ async def main() -> None:
         sys.exit(1)
     finally:
         await worker.stop()
+
+        # Close pooled connections to the Payment Token Service and database
+        # only now that no message is being processed
+        await close_shared_http_client()
+        await database.close_pool()
         logger.info("worker_stopped")
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
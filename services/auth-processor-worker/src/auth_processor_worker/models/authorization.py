@@ -13,13 +13,14 @@ class AuthStatus(str, Enum):
     DENIED = "DENIED"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PaymentData:
     """
     Decrypted payment data from Payment Token Service.
 
     This represents the sensitive card information that has been
     decrypted and is ready to be sent to the payment processor.
+    Instances are immutable and slotted (no per-instance __dict__).
     """
 
     card_number: str
@@ -6,6 +6,8 @@ the worker to dynamically choose the correct processor (Stripe, Chase,
 Worldpay, etc.) based on restaurant configuration.
 """
 
+import functools
+import json
 from typing import Any
 
 import structlog
@@ -17,6 +19,9 @@ from auth_processor_worker.processors.stripe_processor import StripeProcessor
 
 logger = structlog.get_logger(__name__)
 
+# Distinct (processor, config) pairs kept by get_processor()
+PROCESSOR_CACHE_SIZE = 256
+
 
 class ProcessorFactory:
     """
@@ -171,16 +176,21 @@ def get_processor(
     processor_config: dict[str, Any] | None = None,
 ) -> PaymentProcessor:
     """
-    Convenience function to create a payment processor.
+    Convenience function to get a payment processor.
 
     This is the recommended way to get a processor instance in the worker.
+    Instances are cached per (processor name, config), so auth requests for
+    restaurants sharing a configuration reuse one processor instead of
+    constructing it per request. A changed config (e.g. a new config_version
+    with a rotated key) is a different cache key; stale entries age out of
+    the LRU cache.
 
     Args:
         processor_name: Name of processor (defaults to "stripe")
         processor_config: Optional processor-specific config
 
     Returns:
-        PaymentProcessor instance
+        PaymentProcessor instance (shared; processors hold no per-request state)
 
     Examples:
         # Use default Stripe processor
@@ -198,4 +208,14 @@ def get_processor(
     if processor_name is None:
         processor_name = "stripe"  # Default processor
 
+    config_key = (
+        None if processor_config is None else json.dumps(processor_config, sort_keys=True)
+    )
+    return _get_cached_processor(processor_name.lower(), config_key)
+
+
+@functools.lru_cache(maxsize=PROCESSOR_CACHE_SIZE)
+def _get_cached_processor(processor_name: str, config_key: str | None) -> PaymentProcessor:
+    """Create a processor for a canonical (name, JSON config) key, memoized."""
+    processor_config = None if config_key is None else json.loads(config_key)
     return ProcessorFactory.create_processor(processor_name, processor_config)
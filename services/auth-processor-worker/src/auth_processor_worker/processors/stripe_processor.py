@@ -150,8 +150,12 @@ class StripeProcessor(PaymentProcessor):
             # Create and confirm the payment intent
             # Note: Stripe's Python SDK doesn't accept a timeout parameter.
             # Timeout should be configured at the HTTP client level if needed.
+            # api_key is passed per request: processors are cached and shared
+            # (see get_processor), so the module-level stripe.api_key may
+            # belong to another restaurant's processor.
             payment_intent = stripe.PaymentIntent.create(
                 **intent_params,
+                api_key=self.api_key,
                 expand=["charges"]  # Expand charges to access authorization_code
             )
 
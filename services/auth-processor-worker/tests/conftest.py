@@ -18,14 +18,8 @@ import pytest_asyncio
 from alembic import command
 from alembic.config import Config
 
-# Add src and shared to path
+# Add src to path (payments_proto is installed by `make install`)
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-sys.path.insert(
-    0, "/Users/randy/sudocodeai/demos/payments-infra/shared/python"
-)
-sys.path.insert(
-    0, "/Users/randy/sudocodeai/demos/payments-infra/shared/python/payments_proto"
-)
 
 
 # Test database URL - use a separate test database
@@ -434,8 +428,7 @@ async def seed_restaurant_config(db_conn):
                 config_version = EXCLUDED.config_version,
                 processor_name = EXCLUDED.processor_name,
                 processor_config = EXCLUDED.processor_config,
-                is_active = EXCLUDED.is_active,
-                updated_at = NOW()
+                is_active = EXCLUDED.is_active
             """,
             restaurant_id,
             config_version,
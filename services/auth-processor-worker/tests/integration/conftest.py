@@ -75,8 +75,7 @@ async def setup_mock_processor_config(db_conn, test_restaurant_id):
         DO UPDATE SET
             processor_name = 'mock',
             processor_config = '{}',
-            is_active = true,
-            updated_at = NOW()
+            is_active = true
         """,
         test_restaurant_id,
     )
@@ -10,9 +10,7 @@ import asyncio
 import base64
 import json
 import os
-import sys
 import uuid
-from pathlib import Path
 from typing import Any
 
 import aioboto3
@@ -20,11 +18,6 @@ import pytest
 import pytest_asyncio
 from botocore.exceptions import ClientError
 
-# Add shared proto directory to Python path
-_shared_proto_path = Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import events_pb2
 
 # Test queue configuration
@@ -201,7 +194,6 @@ async def receive_messages(sqs_client, test_sqs_queue):
             WaitTimeSeconds=wait_time_seconds,
             VisibilityTimeout=visibility_timeout,
             AttributeNames=["ApproximateReceiveCount", "MessageGroupId"],
-            MessageAttributeNames=["All"],
         )
 
         return response.get("Messages", [])
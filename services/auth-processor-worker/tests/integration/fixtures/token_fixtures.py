@@ -5,17 +5,10 @@ Payment Token Service during integration tests. This allows testing the worker
 in isolation while simulating various token service scenarios.
 """
 
-import sys
-from pathlib import Path
 from typing import Any
 
 import pytest
 
-# Add shared proto directory to Python path
-_shared_proto_path = Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import common_pb2, payment_token_pb2
 
 from auth_processor_worker.models.exceptions import (
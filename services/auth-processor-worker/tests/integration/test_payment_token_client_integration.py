@@ -4,19 +4,9 @@ These tests verify the client works end-to-end with a mock HTTP server
 that simulates the Payment Token Service API.
 """
 
-import sys
-from pathlib import Path
-
 import pytest
 from aiohttp import web
 
-# Add shared proto directory to Python path
-_shared_proto_path = (
-    Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-)
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import common_pb2, payment_token_pb2
 
 from auth_processor_worker.clients.payment_token_client import PaymentTokenServiceClient
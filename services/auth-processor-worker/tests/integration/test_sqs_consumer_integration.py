@@ -4,19 +4,12 @@ import asyncio
 import base64
 import json
 import os
-import sys
 import uuid
-from pathlib import Path
 
 import aioboto3
 import pytest
 import pytest_asyncio
 
-# Add shared proto directory to Python path
-_shared_proto_path = Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import events_pb2
 
 from auth_processor_worker.infrastructure.sqs_consumer import SQSConsumer
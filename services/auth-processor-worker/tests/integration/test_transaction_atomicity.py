@@ -10,12 +10,13 @@ They test the critical guarantees:
 """
 
 import asyncio
-import uuid
+import json
 from unittest.mock import patch
 
+import asyncpg
 import pytest
 
-from auth_processor_worker.infrastructure import event_store, read_model, transaction
+from auth_processor_worker.infrastructure import database, event_store, read_model, transaction
 
 
 @pytest.mark.integration
@@ -41,13 +42,23 @@ class TestTransactionAtomicity:
         assert initial_state["status"] == "PENDING"
         assert initial_state["last_event_sequence"] == 0
 
-        # Simulate event write failure by patching the write_event function
+        # Simulate event write failure: event_data violates NOT NULL. The
+        # INSERT runs in the same statement as the read model UPDATE.
+        def event_without_data(auth_request_id, event_type, event_data, metadata):
+            return event_store.NewEvent(
+                aggregate_id=auth_request_id,
+                aggregate_type="auth_request",
+                event_type=event_type,
+                event_data=None,
+                metadata=metadata,
+            )
+
         with patch(
-            "auth_processor_worker.infrastructure.transaction.event_store.write_event",
-            side_effect=Exception("Simulated event write failure"),
+            "auth_processor_worker.infrastructure.transaction._new_event",
+            side_effect=event_without_data,
         ):
             # Attempt to record event (should fail and rollback)
-            with pytest.raises(Exception, match="Simulated event write failure"):
+            with pytest.raises(asyncpg.exceptions.NotNullViolationError):
                 await transaction.record_auth_attempt_started(
                     auth_request_id=auth_request_id,
                     event_data=b"test_data",
@@ -130,11 +141,26 @@ class TestTransactionAtomicity:
         )
         assert event_count == 1
 
-        # Now try to insert duplicate sequence number (should violate unique constraint)
+        # Now try to insert a duplicate event_id (should violate unique constraint)
         # This should cause rollback of both event and read model update
+        first_event_id = await db_conn.fetchval(
+            "SELECT event_id FROM payment_events WHERE aggregate_id = $1",
+            auth_request_id,
+        )
+
+        def duplicate_event(auth_request_id, event_type, event_data, metadata):
+            return event_store.NewEvent(
+                aggregate_id=auth_request_id,
+                aggregate_type="auth_request",
+                event_type=event_type,
+                event_data=event_data,
+                metadata=metadata,
+                event_id=first_event_id,
+            )
+
         with patch(
-            "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
-            return_value=1,  # Force duplicate sequence
+            "auth_processor_worker.infrastructure.transaction._new_event",
+            side_effect=duplicate_event,  # Force duplicate event_id
         ):
             with pytest.raises(Exception):  # Should raise constraint violation
                 await transaction.record_auth_response_authorized(
@@ -208,6 +234,39 @@ class TestImmediateConsistency:
         assert event["event_type"] == "AuthAttemptStarted"
         assert event["sequence_number"] == sequence
 
+    @pytest.mark.asyncio
+    async def test_event_metadata_round_trips_as_jsonb(self, db_conn, seed_auth_request):
+        """Test that metadata written by the pool's jsonb codec is stored as a JSON object."""
+        auth_request_id = seed_auth_request
+        metadata = {"worker_id": "test-worker", "attempt": 2, "tags": ["a", "b"]}
+
+        await transaction.record_auth_attempt_started(
+            auth_request_id=auth_request_id,
+            event_data=b"test_data",
+            metadata=metadata,
+        )
+
+        # Read as text on a connection without the codec: stored as an object,
+        # not as a JSON-encoded string
+        row = await db_conn.fetchrow(
+            """
+            SELECT jsonb_typeof(metadata) AS kind, metadata::text AS text
+            FROM payment_events
+            WHERE aggregate_id = $1
+            """,
+            auth_request_id,
+        )
+        assert row["kind"] == "object"
+        assert json.loads(row["text"]) == metadata
+
+        # Read back through the worker's pool: decoded by the same codec
+        async with database.get_connection() as conn:
+            decoded = await conn.fetchval(
+                "SELECT metadata FROM payment_events WHERE aggregate_id = $1",
+                auth_request_id,
+            )
+        assert decoded == metadata
+
     @pytest.mark.asyncio
     async def test_multiple_sequential_updates_consistent(
         self, db_conn, seed_auth_request
@@ -429,21 +488,16 @@ class TestTransactionIsolation:
         # Transaction 1: Start but don't commit
         async with db_pool.acquire() as conn1:
             async with conn1.transaction():
-                # Write event but don't commit yet
-                await event_store.write_event(
-                    conn=conn1,
-                    event_id=uuid.uuid4(),
-                    aggregate_id=auth_request_id,
-                    aggregate_type="auth_request",
-                    event_type="AuthAttemptStarted",
-                    event_data=b"test",
-                    sequence_number=1,
-                )
-
+                # Write event and update read model but don't commit yet
                 await read_model.update_to_processing(
                     conn=conn1,
                     auth_request_id=auth_request_id,
-                    sequence_number=1,
+                    event=event_store.NewEvent(
+                        aggregate_id=auth_request_id,
+                        aggregate_type="auth_request",
+                        event_type="AuthAttemptStarted",
+                        event_data=b"test",
+                    ),
                 )
 
                 # Transaction 2: Check if it can see uncommitted changes
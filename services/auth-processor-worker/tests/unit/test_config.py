@@ -0,0 +1,76 @@
+"""Unit tests for environment-based settings loading."""
+
+import dataclasses
+import os
+
+import pytest
+
+from auth_processor_worker.config import Settings
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Remove worker settings from the environment so defaults apply."""
+    for name in list(os.environ):
+        if name.upper().startswith(
+            ("WORKER__", "PAYMENT_TOKEN_SERVICE__", "STRIPE__", "DATABASE_", "DEBUG")
+        ):
+            monkeypatch.delenv(name)
+
+
+class TestSettingsFromEnv:
+    """Test suite for Settings.from_env()."""
+
+    def test_defaults_without_env(self, clean_env, tmp_path):
+        """Test that missing variables fall back to the defaults."""
+        settings = Settings.from_env(tmp_path / "missing.env")
+
+        assert settings.worker.batch_size == 10
+        assert settings.payment_token_service.base_url == "http://localhost:8000"
+        assert settings.payment_token_service.uds_path is None
+        assert settings.debug is False
+
+    def test_nested_and_typed_values(self, clean_env, monkeypatch, tmp_path):
+        """Test nested "__" names, case-insensitivity and type conversion."""
+        monkeypatch.setenv("WORKER__BATCH_SIZE", "5")
+        monkeypatch.setenv("payment_token_service__retry_jitter", "0.25")
+        monkeypatch.setenv("PAYMENT_TOKEN_SERVICE__HTTP2", "true")
+        monkeypatch.setenv("PAYMENT_TOKEN_SERVICE__UDS_PATH", "/run/pts.sock")
+
+        settings = Settings.from_env(tmp_path / "missing.env")
+
+        assert settings.worker.batch_size == 5
+        assert settings.payment_token_service.retry_jitter == 0.25
+        assert settings.payment_token_service.http2 is True
+        assert settings.payment_token_service.uds_path == "/run/pts.sock"
+
+    def test_environment_overrides_env_file(self, clean_env, monkeypatch, tmp_path):
+        """Test that .env values apply unless the environment sets them too."""
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# comment\n"
+            "WORKER__WORKER_ID=worker-from-file\n"
+            'STRIPE__API_KEY="sk_test_file"\n'
+            "DEBUG=1\n"
+        )
+        monkeypatch.setenv("WORKER__WORKER_ID", "worker-from-env")
+
+        settings = Settings.from_env(env_file)
+
+        assert settings.worker.worker_id == "worker-from-env"
+        assert settings.stripe.api_key == "sk_test_file"
+        assert settings.debug is True
+
+    def test_invalid_value_names_the_variable(self, clean_env, monkeypatch, tmp_path):
+        """Test that a malformed value fails with the variable name."""
+        monkeypatch.setenv("WORKER__BATCH_SIZE", "ten")
+
+        with pytest.raises(ValueError, match="WORKER__BATCH_SIZE"):
+            Settings.from_env(tmp_path / "missing.env")
+
+    def test_settings_are_frozen(self, clean_env, tmp_path):
+        """Test that settings cannot be modified after loading."""
+        settings = Settings.from_env(tmp_path / "missing.env")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.worker.batch_size = 5
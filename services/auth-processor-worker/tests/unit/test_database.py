@@ -0,0 +1,60 @@
+"""Unit tests for database pool configuration."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from auth_processor_worker.infrastructure import database
+
+
+@pytest.mark.asyncio
+async def test_create_pool_keeps_prepared_statements_cached():
+    """Cached statements are sized explicitly and never expire."""
+    with patch.object(database.asyncpg, "create_pool", new=AsyncMock()) as mock_create_pool:
+        await database.create_pool()
+
+    kwargs = mock_create_pool.call_args.kwargs
+    assert kwargs["statement_cache_size"] == database.STATEMENT_CACHE_SIZE
+    assert kwargs["max_cached_statement_lifetime"] == 0
+
+
+@pytest.mark.asyncio
+async def test_create_pool_uses_configured_size():
+    """Pool bounds come from settings rather than hard-coded values."""
+    with patch.object(database.asyncpg, "create_pool", new=AsyncMock()) as mock_create_pool:
+        await database.create_pool()
+
+    kwargs = mock_create_pool.call_args.kwargs
+    assert kwargs["min_size"] == database.settings.database_pool_min_size
+    assert kwargs["max_size"] == database.settings.database_pool_max_size
+    # Room for a full SQS batch (10 messages) in flight at once
+    assert kwargs["max_size"] > 10
+
+
+@pytest.mark.asyncio
+async def test_jsonb_codec_uses_binary_format_with_orjson():
+    """With orjson, jsonb round-trips through the binary wire format."""
+    pytest.importorskip("orjson")
+    conn = AsyncMock()
+
+    await database._init_connection(conn)
+
+    kwargs = conn.set_type_codec.call_args.kwargs
+    assert kwargs["format"] == "binary"
+    metadata = {"worker_id": "worker-1", "attempt": 2}
+    encoded = kwargs["encoder"](metadata)
+    assert encoded[:1] == b"\x01"
+    assert kwargs["decoder"](encoded) == metadata
+
+
+@pytest.mark.asyncio
+async def test_jsonb_codec_falls_back_to_json_text():
+    """Without orjson, jsonb uses the stdlib json text codec."""
+    conn = AsyncMock()
+
+    with patch.object(database, "orjson", None):
+        await database._init_connection(conn)
+
+    kwargs = conn.set_type_codec.call_args.kwargs
+    assert "format" not in kwargs
+    assert kwargs["encoder"] is database.json.dumps
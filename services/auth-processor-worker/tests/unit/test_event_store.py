@@ -0,0 +1,60 @@
+"""Unit tests for event store helpers."""
+
+import time
+import uuid
+from auth_processor_worker.infrastructure.event_store import (
+    NewEvent,
+    append_event_statement,
+    new_event_id,
+)
+
+
+def test_new_event_id_is_uuidv7():
+    """Generated event IDs carry the v7 version and RFC 9562 variant bits."""
+    event_id = new_event_id()
+
+    assert event_id.version == 7
+    assert event_id.variant == "specified in RFC 4122"
+
+
+def test_new_event_id_embeds_current_timestamp():
+    """The leading 48 bits hold the generation time in milliseconds."""
+    before_ms = time.time_ns() // 1_000_000
+    event_id = new_event_id()
+    after_ms = time.time_ns() // 1_000_000
+
+    assert before_ms <= event_id.int >> 80 <= after_ms
+
+
+def test_new_event_id_is_time_ordered():
+    """IDs generated in later milliseconds sort after earlier ones."""
+    first = new_event_id()
+    time.sleep(0.002)
+    second = new_event_id()
+
+    assert first < second
+
+
+def test_append_event_statement_numbers_params_from_first_param():
+    """The INSERT computes the sequence number and uses six placeholders from first_param."""
+    sql = append_event_statement(first_param=4)
+
+    assert "COALESCE(MAX(sequence_number), 0) + 1" in sql
+    assert "RETURNING sequence_number" in sql
+    assert all(f"${n}" in sql for n in range(4, 10))
+    assert "$3" not in sql and "$10" not in sql
+
+
+def test_new_event_args_leave_metadata_to_jsonb_codec():
+    """Metadata is passed as a dict so the jsonb codec encodes it exactly once."""
+    metadata = {"worker_id": "worker-1", "timestamp": "2026-01-01T00:00:00+00:00"}
+    event = NewEvent(
+        aggregate_id=uuid.uuid4(),
+        aggregate_type="auth_request",
+        event_type="AuthAttemptStarted",
+        event_data=b"\x0a",
+        metadata=metadata,
+    )
+
+    assert event.args()[-1] == metadata
+    assert event.args()[0] == event.event_id
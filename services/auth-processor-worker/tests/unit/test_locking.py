@@ -8,6 +8,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from auth_processor_worker.infrastructure.locking import (
+    LockStartResult,
+    acquire_and_start,
     acquire_lock,
     release_lock,
     cleanup_expired_locks,
@@ -122,6 +124,23 @@ class TestAcquireLock:
             result2 = await acquire_lock(auth_request_id, "worker-2")
             assert result2 is False
 
+    @pytest.mark.asyncio
+    async def test_acquire_lock_takes_over_expired_lock(self, auth_request_id, worker_id):
+        """Test that an expired lock is taken over in the acquiring statement."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {"auth_request_id": auth_request_id}
+
+        with patch("auth_processor_worker.infrastructure.locking.get_connection") as mock_get_conn:
+            mock_get_conn.return_value.__aenter__.return_value = mock_conn
+
+            result = await acquire_lock(auth_request_id, worker_id)
+
+            assert result is True
+            mock_conn.fetchrow.assert_called_once()
+            query = mock_conn.fetchrow.call_args[0][0]
+            assert "DO UPDATE" in query
+            assert "auth_processing_locks.expires_at < NOW()" in query
+
     @pytest.mark.asyncio
     async def test_acquire_lock_database_error(self, auth_request_id, worker_id):
         """Test handling of database errors during lock acquisition."""
@@ -135,6 +154,97 @@ class TestAcquireLock:
                 await acquire_lock(auth_request_id, worker_id)
 
 
+class TestAcquireAndStart:
+    """Test cases for acquire_and_start function."""
+
+    @pytest.mark.asyncio
+    async def test_acquired_and_started(self, auth_request_id, worker_id):
+        """Test that the attempt is recorded in the lock's transaction."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {"acquired": True, "void_detected": False}
+
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction"
+        ) as mock_transaction, patch(
+            "auth_processor_worker.infrastructure.locking.append_auth_attempt_started",
+            new_callable=AsyncMock,
+        ) as mock_append:
+            mock_transaction.return_value.__aenter__.return_value = mock_conn
+
+            result = await acquire_and_start(
+                auth_request_id, worker_id, 30, b"started", b"expired", {"worker_id": worker_id}
+            )
+
+        assert result == LockStartResult.ACQUIRED_STARTED
+        mock_conn.fetchrow.assert_called_once()
+        query = mock_conn.fetchrow.call_args[0][0]
+        assert "auth_processing_locks.expires_at < NOW()" in query
+        assert "AuthVoidRequested" in query
+        mock_append.assert_awaited_once_with(
+            conn=mock_conn,
+            auth_request_id=auth_request_id,
+            event_data=b"started",
+            metadata={"worker_id": worker_id},
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("void_detected", [False, True])
+    async def test_lock_held(self, auth_request_id, worker_id, void_detected):
+        """Test that nothing is recorded when the lock is held."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {"acquired": False, "void_detected": void_detected}
+
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction"
+        ) as mock_transaction, patch(
+            "auth_processor_worker.infrastructure.locking.append_auth_attempt_started",
+            new_callable=AsyncMock,
+        ) as mock_append, patch(
+            "auth_processor_worker.infrastructure.locking.append_auth_request_expired",
+            new_callable=AsyncMock,
+        ) as mock_append_expired:
+            mock_transaction.return_value.__aenter__.return_value = mock_conn
+
+            result = await acquire_and_start(auth_request_id, worker_id, 30, b"started", b"expired")
+
+        assert result == LockStartResult.LOCK_HELD
+        # A single statement; no diagnostic lookup of the lock holder
+        mock_conn.fetchrow.assert_called_once()
+        mock_append.assert_not_called()
+        mock_append_expired.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_voided(self, auth_request_id, worker_id):
+        """Test that a voided request is expired and unlocked in the lock's transaction."""
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {"acquired": True, "void_detected": True}
+
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction"
+        ) as mock_transaction, patch(
+            "auth_processor_worker.infrastructure.locking.append_auth_attempt_started",
+            new_callable=AsyncMock,
+        ) as mock_append, patch(
+            "auth_processor_worker.infrastructure.locking.append_auth_request_expired",
+            new_callable=AsyncMock,
+        ) as mock_append_expired:
+            mock_transaction.return_value.__aenter__.return_value = mock_conn
+
+            result = await acquire_and_start(
+                auth_request_id, worker_id, 30, b"started", b"expired", {"worker_id": worker_id}
+            )
+
+        assert result == LockStartResult.VOIDED
+        mock_append.assert_not_called()
+        mock_append_expired.assert_awaited_once_with(
+            conn=mock_conn,
+            auth_request_id=auth_request_id,
+            event_data=b"expired",
+            metadata={"worker_id": worker_id},
+            release_lock_worker_id=worker_id,
+        )
+
+
 class TestReleaseLock:
     """Test cases for release_lock function."""
 
@@ -229,6 +339,21 @@ class TestCleanupExpiredLocks:
             assert count == 0
             mock_conn.execute.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_cleanup_deletes_in_batches(self):
+        """Test that cleanup repeats full batches until one comes back short."""
+        mock_conn = AsyncMock()
+        mock_conn.execute.side_effect = ["DELETE 2", "DELETE 2", "DELETE 1"]
+
+        with patch("auth_processor_worker.infrastructure.locking.get_connection") as mock_get_conn:
+            mock_get_conn.return_value.__aenter__.return_value = mock_conn
+
+            count = await cleanup_expired_locks(batch_size=2)
+
+            assert count == 5
+            assert mock_conn.execute.call_count == 3
+            assert mock_conn.execute.call_args.args[1] == 2
+
     @pytest.mark.asyncio
     async def test_cleanup_database_error(self):
         """Test handling of database errors during cleanup."""
@@ -0,0 +1,78 @@
+"""Unit tests for structured logging configuration."""
+
+import json
+import logging
+import uuid
+
+import pytest
+import structlog
+
+from auth_processor_worker import logging_config
+from auth_processor_worker.logging_config import configure_logging, get_logger
+
+
+@pytest.fixture
+def reset_structlog():
+    """Restore structlog's default configuration after each test."""
+    yield
+    structlog.reset_defaults()
+
+
+class TestConfigureLogging:
+    """Test suite for configure_logging()."""
+
+    def test_info_level_drops_debug_events(self, reset_structlog, caplog):
+        """Test that debug calls are dropped even if stdlib would accept them."""
+        configure_logging(log_level="INFO")
+        caplog.set_level(logging.DEBUG)
+        logger = get_logger("test")
+
+        logger.debug("lock_acquired", worker_id="worker-1")
+        logger.info("auth_response_recorded", worker_id="worker-1")
+
+        lines = [json.loads(record.getMessage()) for record in caplog.records]
+        assert len(lines) == 1
+        assert lines[0]["event"] == "auth_response_recorded"
+        assert lines[0]["level"] == "info"
+
+    def test_debug_level_keeps_debug_events(self, reset_structlog, caplog):
+        """Test that debug events are emitted when the level is DEBUG."""
+        configure_logging(log_level="DEBUG")
+        caplog.set_level(logging.DEBUG)
+        logger = get_logger("test")
+
+        logger.debug("lock_acquired", worker_id="worker-1")
+
+        assert json.loads(caplog.records[0].getMessage())["event"] == "lock_acquired"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_uuid_values_render_as_strings(self, reset_structlog, caplog, monkeypatch, use_orjson):
+        """Test that UUIDs are rendered in canonical form with and without orjson."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(logging_config, "orjson", None)
+        configure_logging(log_level="INFO")
+        caplog.set_level(logging.INFO)
+        logger = get_logger("test")
+        auth_request_id = uuid.uuid4()
+
+        logger.info("auth_response_recorded", auth_request_id=auth_request_id)
+
+        line = json.loads(caplog.records[0].getMessage())
+        assert line["auth_request_id"] == str(auth_request_id)
+
+    def test_bound_context_is_added_to_lines(self, reset_structlog, caplog):
+        """Test that context bound by process_auth_request reaches nested loggers."""
+        configure_logging(log_level="INFO")
+        caplog.set_level(logging.INFO)
+        logger = get_logger("test")
+
+        with structlog.contextvars.bound_contextvars(auth_request_id="abc", receive_count=2):
+            logger.info("auth_request_processed")
+        logger.info("worker_stopping")
+
+        inside, outside = (json.loads(record.getMessage()) for record in caplog.records)
+        assert inside["auth_request_id"] == "abc"
+        assert inside["receive_count"] == 2
+        assert "auth_request_id" not in outside
@@ -1,22 +1,21 @@
 """Unit tests for Payment Token Service client."""
 
-import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, patch
+import asyncio
+import dataclasses
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
-# Add shared proto directory to Python path
-_shared_proto_path = (
-    Path(__file__).parent.parent.parent.parent.parent.parent / "shared" / "python"
-)
-if str(_shared_proto_path) not in sys.path:
-    sys.path.insert(0, str(_shared_proto_path))
-
 from payments_proto.payments.v1 import common_pb2, payment_token_pb2
 
-from auth_processor_worker.clients.payment_token_client import PaymentTokenServiceClient
+from auth_processor_worker.clients import payment_token_client
+from auth_processor_worker.clients.payment_token_client import (
+    PaymentTokenServiceClient,
+    close_shared_http_client,
+    get_shared_client,
+    get_shared_http_client,
+)
 from auth_processor_worker.models.exceptions import (
     Forbidden,
     ProcessorTimeout,
@@ -71,6 +70,7 @@ class TestPaymentTokenServiceClient:
         # Mock HTTP response
         mock_response = AsyncMock(spec=httpx.Response)
         mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/x-protobuf"}
         mock_response.content = response_proto.SerializeToString()
         mock_response.raise_for_status = AsyncMock()
 
@@ -95,6 +95,7 @@ class TestPaymentTokenServiceClient:
 
             assert call_args[0][0] == "http://localhost:8000/internal/v1/decrypt"
             assert call_args[1]["headers"]["Content-Type"] == "application/x-protobuf"
+            assert call_args[1]["headers"]["Accept"] == "application/x-protobuf"
             assert call_args[1]["headers"]["X-Service-Auth"] == "test-auth-token"
             assert "X-Request-ID" in call_args[1]["headers"]
 
@@ -179,6 +180,22 @@ class TestPaymentTokenServiceClient:
                     requesting_service="auth-processor-worker",
                 )
 
+    @pytest.mark.asyncio
+    async def test_decrypt_unexpected_content_type(self, client):
+        """Test that a non-protobuf 200 body fails before parsing."""
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "text/html; charset=utf-8"}
+        mock_response.content = b"<html>gateway</html>"
+
+        with patch.object(client.http_client, "post", return_value=mock_response):
+            with pytest.raises(ProcessorTimeout, match="unexpected content type"):
+                await client.decrypt(
+                    payment_token="pt_test123",
+                    restaurant_id="rest_abc",
+                    requesting_service="auth-processor-worker",
+                )
+
     @pytest.mark.asyncio
     async def test_decrypt_timeout(self, client):
         """Test request timeout."""
@@ -220,6 +237,7 @@ class TestPaymentTokenServiceClient:
 
         mock_response = AsyncMock(spec=httpx.Response)
         mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/x-protobuf"}
         mock_response.content = payment_token_pb2.DecryptPaymentTokenResponse(
             payment_data=payment_token_pb2.PaymentData(
                 card_number="4111111111111111",
@@ -259,6 +277,7 @@ class TestPaymentTokenServiceClient:
         ) as client:
             mock_response = AsyncMock(spec=httpx.Response)
             mock_response.status_code = 200
+            mock_response.headers = {"content-type": "application/x-protobuf"}
             mock_response.content = response_proto.SerializeToString()
             mock_response.raise_for_status = AsyncMock()
 
@@ -281,6 +300,7 @@ class TestPaymentTokenServiceClient:
 
         mock_response = AsyncMock(spec=httpx.Response)
         mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/x-protobuf"}
         mock_response.content = response_proto.SerializeToString()
         mock_response.raise_for_status = AsyncMock()
 
@@ -304,9 +324,390 @@ class TestPaymentTokenServiceClient:
         assert len(correlation_ids) == 3
         assert len(set(correlation_ids)) == 3
 
+    @pytest.mark.asyncio
+    async def test_decrypt_reuses_serialized_request_body(self, client, mock_payment_data):
+        """Test that a pre-serialized request body is sent as-is."""
+        request_body = client.serialize_decrypt_request(
+            payment_token="pt_test123",
+            restaurant_id="rest_abc",
+            requesting_service="auth-processor-worker",
+        )
+
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/x-protobuf"}
+        mock_response.content = payment_token_pb2.DecryptPaymentTokenResponse(
+            payment_data=mock_payment_data,
+        ).SerializeToString()
+
+        with patch.object(client.http_client, "post", return_value=mock_response):
+            await client.decrypt(
+                payment_token="pt_test123",
+                restaurant_id="rest_abc",
+                requesting_service="auth-processor-worker",
+                request_body=request_body,
+            )
+
+            sent = client.http_client.post.call_args[1]["content"]
+            assert sent is request_body
+
+        request_proto = payment_token_pb2.DecryptPaymentTokenRequest()
+        request_proto.ParseFromString(request_body)
+        assert request_proto.payment_token == "pt_test123"
+        assert request_proto.restaurant_id == "rest_abc"
+
+    @pytest.mark.asyncio
+    async def test_decrypt_retries_transient_errors(self, mock_payment_data):
+        """Test that retryable failures are retried with backoff until success."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            max_retries=2,
+            base_delay_seconds=0.1,
+            max_delay_seconds=1.0,
+        )
+
+        error_response = MagicMock(spec=httpx.Response)
+        error_response.status_code = 503
+        ok_response = MagicMock(spec=httpx.Response)
+        ok_response.status_code = 200
+        ok_response.headers = {"content-type": "application/x-protobuf"}
+        ok_response.content = payment_token_pb2.DecryptPaymentTokenResponse(
+            payment_data=mock_payment_data,
+        ).SerializeToString()
+
+        with patch.object(
+            client.http_client, "post", side_effect=[error_response, error_response, ok_response]
+        ), patch(
+            "auth_processor_worker.clients.payment_token_client.asyncio.sleep",
+            new_callable=AsyncMock,
+        ) as mock_sleep:
+            result = await client.decrypt(
+                payment_token="pt_test123",
+                restaurant_id="rest_abc",
+                requesting_service="auth-processor-worker",
+            )
+
+            assert result.card_number == "4111111111111111"
+            assert client.http_client.post.call_count == 3
+            # Same serialized body on every attempt
+            bodies = {call[1]["content"] for call in client.http_client.post.call_args_list}
+            assert len(bodies) == 1
+
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 2
+        assert 0.1 <= delays[0] <= 0.15
+        assert 0.2 <= delays[1] <= 0.3
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_decrypt_raises_after_retries_exhausted(self):
+        """Test that ProcessorTimeout is raised once all retries fail."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            max_retries=1,
+        )
+
+        with patch.object(
+            client.http_client, "post", side_effect=httpx.TimeoutException("Timeout")
+        ), patch(
+            "auth_processor_worker.clients.payment_token_client.asyncio.sleep",
+            new_callable=AsyncMock,
+        ):
+            with pytest.raises(ProcessorTimeout):
+                await client.decrypt(
+                    payment_token="pt_test123",
+                    restaurant_id="rest_abc",
+                    requesting_service="auth-processor-worker",
+                )
+
+            assert client.http_client.post.call_count == 2
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_decrypt_does_not_retry_terminal_errors(self):
+        """Test that terminal errors are raised without retrying."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            max_retries=3,
+        )
+
+        not_found = MagicMock(spec=httpx.Response)
+        not_found.status_code = 404
+
+        with patch.object(client.http_client, "post", return_value=not_found), patch(
+            "auth_processor_worker.clients.payment_token_client.asyncio.sleep",
+            new_callable=AsyncMock,
+        ) as mock_sleep:
+            with pytest.raises(TokenNotFound):
+                await client.decrypt(
+                    payment_token="pt_test123",
+                    restaurant_id="rest_abc",
+                    requesting_service="auth-processor-worker",
+                )
+
+            assert client.http_client.post.call_count == 1
+            mock_sleep.assert_not_called()
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_decrypt_batch_returns_results_and_errors_in_order(
+        self, client, mock_payment_data
+    ):
+        """Test that a batch decrypt keeps item order and isolates failures."""
+        ok_response = MagicMock(spec=httpx.Response)
+        ok_response.status_code = 200
+        ok_response.headers = {"content-type": "application/x-protobuf"}
+        ok_response.content = payment_token_pb2.DecryptPaymentTokenResponse(
+            payment_data=mock_payment_data,
+        ).SerializeToString()
+        not_found = MagicMock(spec=httpx.Response)
+        not_found.status_code = 404
+
+        def respond(url, headers, content):
+            request = payment_token_pb2.DecryptPaymentTokenRequest()
+            request.ParseFromString(content)
+            return not_found if request.payment_token == "pt_missing" else ok_response
+
+        with patch.object(client.http_client, "post", side_effect=respond):
+            results = await client.decrypt_batch(
+                [("pt_one", "rest_abc"), ("pt_missing", "rest_abc"), ("pt_two", "rest_abc")],
+                requesting_service="auth-processor-worker",
+            )
+
+        assert len(results) == 3
+        assert results[0].card_number == "4111111111111111"
+        assert isinstance(results[1], TokenNotFound)
+        assert results[2].card_number == "4111111111111111"
+
     @pytest.mark.asyncio
     async def test_close(self, client):
         """Test client close method."""
         with patch.object(client.http_client, "aclose", new_callable=AsyncMock) as mock_close:
             await client.close()
             mock_close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_does_not_close_injected_http_client(self):
+        """Test that an injected HTTP client is left open for its owner."""
+        http_client = AsyncMock(spec=httpx.AsyncClient)
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            http_client=http_client,
+        )
+
+        await client.close()
+
+        assert client.http_client is http_client
+        http_client.aclose.assert_not_called()
+
+
+class TestWarmup:
+    """Test suite for connection pool warmup."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_requests_health(self, client):
+        """Test that warmup opens a connection via the health endpoint."""
+        response = MagicMock(spec=httpx.Response)
+        response.status_code = 200
+
+        with patch.object(client.http_client, "get", return_value=response) as get:
+            await client.warmup()
+
+        get.assert_called_once_with("http://localhost:8000/health")
+
+    @pytest.mark.asyncio
+    async def test_warmup_ignores_connection_errors(self, client):
+        """Test that an unreachable service does not fail worker startup."""
+        with patch.object(
+            client.http_client, "get", side_effect=httpx.ConnectError("Connection refused")
+        ):
+            await client.warmup()
+
+
+class TestSharedHttpClient:
+    """Test suite for the shared Payment Token Service HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_shared_http_client_is_reused(self):
+        """Test that every caller gets the same pooled client until it is closed."""
+        try:
+            first = get_shared_http_client()
+            assert get_shared_http_client() is first
+        finally:
+            await close_shared_http_client()
+
+        assert payment_token_client._shared_http_client is None
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_shared_http_client_uses_uds_transport(self):
+        """Test that uds_path routes the shared client over a Unix domain socket."""
+        current = payment_token_client.settings
+        uds_settings = dataclasses.replace(
+            current,
+            payment_token_service=dataclasses.replace(
+                current.payment_token_service, uds_path="/tmp/payment-token.sock"
+            ),
+        )
+
+        with patch.object(payment_token_client, "settings", uds_settings):
+            try:
+                http_client = get_shared_http_client()
+                transport = http_client._transport
+                assert isinstance(transport, httpx.AsyncHTTPTransport)
+                assert transport._pool._uds == "/tmp/payment-token.sock"
+            finally:
+                await close_shared_http_client()
+
+    @pytest.mark.asyncio
+    async def test_close_shared_http_client_without_client(self):
+        """Test that closing before first use is a no-op."""
+        await close_shared_http_client()
+
+        assert payment_token_client._shared_http_client is None
+
+
+class TestDecryptCache:
+    """Test suite for the opt-in in-process decrypt cache."""
+
+    @staticmethod
+    def _ok_response(payment_data):
+        response = MagicMock(spec=httpx.Response)
+        response.status_code = 200
+        response.headers = {"content-type": "application/x-protobuf"}
+        response.content = payment_token_pb2.DecryptPaymentTokenResponse(
+            payment_data=payment_data,
+        ).SerializeToString()
+        return response
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_default(self, client, mock_payment_data):
+        """Test that every decrypt hits the service when no TTL is configured."""
+        with patch.object(
+            client.http_client, "post", return_value=self._ok_response(mock_payment_data)
+        ):
+            for _ in range(2):
+                await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+
+            assert client.http_client.post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_service(self, mock_payment_data):
+        """Test that a cached decrypt is served without another request."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            cache_ttl_seconds=30,
+        )
+
+        with patch.object(
+            client.http_client, "post", return_value=self._ok_response(mock_payment_data)
+        ):
+            first = await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+            first.card_number = "mutated"
+            second = await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+            await client.decrypt("pt_test123", "rest_other", "auth-processor-worker")
+
+            # Second restaurant is a different cache key
+            assert client.http_client.post.call_count == 2
+
+        # Callers get copies, so mutating one result does not poison the cache
+        assert second.card_number == "4111111111111111"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_entries_expire(self, mock_payment_data):
+        """Test that entries older than the TTL are fetched again."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            cache_ttl_seconds=10,
+        )
+
+        now = [100.0]
+
+        with patch.object(
+            client.http_client, "post", return_value=self._ok_response(mock_payment_data)
+        ), patch(
+            "auth_processor_worker.clients.payment_token_client.time.monotonic",
+            side_effect=lambda: now[0],
+        ):
+            await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+            now[0] = 105.0
+            await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+            assert client.http_client.post.call_count == 1
+
+            now[0] = 111.0
+            await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+            assert client.http_client.post.call_count == 2
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, mock_payment_data):
+        """Test that concurrent decrypts of the same token send a single request."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            cache_ttl_seconds=30,
+        )
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return self._ok_response(mock_payment_data)
+
+        with patch.object(client.http_client, "post", side_effect=slow_post):
+            results = await asyncio.gather(
+                *(
+                    client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+                    for _ in range(5)
+                )
+            )
+
+            assert client.http_client.post.call_count == 1
+
+        assert all(result.card_number == "4111111111111111" for result in results)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, mock_payment_data):
+        """Test that a failed decrypt is retried on the next call."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="test-auth-token",
+            cache_ttl_seconds=30,
+        )
+        error_response = MagicMock(spec=httpx.Response)
+        error_response.status_code = 503
+
+        with patch.object(
+            client.http_client,
+            "post",
+            side_effect=[error_response, self._ok_response(mock_payment_data)],
+        ):
+            with pytest.raises(ProcessorTimeout):
+                await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+
+            result = await client.decrypt("pt_test123", "rest_abc", "auth-processor-worker")
+
+        assert result.card_number == "4111111111111111"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused(self):
+        """Test that the worker-wide client is built once and dropped on close."""
+        try:
+            shared = get_shared_client()
+            assert get_shared_client() is shared
+            assert shared.http_client is get_shared_http_client()
+        finally:
+            await close_shared_http_client()
+
+        assert payment_token_client._shared_client is None
@@ -1,5 +1,6 @@
 """Test Payment Token Service client configuration and initialization."""
 
+import httpx
 import pytest
 
 from auth_processor_worker.clients.payment_token_client import PaymentTokenServiceClient
@@ -36,6 +37,19 @@ class TestPaymentTokenServiceClientConfiguration:
         assert client.service_auth_token == "custom-token"
         assert client.timeout_seconds == 10.0
 
+    def test_client_uses_per_phase_timeouts(self):
+        """Test that connect/write/pool time out independently of the read timeout."""
+        client = PaymentTokenServiceClient(
+            base_url="http://localhost:8000",
+            service_auth_token="token",
+            timeout_seconds=5.0,
+            connect_timeout_seconds=1.0,
+            write_timeout_seconds=2.0,
+            pool_timeout_seconds=0.5,
+        )
+
+        assert client.http_client.timeout == httpx.Timeout(5.0, connect=1.0, write=2.0, pool=0.5)
+
     def test_client_base_url_normalization(self):
         """Test that base URL trailing slashes are handled correctly."""
         # With trailing slash
@@ -5,8 +5,22 @@ from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-
-from auth_processor_worker.handlers.processor import ProcessingResult, process_auth_request
+import structlog
+
+from payments_proto.payments.v1 import authorization_pb2, events_pb2, payment_token_pb2
+
+from auth_processor_worker.handlers.processor import (
+    VOID_BEFORE_PROCESSING_REASON,
+    ProcessingResult,
+    _create_attempt_started_event,
+    _create_authorized_event,
+    _create_denied_event,
+    _create_expired_event,
+    _decrypt_payment_token,
+    _record_timeout_failure,
+    process_auth_request,
+)
+from auth_processor_worker.infrastructure.locking import LockStartResult
 from auth_processor_worker.models.authorization import AuthStatus, AuthorizationResult, PaymentData
 from auth_processor_worker.models.exceptions import (
     Forbidden,
@@ -94,6 +108,29 @@ def denied_result():
     )
 
 
+def _bundle(auth_details, restaurant_config=None):
+    """Build a read_model.get_processing_bundle() row from the mock records."""
+    bundle = {
+        "auth_request_id": None,
+        "restaurant_id": None,
+        "payment_token": None,
+        "status": None,
+        "amount_cents": None,
+        "currency": None,
+        "metadata": None,
+        "created_at": None,
+        "last_event_sequence": None,
+        "config_version": None,
+        "processor_name": None,
+        "processor_config": None,
+        "is_active": None,
+    }
+    bundle.update(auth_details or {})
+    if restaurant_config:
+        bundle.update(restaurant_config)
+    return bundle
+
+
 @pytest.mark.asyncio
 class TestProcessAuthRequestHappyPath:
     """Tests for successful processing scenarios."""
@@ -110,24 +147,24 @@ class TestProcessAuthRequestHappyPath:
         """Test successful authorization flow."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt, \
              patch("auth_processor_worker.handlers.processor.get_processor") as mock_get_processor:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
             mock_transaction.record_auth_response_authorized = AsyncMock(return_value=2)
 
             mock_decrypt.return_value = payment_data
@@ -146,19 +183,16 @@ class TestProcessAuthRequestHappyPath:
             # Assert
             assert result == ProcessingResult.SUCCESS
 
-            # Verify lock was acquired and released
-            mock_locking.acquire_lock.assert_called_once()
-            mock_locking.release_lock.assert_called_once()
-
-            # Verify void check
-            mock_event_store.check_for_void_event.assert_called_once()
+            # Verify lock was acquired, and released with the result event
+            mock_locking.acquire_and_start.assert_called_once()
+            assert mock_transaction.record_auth_response_authorized.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
 
-            # Verify attempt started was recorded
-            mock_transaction.record_auth_attempt_started.assert_called_once()
+            # Verify auth details and config were fetched together
+            mock_read_model.get_processing_bundle.assert_called_once()
 
-            # Verify auth details and config were fetched
-            mock_read_model.get_auth_request_details.assert_called_once()
-            mock_read_model.get_restaurant_config.assert_called_once()
+            # Verify attempt started was recorded together with the lock
+            assert mock_locking.acquire_and_start.call_args.kwargs["started_event_data"]
 
             # Verify token was decrypted
             mock_decrypt.assert_called_once()
@@ -181,24 +215,24 @@ class TestProcessAuthRequestHappyPath:
         """Test successful denial flow (not a failure)."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt, \
              patch("auth_processor_worker.handlers.processor.get_processor") as mock_get_processor:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
             mock_transaction.record_auth_response_denied = AsyncMock(return_value=2)
 
             mock_decrypt.return_value = payment_data
@@ -220,8 +254,9 @@ class TestProcessAuthRequestHappyPath:
             # Verify denied response was recorded
             mock_transaction.record_auth_response_denied.assert_called_once()
 
-            # Verify lock was released
-            mock_locking.release_lock.assert_called_once()
+            # Verify lock was released with the result event
+            assert mock_transaction.record_auth_response_denied.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -231,7 +266,7 @@ class TestProcessAuthRequestLockScenarios:
     async def test_lock_not_acquired(self, auth_request_id, worker_id):
         """Test skipping when lock cannot be acquired."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking:
-            mock_locking.acquire_lock = AsyncMock(return_value=False)
+            mock_locking.acquire_and_start = AsyncMock(return_value=LockStartResult.LOCK_HELD)
 
             result = await process_auth_request(
                 auth_request_id=auth_request_id,
@@ -240,7 +275,31 @@ class TestProcessAuthRequestLockScenarios:
             )
 
             assert result == ProcessingResult.SKIPPED_LOCK_NOT_ACQUIRED
-            mock_locking.acquire_lock.assert_called_once()
+            mock_locking.acquire_and_start.assert_called_once()
+
+    async def test_log_context_bound_for_request_only(self, auth_request_id, worker_id):
+        """Test that request fields are bound to the log context and then reset."""
+        bound = {}
+
+        async def acquire_and_start(**kwargs):
+            bound.update(structlog.contextvars.get_contextvars())
+            return LockStartResult.LOCK_HELD
+
+        with patch("auth_processor_worker.handlers.processor.locking") as mock_locking:
+            mock_locking.acquire_and_start = acquire_and_start
+
+            await process_auth_request(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                receive_count=3,
+            )
+
+        assert bound == {
+            "auth_request_id": str(auth_request_id),
+            "worker_id": worker_id,
+            "receive_count": 3,
+        }
+        assert "auth_request_id" not in structlog.contextvars.get_contextvars()
 
 
 @pytest.mark.asyncio
@@ -251,19 +310,16 @@ class TestProcessAuthRequestVoidDetection:
         """Test void detection before processing."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
+             patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(return_value=LockStartResult.VOIDED)
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=True)
-            mock_transaction.record_auth_request_expired = AsyncMock(return_value=1)
-
             # Execute
             result = await process_auth_request(
                 auth_request_id=auth_request_id,
@@ -274,11 +330,18 @@ class TestProcessAuthRequestVoidDetection:
             # Assert
             assert result == ProcessingResult.SKIPPED_VOID_DETECTED
 
-            # Verify expired event was recorded
-            mock_transaction.record_auth_request_expired.assert_called_once()
+            # Verify the expired event was handed to the lock transaction
+            expired = events_pb2.AuthRequestExpired()
+            expired.ParseFromString(
+                mock_locking.acquire_and_start.call_args.kwargs["expired_event_data"]
+            )
+            assert expired.auth_request_id == str(auth_request_id)
+            assert expired.reason == VOID_BEFORE_PROCESSING_REASON
 
-            # Verify lock was released
-            mock_locking.release_lock.assert_called_once()
+            # Verify processing stopped with nothing else written or released
+            mock_read_model.get_processing_bundle.assert_not_called()
+            mock_transaction.record_auth_request_expired.assert_not_called()
+            mock_locking.release_lock.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -289,20 +352,21 @@ class TestProcessAuthRequestTerminalErrors:
         """Test terminal failure when auth request not found."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=None)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(None)
+            )
             mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(return_value=2)
 
             # Execute
@@ -315,7 +379,8 @@ class TestProcessAuthRequestTerminalErrors:
             # Assert
             assert result == ProcessingResult.TERMINAL_FAILURE
             mock_transaction.record_auth_attempt_failed_terminal.assert_called_once()
-            mock_locking.release_lock.assert_called_once()
+            assert mock_transaction.record_auth_attempt_failed_terminal.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
 
     async def test_restaurant_config_not_found(
         self,
@@ -326,21 +391,21 @@ class TestProcessAuthRequestTerminalErrors:
         """Test terminal failure when restaurant config not found."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=None)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, None)
+            )
             mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(return_value=2)
 
             # Execute
@@ -353,7 +418,47 @@ class TestProcessAuthRequestTerminalErrors:
             # Assert
             assert result == ProcessingResult.TERMINAL_FAILURE
             mock_transaction.record_auth_attempt_failed_terminal.assert_called_once()
-            mock_locking.release_lock.assert_called_once()
+            assert mock_transaction.record_auth_attempt_failed_terminal.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
+
+    async def test_not_found_redelivery_skips_processing(self, auth_request_id, worker_id):
+        """Test that a redelivered not-found request is not looked up or recorded again."""
+        with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
+             patch("auth_processor_worker.handlers.processor.database") as mock_database, \
+             patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
+             patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
+
+            # Setup mocks
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
+            mock_locking.release_lock = AsyncMock()
+
+            mock_conn = AsyncMock()
+            mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
+
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(None)
+            )
+            mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(return_value=2)
+
+            # Execute: first delivery, then a redelivery of the same request
+            first = await process_auth_request(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                receive_count=1,
+            )
+            second = await process_auth_request(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                receive_count=2,
+            )
+
+            # Assert
+            assert first == second == ProcessingResult.TERMINAL_FAILURE
+            mock_locking.acquire_and_start.assert_called_once()
+            mock_read_model.get_processing_bundle.assert_called_once()
+            mock_transaction.record_auth_attempt_failed_terminal.assert_called_once()
 
     @pytest.mark.parametrize("exception_class", [TokenNotFound, TokenExpired, Forbidden])
     async def test_token_service_terminal_errors(
@@ -367,22 +472,22 @@ class TestProcessAuthRequestTerminalErrors:
         """Test terminal errors from token service."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
             # Token service raises terminal error
             mock_decrypt.side_effect = exception_class("Terminal error")
@@ -398,7 +503,8 @@ class TestProcessAuthRequestTerminalErrors:
             # Assert
             assert result == ProcessingResult.TERMINAL_FAILURE
             mock_transaction.record_auth_attempt_failed_terminal.assert_called_once()
-            mock_locking.release_lock.assert_called_once()
+            assert mock_transaction.record_auth_attempt_failed_terminal.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -415,22 +521,22 @@ class TestProcessAuthRequestRetryableErrors:
         """Test retryable error from token service timeout."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
             # Token service times out (retryable)
             mock_decrypt.side_effect = ProcessorTimeout("Service unavailable")
@@ -458,22 +564,22 @@ class TestProcessAuthRequestRetryableErrors:
         """Test terminal failure when max retries exceeded on token service timeout."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
             # Token service times out
             mock_decrypt.side_effect = ProcessorTimeout("Service unavailable")
@@ -489,7 +595,8 @@ class TestProcessAuthRequestRetryableErrors:
             # Assert
             assert result == ProcessingResult.TERMINAL_FAILURE
             mock_transaction.record_auth_attempt_failed_terminal.assert_called_once()
-            mock_locking.release_lock.assert_called_once()
+            assert mock_transaction.record_auth_attempt_failed_terminal.call_args.kwargs["release_lock_worker_id"] == worker_id
+            mock_locking.release_lock.assert_not_called()
 
     async def test_processor_timeout_retryable(
         self,
@@ -502,23 +609,23 @@ class TestProcessAuthRequestRetryableErrors:
         """Test retryable error from processor timeout."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
              patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction, \
              patch("auth_processor_worker.handlers.processor._decrypt_payment_token") as mock_decrypt, \
              patch("auth_processor_worker.handlers.processor.get_processor") as mock_get_processor:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            mock_event_store.check_for_void_event = AsyncMock(return_value=False)
-            mock_transaction.record_auth_attempt_started = AsyncMock(return_value=1)
-            mock_read_model.get_auth_request_details = AsyncMock(return_value=auth_details)
-            mock_read_model.get_restaurant_config = AsyncMock(return_value=restaurant_config)
+            mock_read_model.get_processing_bundle = AsyncMock(
+                return_value=_bundle(auth_details, restaurant_config)
+            )
 
             mock_decrypt.return_value = payment_data
 
@@ -550,21 +657,26 @@ class TestProcessAuthRequestLockCleanup:
         """Test that lock is always released even on unexpected errors."""
         with patch("auth_processor_worker.handlers.processor.locking") as mock_locking, \
              patch("auth_processor_worker.handlers.processor.database") as mock_database, \
-             patch("auth_processor_worker.handlers.processor.event_store") as mock_event_store, \
+             patch("auth_processor_worker.handlers.processor.read_model") as mock_read_model, \
              patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
 
             # Setup mocks
-            mock_locking.acquire_lock = AsyncMock(return_value=True)
+            mock_locking.acquire_and_start = AsyncMock(
+                return_value=LockStartResult.ACQUIRED_STARTED
+            )
             mock_locking.release_lock = AsyncMock()
 
             mock_conn = AsyncMock()
             mock_database.get_connection.return_value.__aenter__.return_value = mock_conn
 
-            # Unexpected error during void check
-            mock_event_store.check_for_void_event = AsyncMock(
+            # Unexpected error while reading the processing bundle
+            mock_read_model.get_processing_bundle = AsyncMock(
                 side_effect=Exception("Unexpected database error")
             )
-            mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(return_value=1)
+            # ...and recording the failure (which would release the lock) fails too
+            mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(
+                side_effect=Exception("Database unavailable")
+            )
 
             # Execute
             result = await process_auth_request(
@@ -578,3 +690,144 @@ class TestProcessAuthRequestLockCleanup:
 
             # Verify lock was still released despite error
             mock_locking.release_lock.assert_called_once()
+
+
+@pytest.mark.asyncio
+class TestRecordTimeoutFailure:
+    """Tests for recording timeouts as retryable or terminal failures."""
+
+    async def test_retryable_before_max_retries(self, auth_request_id, worker_id):
+        """Test that a timeout below max_retries records a retryable failure."""
+        with patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
+            mock_transaction.record_auth_attempt_failed_retryable = AsyncMock(return_value=2)
+
+            outcome = await _record_timeout_failure(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                error=ProcessorTimeout("timed out"),
+                error_code="PROCESSOR_TIMEOUT",
+                receive_count=2,
+                max_retries=5,
+            )
+
+        assert outcome == ProcessingResult.RETRYABLE_FAILURE
+        kwargs = mock_transaction.record_auth_attempt_failed_retryable.call_args.kwargs
+        event = events_pb2.AuthAttemptFailed.FromString(kwargs["event_data"])
+        assert event.is_retryable is True
+        assert event.retry_count == 2
+        assert event.error_code == "PROCESSOR_TIMEOUT"
+        mock_transaction.record_auth_attempt_failed_terminal.assert_not_called()
+
+    async def test_terminal_at_max_retries(self, auth_request_id, worker_id):
+        """Test that the last allowed attempt records a terminal failure."""
+        with patch("auth_processor_worker.handlers.processor.transaction") as mock_transaction:
+            mock_transaction.record_auth_attempt_failed_terminal = AsyncMock(return_value=2)
+
+            outcome = await _record_timeout_failure(
+                auth_request_id=auth_request_id,
+                worker_id=worker_id,
+                error=ProcessorTimeout("timed out"),
+                error_code="PROCESSOR_TIMEOUT",
+                receive_count=5,
+                max_retries=5,
+            )
+
+        assert outcome == ProcessingResult.TERMINAL_FAILURE
+        kwargs = mock_transaction.record_auth_attempt_failed_terminal.call_args.kwargs
+        event = events_pb2.AuthAttemptFailed.FromString(kwargs["event_data"])
+        assert event.is_retryable is False
+        assert event.error_code == "MAX_RETRIES_EXCEEDED"
+        assert kwargs["release_lock_worker_id"] == worker_id
+        mock_transaction.record_auth_attempt_failed_retryable.assert_not_called()
+
+
+class TestDecryptPaymentToken:
+    """Test suite for the Payment Token Service call in the processor."""
+
+    @pytest.mark.asyncio
+    async def test_uses_shared_client_without_closing_it(self):
+        """Test that every auth request reuses the worker-wide client."""
+        shared_client = MagicMock()
+        shared_client.decrypt = AsyncMock(
+            return_value=payment_token_pb2.PaymentData(
+                card_number="4242424242424242",
+                exp_month="12",
+                exp_year="2030",
+                cvv="123",
+                cardholder_name="Test User",
+            )
+        )
+        shared_client.close = AsyncMock()
+
+        with patch(
+            "auth_processor_worker.handlers.processor.get_shared_client",
+            return_value=shared_client,
+        ) as mock_get_shared_client:
+            for _ in range(2):
+                result = await _decrypt_payment_token(
+                    payment_token="pt_test123",
+                    restaurant_id="00000000-0000-0000-0000-000000000001",
+                )
+                assert result.card_number == "4242424242424242"
+
+        assert mock_get_shared_client.call_count == 2
+        assert shared_client.decrypt.await_count == 2
+        # Pooled connections are closed on worker shutdown, not per request
+        shared_client.close.assert_not_awaited()
+
+
+class TestLifecycleEvents:
+    """Test suite for the AuthAttemptStarted and AuthRequestExpired builders."""
+
+    def test_attempt_started_event_round_trips(self, auth_request_id, worker_id):
+        """Test the started event's fields and that the config version is unset."""
+        event = _create_attempt_started_event(str(auth_request_id), worker_id, now=1700000000.5)
+
+        parsed = events_pb2.AuthAttemptStarted.FromString(event.SerializeToString())
+
+        assert parsed.auth_request_id == str(auth_request_id)
+        assert parsed.worker_id == worker_id
+        assert parsed.started_at == 1700000000
+        assert parsed.restaurant_payment_config_version == ""
+
+    def test_expired_event_round_trips(self, auth_request_id, worker_id):
+        """Test the expired event carries the void reason."""
+        event = _create_expired_event(str(auth_request_id), worker_id, now=1700000000.5)
+
+        parsed = events_pb2.AuthRequestExpired.FromString(event.SerializeToString())
+
+        assert parsed.auth_request_id == str(auth_request_id)
+        assert parsed.expired_at == 1700000000
+        assert parsed.reason == VOID_BEFORE_PROCESSING_REASON
+
+
+class TestResponseEvents:
+    """Test suite for the AuthResponseReceived event builders."""
+
+    def test_authorized_event_round_trips(self, auth_request_id, worker_id, authorized_result):
+        """Test that the nested AuthorizationResult survives serialization."""
+        event = _create_authorized_event(
+            str(auth_request_id), worker_id, authorized_result, now=1700000000.5
+        )
+
+        parsed = events_pb2.AuthResponseReceived.FromString(event.SerializeToString())
+
+        assert parsed.auth_request_id == str(auth_request_id)
+        assert parsed.status == authorization_pb2.AUTH_STATUS_AUTHORIZED
+        assert parsed.result.processor_auth_id == "ch_test123"
+        assert parsed.result.authorized_amount_cents == 10000
+        assert parsed.result.authorized_at == int(authorized_result.authorized_at.timestamp())
+        assert parsed.received_at == 1700000000
+
+    def test_denied_event_round_trips(self, auth_request_id, worker_id, denied_result):
+        """Test that denial details are carried in the nested result."""
+        event = _create_denied_event(
+            str(auth_request_id), worker_id, denied_result, now=1700000000.5
+        )
+
+        parsed = events_pb2.AuthResponseReceived.FromString(event.SerializeToString())
+
+        assert parsed.status == authorization_pb2.AUTH_STATUS_DENIED
+        assert parsed.result.processor_name == "stripe"
+        assert parsed.result.denial_code == "insufficient_funds"
+        assert parsed.result.denial_reason == "Insufficient funds"
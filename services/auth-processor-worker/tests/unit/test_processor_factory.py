@@ -140,6 +140,25 @@ class TestGetProcessorConvenienceFunction:
 
         assert isinstance(processor, StripeProcessor)
 
+    def test_get_processor_reuses_instance_for_same_config(self):
+        """Test that equal configs (in any key order) share one processor."""
+        first = get_processor(
+            "stripe", processor_config={"api_key": "sk_test_shared", "timeout_seconds": 10}
+        )
+        second = get_processor(
+            "STRIPE", processor_config={"timeout_seconds": 10, "api_key": "sk_test_shared"}
+        )
+
+        assert first is second
+
+    def test_get_processor_changed_config_gets_new_instance(self):
+        """Test that a different config is not served from the cache."""
+        old = get_processor("stripe", processor_config={"api_key": "sk_test_old"})
+        new = get_processor("stripe", processor_config={"api_key": "sk_test_new"})
+
+        assert old is not new
+        assert new.api_key == "sk_test_new"
+
 
 class TestProcessorFactoryExtensibility:
     """Tests for future processor extensibility."""
@@ -0,0 +1,239 @@
+"""Unit tests for read model update functions."""
+
+import re
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from auth_processor_worker.infrastructure import event_store, read_model
+
+
+# (update function, extra keyword arguments) for every auth_request_state writer
+READ_MODEL_UPDATES = [
+    (read_model.update_to_processing, {}),
+    (
+        read_model.update_to_authorized,
+        {
+            "processor_auth_id": "pi_123",
+            "processor_name": "mock",
+            "authorized_amount_cents": 1000,
+            "authorization_code": "123456",
+        },
+    ),
+    (
+        read_model.update_to_denied,
+        {
+            "processor_name": "mock",
+            "denial_code": "card_declined",
+            "denial_reason": "Your card was declined",
+        },
+    ),
+    (read_model.update_to_failed, {}),
+    (read_model.update_retry_attempt, {}),
+    (read_model.update_to_expired, {}),
+]
+
+TERMINAL_UPDATES = [
+    (fn, kwargs)
+    for fn, kwargs in READ_MODEL_UPDATES
+    if fn not in (read_model.update_to_processing, read_model.update_retry_attempt)
+]
+
+
+def _statement(conn):
+    """Return (sql, params) of the single statement an update function issued."""
+    calls = conn.execute.await_args_list + conn.fetchrow.await_args_list
+    assert len(calls) == 1
+    sql, *params = calls[0].args
+    return sql, params
+
+
+def _event(auth_request_id):
+    """Build an event for an update function to append."""
+    return event_store.NewEvent(
+        aggregate_id=auth_request_id,
+        aggregate_type="auth_request",
+        event_type="AuthAttemptStarted",
+        event_data=b"\x0a",
+    )
+
+
+def _connection(sequence_number=2, projected=True):
+    """Mock connection whose statement appended an event and (maybe) projected it."""
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {"sequence_number": sequence_number, "projected": projected}
+    return conn
+
+
+class TestUpdatedAtMaintenance:
+    """updated_at is maintained by the application, not a database trigger."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "update_fn,kwargs",
+        READ_MODEL_UPDATES,
+        ids=[fn.__name__ for fn, _ in READ_MODEL_UPDATES],
+    )
+    async def test_update_sets_updated_at(self, update_fn, kwargs):
+        """Every read model UPDATE stamps updated_at from the database clock."""
+        conn = _connection()
+        auth_request_id = uuid.uuid4()
+
+        await update_fn(
+            conn=conn,
+            auth_request_id=auth_request_id,
+            event=_event(auth_request_id),
+            **kwargs,
+        )
+
+        sql, params = _statement(conn)
+        assert "updated_at = NOW() AT TIME ZONE 'UTC'" in sql
+        assert not any(isinstance(p, datetime) for p in params)
+
+
+class TestAppendAndProject:
+    """The event INSERT and the read model UPDATE are one round trip."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "update_fn,kwargs",
+        READ_MODEL_UPDATES,
+        ids=[fn.__name__ for fn, _ in READ_MODEL_UPDATES],
+    )
+    async def test_update_appends_event_in_same_statement(self, update_fn, kwargs):
+        """The UPDATE reads the sequence number the INSERT in the same statement assigned."""
+        conn = _connection(sequence_number=5)
+        auth_request_id = uuid.uuid4()
+        event = _event(auth_request_id)
+
+        sequence_number = await update_fn(
+            conn=conn,
+            auth_request_id=auth_request_id,
+            event=event,
+            **kwargs,
+        )
+
+        assert sequence_number == 5
+        sql, params = _statement(conn)
+        assert "INSERT INTO payment_events" in sql
+        assert "UPDATE auth_request_state" in sql
+        assert params[0] == auth_request_id
+        assert tuple(params[-6:]) == event.args()
+
+        # The event's placeholders follow the projection's own parameters
+        placeholders = {int(n) for n in re.findall(r"\$(\d+)", sql)}
+        assert placeholders == set(range(1, len(params) + 1))
+
+
+class TestStaleEventGuard:
+    """Read model UPDATEs never move the projection backwards."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "update_fn,kwargs",
+        READ_MODEL_UPDATES,
+        ids=[fn.__name__ for fn, _ in READ_MODEL_UPDATES],
+    )
+    async def test_update_guards_on_last_event_sequence(self, update_fn, kwargs):
+        """Every UPDATE only applies to rows behind the appended event's sequence number."""
+        conn = _connection()
+        auth_request_id = uuid.uuid4()
+
+        await update_fn(
+            conn=conn,
+            auth_request_id=auth_request_id,
+            event=_event(auth_request_id),
+            **kwargs,
+        )
+
+        sql, _ = _statement(conn)
+        assert "last_event_sequence < event.sequence_number" in sql
+        assert "last_event_sequence = event.sequence_number" in sql
+
+    @pytest.mark.asyncio
+    async def test_stale_event_is_skipped(self):
+        """A stale event updates no rows and is logged as skipped."""
+        conn = _connection(projected=False)
+        auth_request_id = uuid.uuid4()
+
+        with patch.object(read_model, "logger") as mock_logger:
+            await read_model.update_to_processing(
+                conn=conn,
+                auth_request_id=auth_request_id,
+                event=_event(auth_request_id),
+            )
+
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args[0][0] == "read_model_update_skipped"
+        mock_logger.info.assert_not_called()
+
+
+class TestProcessingBundle:
+    """The pre-processing reads are served by a single query."""
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip(self):
+        """Auth details and restaurant config come from one fetchrow."""
+        conn = AsyncMock()
+        auth_request_id = uuid.uuid4()
+
+        bundle = await read_model.get_processing_bundle(
+            conn=conn,
+            auth_request_id=auth_request_id,
+        )
+
+        conn.fetchrow.assert_awaited_once()
+        conn.fetch.assert_not_called()
+        conn.fetchval.assert_not_called()
+        query, param = conn.fetchrow.call_args[0]
+        assert param == auth_request_id
+        assert "auth_request_state" in query
+        assert "restaurant_payment_configs" in query
+        assert bundle is conn.fetchrow.return_value
+
+
+class TestTerminalUpdates:
+    """Terminal updates notify and can release the lock in the same statement."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "update_fn,kwargs",
+        TERMINAL_UPDATES,
+        ids=[fn.__name__ for fn, _ in TERMINAL_UPDATES],
+    )
+    async def test_notifies_and_releases_lock(self, update_fn, kwargs):
+        """The INSERT, UPDATE, lock delete and NOTIFY are one round trip."""
+        conn = _connection()
+        auth_request_id = uuid.uuid4()
+
+        await update_fn(
+            conn=conn,
+            auth_request_id=auth_request_id,
+            event=_event(auth_request_id),
+            release_lock_worker_id="worker-1",
+            **kwargs,
+        )
+
+        sql, params = _statement(conn)
+        assert "DELETE FROM auth_processing_locks" in sql
+        assert "pg_notify" in sql
+        assert params[0] == auth_request_id
+        assert params[-8:-6] == ["worker-1", read_model.AUTH_COMPLETED_CHANNEL]
+
+    @pytest.mark.asyncio
+    async def test_stale_terminal_event_is_skipped(self):
+        """A stale terminal event updates no rows and is logged as skipped."""
+        conn = _connection(projected=False)
+        auth_request_id = uuid.uuid4()
+
+        with patch.object(read_model, "logger") as mock_logger:
+            await read_model.update_to_failed(
+                conn=conn,
+                auth_request_id=auth_request_id,
+                event=_event(auth_request_id),
+            )
+
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args[0][0] == "read_model_update_skipped"
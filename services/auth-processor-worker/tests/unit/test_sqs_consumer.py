@@ -26,7 +26,7 @@ def mock_sqs_client():
     """Mock SQS client for testing."""
     client = AsyncMock()
     client.receive_message = AsyncMock()
-    client.delete_message = AsyncMock()
+    client.delete_message_batch = AsyncMock(return_value={"Successful": [], "Failed": []})
     return client
 
 
@@ -107,11 +107,16 @@ async def test_process_messages_with_valid_message(mock_sqs_client):
     assert received_data["receive_count"] == 1
 
     # Verify message was deleted
-    mock_sqs_client.delete_message.assert_called_once_with(
+    mock_sqs_client.delete_message_batch.assert_called_once_with(
         QueueUrl="https://test-queue",
-        ReceiptHandle="receipt-handle-123",
+        Entries=[{"Id": "msg-123", "ReceiptHandle": "receipt-handle-123"}],
     )
 
+    # Only the system attributes the consumer reads are requested
+    receive_kwargs = mock_sqs_client.receive_message.call_args.kwargs
+    assert receive_kwargs["AttributeNames"] == ["ApproximateReceiveCount", "MessageGroupId"]
+    assert "MessageAttributeNames" not in receive_kwargs
+
 
 @pytest.mark.asyncio
 async def test_process_messages_with_no_messages(mock_sqs_client):
@@ -127,7 +132,7 @@ async def test_process_messages_with_no_messages(mock_sqs_client):
     await consumer.process_messages()
 
     # Verify delete was not called
-    mock_sqs_client.delete_message.assert_not_called()
+    mock_sqs_client.delete_message_batch.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -153,7 +158,7 @@ async def test_process_messages_with_missing_auth_request_id(mock_sqs_client):
     await consumer.process_messages()
 
     # Message should still be deleted (malformed message)
-    mock_sqs_client.delete_message.assert_called_once()
+    mock_sqs_client.delete_message_batch.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -179,7 +184,7 @@ async def test_process_messages_with_json_decode_error(mock_sqs_client):
     await consumer.process_messages()
 
     # Malformed message should be deleted
-    mock_sqs_client.delete_message.assert_called_once()
+    mock_sqs_client.delete_message_batch.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -212,7 +217,7 @@ async def test_process_messages_with_handler_exception(mock_sqs_client):
     await consumer.process_messages()
 
     # Message should NOT be deleted on handler error
-    mock_sqs_client.delete_message.assert_not_called()
+    mock_sqs_client.delete_message_batch.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -232,11 +237,11 @@ async def test_delete_message_success(mock_sqs_client):
     consumer = SQSConsumer(queue_url="https://test-queue")
     consumer._sqs_client = mock_sqs_client
 
-    await consumer._delete_message("receipt-handle-123", "msg-123")
+    await consumer._delete_messages([{"MessageId": "msg-123", "ReceiptHandle": "receipt-handle-123"}])
 
-    mock_sqs_client.delete_message.assert_called_once_with(
+    mock_sqs_client.delete_message_batch.assert_called_once_with(
         QueueUrl="https://test-queue",
-        ReceiptHandle="receipt-handle-123",
+        Entries=[{"Id": "msg-123", "ReceiptHandle": "receipt-handle-123"}],
     )
 
 
@@ -247,10 +252,32 @@ async def test_delete_message_with_missing_receipt_handle(mock_sqs_client):
     consumer._sqs_client = mock_sqs_client
 
     # Should not raise, but should log error
-    await consumer._delete_message(None, "msg-123")
+    await consumer._delete_messages([{"MessageId": "msg-123", "ReceiptHandle": None}])
 
     # Delete should not be called
-    mock_sqs_client.delete_message.assert_not_called()
+    mock_sqs_client.delete_message_batch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_messages_logs_failed_entries(mock_sqs_client):
+    """Test that entries SQS fails to delete are logged per message."""
+    consumer = SQSConsumer(queue_url="https://test-queue")
+    consumer._sqs_client = mock_sqs_client
+    mock_sqs_client.delete_message_batch.return_value = {
+        "Successful": [{"Id": "msg-1"}],
+        "Failed": [{"Id": "msg-2", "Code": "ReceiptHandleIsInvalid", "SenderFault": True}],
+    }
+
+    with patch.object(consumer, "logger") as mock_logger:
+        await consumer._delete_messages([
+            {"MessageId": "msg-1", "ReceiptHandle": "receipt-1"},
+            {"MessageId": "msg-2", "ReceiptHandle": "receipt-2"},
+        ])
+
+    mock_logger.error.assert_called_once()
+    assert mock_logger.error.call_args.args == ("message_delete_failed",)
+    assert mock_logger.error.call_args.kwargs["message_id"] == "msg-2"
+    mock_logger.info.assert_called_once_with("messages_deleted", count=1)
 
 
 @pytest.mark.asyncio
@@ -310,8 +337,134 @@ async def test_process_messages_with_multiple_messages(mock_sqs_client):
     assert "auth-2" in handler_calls
     assert "auth-3" in handler_calls
 
-    # All messages should be deleted
-    assert mock_sqs_client.delete_message.call_count == 3
+    # All messages should be deleted in one call
+    mock_sqs_client.delete_message_batch.assert_called_once()
+    assert len(mock_sqs_client.delete_message_batch.call_args.kwargs["Entries"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_process_messages_groups_run_concurrently_in_order(mock_sqs_client):
+    """Test that message groups overlap while each group keeps FIFO order."""
+    handler_calls = []
+    group_b_started = asyncio.Event()
+
+    async def test_handler(data):
+        auth_request_id = data["auth_request_id"]
+        if auth_request_id == "auth-a1":
+            # Only completes if group B runs while group A is in flight
+            await asyncio.wait_for(group_b_started.wait(), timeout=1)
+        if auth_request_id == "auth-b1":
+            group_b_started.set()
+        handler_calls.append(auth_request_id)
+
+    consumer = SQSConsumer(
+        queue_url="https://test-queue",
+        batch_size=3,
+        message_handler=test_handler,
+    )
+
+    def message(n, auth_request_id, group_id):
+        return {
+            "MessageId": f"msg-{n}",
+            "ReceiptHandle": f"receipt-{n}",
+            "Body": create_protobuf_message(auth_request_id, group_id),
+            "Attributes": {"ApproximateReceiveCount": "1", "MessageGroupId": group_id},
+        }
+
+    mock_sqs_client.receive_message.return_value = {
+        "Messages": [
+            message(1, "auth-a1", "rest-a"),
+            message(2, "auth-b1", "rest-b"),
+            message(3, "auth-a2", "rest-a"),
+        ]
+    }
+
+    consumer._sqs_client = mock_sqs_client
+
+    await consumer.process_messages()
+
+    assert handler_calls == ["auth-b1", "auth-a1", "auth-a2"]
+    assert len(mock_sqs_client.delete_message_batch.call_args.kwargs["Entries"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_process_messages_failed_message_halts_its_group(mock_sqs_client):
+    """Test that a failure leaves the rest of its group for retry, in order."""
+    handler_calls = []
+
+    async def test_handler(data):
+        handler_calls.append(data["auth_request_id"])
+        if data["auth_request_id"] == "auth-a1":
+            raise Exception("Retryable failure - message will be retried")
+
+    consumer = SQSConsumer(
+        queue_url="https://test-queue",
+        message_handler=test_handler,
+    )
+
+    def message(n, auth_request_id, group_id):
+        return {
+            "MessageId": f"msg-{n}",
+            "ReceiptHandle": f"receipt-{n}",
+            "Body": create_protobuf_message(auth_request_id, group_id),
+            "Attributes": {"ApproximateReceiveCount": "1", "MessageGroupId": group_id},
+        }
+
+    mock_sqs_client.receive_message.return_value = {
+        "Messages": [
+            message(1, "auth-a1", "rest-a"),
+            message(2, "auth-b1", "rest-b"),
+            message(3, "auth-a2", "rest-a"),
+        ]
+    }
+
+    consumer._sqs_client = mock_sqs_client
+
+    await consumer.process_messages()
+
+    # auth-a2 is not processed ahead of the failed auth-a1; other groups go on
+    assert sorted(handler_calls) == ["auth-a1", "auth-b1"]
+    mock_sqs_client.delete_message_batch.assert_called_once_with(
+        QueueUrl="https://test-queue",
+        Entries=[{"Id": "msg-2", "ReceiptHandle": "receipt-2"}],
+    )
+    assert mock_sqs_client.receive_message.call_args.kwargs["MaxNumberOfMessages"] == 10
+
+
+@pytest.mark.asyncio
+async def test_slow_batch_keeps_messages_invisible(mock_sqs_client):
+    """Test that visibility is extended while a batch is still being processed."""
+
+    async def slow_handler(data):
+        await asyncio.sleep(0.5)
+
+    consumer = SQSConsumer(
+        queue_url="https://test-queue",
+        visibility_timeout=1,
+        message_handler=slow_handler,
+    )
+    mock_sqs_client.change_message_visibility_batch = AsyncMock(
+        return_value={"Successful": [], "Failed": []}
+    )
+    mock_sqs_client.receive_message.return_value = {
+        "Messages": [
+            {
+                "MessageId": "msg-1",
+                "ReceiptHandle": "receipt-1",
+                "Body": create_protobuf_message("auth-1", "rest-1"),
+                "Attributes": {"ApproximateReceiveCount": "1", "MessageGroupId": "rest-1"},
+            }
+        ]
+    }
+    consumer._sqs_client = mock_sqs_client
+
+    await consumer.process_messages()
+
+    mock_sqs_client.change_message_visibility_batch.assert_called_once_with(
+        QueueUrl="https://test-queue",
+        Entries=[{"Id": "msg-1", "ReceiptHandle": "receipt-1", "VisibilityTimeout": 1}],
+    )
+    mock_sqs_client.delete_message_batch.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -334,3 +487,60 @@ async def test_start_and_stop_gracefully():
 
     # Should no longer be running
     assert consumer.running is False
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_batch_in_progress(mock_sqs_client):
+    """Test that stop() returns only after the current batch is handled and deleted."""
+    handler_started = asyncio.Event()
+    handled = []
+
+    async def slow_handler(data):
+        handler_started.set()
+        await asyncio.sleep(0.1)
+        handled.append(data["auth_request_id"])
+
+    mock_sqs_client.receive_message.return_value = {
+        "Messages": [
+            {
+                "MessageId": "msg-1",
+                "ReceiptHandle": "receipt-1",
+                "Body": create_protobuf_message("auth-1", "rest-1"),
+                "Attributes": {"ApproximateReceiveCount": "1", "MessageGroupId": "rest-1"},
+            }
+        ]
+    }
+    consumer = SQSConsumer(
+        queue_url="https://test-queue",
+        message_handler=slow_handler,
+        sqs_client=mock_sqs_client,
+    )
+    start = asyncio.create_task(consumer.start())
+    await handler_started.wait()
+
+    await consumer.stop()
+
+    assert handled == ["auth-1"]
+    mock_sqs_client.delete_message_batch.assert_called_once()
+    assert mock_sqs_client.receive_message.call_count == 1
+    await start
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_idle_long_poll(mock_sqs_client):
+    """Test that stop() does not wait out a long poll that has no messages yet."""
+    poll_started = asyncio.Event()
+
+    async def long_poll(**kwargs):
+        poll_started.set()
+        await asyncio.sleep(20)
+        return {"Messages": []}
+
+    mock_sqs_client.receive_message.side_effect = long_poll
+    consumer = SQSConsumer(queue_url="https://test-queue", sqs_client=mock_sqs_client)
+    start = asyncio.create_task(consumer.start())
+    await poll_started.wait()
+
+    await asyncio.wait_for(consumer.stop(), timeout=1)
+
+    await asyncio.wait_for(start, timeout=1)
@@ -358,6 +358,8 @@ class TestStripeProcessorConfiguration:
             # Note: Stripe uses statement_descriptor_suffix for card payments
             call_kwargs = mock_create.call_args.kwargs
             assert call_kwargs["statement_descriptor_suffix"] == "CUSTOM DESC"
+            # The processor's own key is sent, not the module-level default
+            assert call_kwargs["api_key"] == stripe_processor.api_key
 
     @pytest.mark.asyncio
     async def test_uses_config_metadata(
@@ -4,11 +4,12 @@ These tests verify that events and read model updates are truly atomic.
 """
 
 import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+import asyncpg
 import pytest
 
-from auth_processor_worker.infrastructure import transaction
+from auth_processor_worker.infrastructure import locking, transaction
 
 
 @pytest.fixture
@@ -47,59 +48,26 @@ class TestAuthAttemptStarted:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
                 return_value=2,
-            ) as mock_get_seq:
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ) as mock_write_event:
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing"
-                    ) as mock_update:
-                        sequence = await transaction.record_auth_attempt_started(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                            metadata=metadata,
-                        )
+            ) as mock_update:
+                sequence = await transaction.record_auth_attempt_started(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                    metadata=metadata,
+                )
 
         assert sequence == 2
-        mock_get_seq.assert_called_once_with(mock_connection, auth_request_id)
-        mock_write_event.assert_called_once()
+        event = mock_update.call_args.kwargs["event"]
+        assert event.aggregate_id == auth_request_id
+        assert event.event_data == event_data
+        assert event.metadata == metadata
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=2,
+            event=ANY,
         )
 
-    @pytest.mark.asyncio
-    async def test_record_auth_attempt_started_rollback_on_event_write_failure(
-        self, mock_connection, mock_transaction_context
-    ):
-        """Test that transaction rolls back if event write fails."""
-        auth_request_id = uuid.uuid4()
-        event_data = b"test_event_data"
-
-        with patch(
-            "auth_processor_worker.infrastructure.transaction.database.transaction",
-            return_value=mock_transaction_context,
-        ):
-            with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
-                return_value=2,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event",
-                    side_effect=Exception("Database error"),
-                ):
-                    with pytest.raises(Exception, match="Database error"):
-                        await transaction.record_auth_attempt_started(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                        )
-
-        # Verify transaction context manager was called (implicitly rolls back)
-        mock_transaction_context.__aexit__.assert_called_once()
-
     @pytest.mark.asyncio
     async def test_record_auth_attempt_started_rollback_on_read_model_failure(
         self, mock_connection, mock_transaction_context
@@ -113,21 +81,14 @@ class TestAuthAttemptStarted:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
-                return_value=2,
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
+                side_effect=Exception("Read model update failed"),
             ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
-                        side_effect=Exception("Read model update failed"),
-                    ):
-                        with pytest.raises(Exception, match="Read model update failed"):
-                            await transaction.record_auth_attempt_started(
-                                auth_request_id=auth_request_id,
-                                event_data=event_data,
-                            )
+                with pytest.raises(Exception, match="Read model update failed"):
+                    await transaction.record_auth_attempt_started(
+                        auth_request_id=auth_request_id,
+                        event_data=event_data,
+                    )
 
         # Verify transaction context manager was called (implicitly rolls back)
         mock_transaction_context.__aexit__.assert_called_once()
@@ -150,37 +111,36 @@ class TestAuthResponseAuthorized:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_authorized",
                 return_value=3,
-            ) as mock_get_seq:
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ) as mock_write_event:
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_authorized"
-                    ) as mock_update:
-                        sequence = await transaction.record_auth_response_authorized(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                            processor_auth_id="ch_123",
-                            processor_name="stripe",
-                            authorized_amount_cents=1000,
-                            authorization_code="ABC123",
-                            metadata=metadata,
-                        )
+            ) as mock_update:
+                sequence = await transaction.record_auth_response_authorized(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                    processor_auth_id="ch_123",
+                    processor_name="stripe",
+                    authorized_amount_cents=1000,
+                    authorization_code="ABC123",
+                    metadata=metadata,
+                )
 
         assert sequence == 3
-        mock_get_seq.assert_called_once_with(mock_connection, auth_request_id)
-        mock_write_event.assert_called_once()
+        event = mock_update.call_args.kwargs["event"]
+        assert event.aggregate_id == auth_request_id
+        assert event.event_data == event_data
+        assert event.metadata == metadata
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=3,
+            event=ANY,
             processor_auth_id="ch_123",
             processor_name="stripe",
             authorized_amount_cents=1000,
             authorization_code="ABC123",
+            release_lock_worker_id=None,
         )
+        # Completion is signalled by the read-model UPDATE statement itself
+        mock_connection.execute.assert_not_called()
 
 
 class TestAuthResponseDenied:
@@ -199,31 +159,26 @@ class TestAuthResponseDenied:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_denied",
                 return_value=3,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_denied"
-                    ) as mock_update:
-                        sequence = await transaction.record_auth_response_denied(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                            processor_name="stripe",
-                            denial_code="insufficient_funds",
-                            denial_reason="Card has insufficient funds",
-                        )
+            ) as mock_update:
+                sequence = await transaction.record_auth_response_denied(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                    processor_name="stripe",
+                    denial_code="insufficient_funds",
+                    denial_reason="Card has insufficient funds",
+                )
 
         assert sequence == 3
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=3,
+            event=ANY,
             processor_name="stripe",
             denial_code="insufficient_funds",
             denial_reason="Card has insufficient funds",
+            release_lock_worker_id=None,
         )
 
 
@@ -243,25 +198,20 @@ class TestAuthAttemptFailed:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_failed",
                 return_value=4,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_failed"
-                    ) as mock_update:
-                        sequence = await transaction.record_auth_attempt_failed_terminal(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                        )
+            ) as mock_update:
+                sequence = await transaction.record_auth_attempt_failed_terminal(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                )
 
         assert sequence == 4
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=4,
+            event=ANY,
+            release_lock_worker_id=None,
         )
 
     @pytest.mark.asyncio
@@ -277,27 +227,23 @@ class TestAuthAttemptFailed:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_retry_attempt",
                 return_value=3,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_retry_attempt"
-                    ) as mock_update:
-                        sequence = (
-                            await transaction.record_auth_attempt_failed_retryable(
-                                auth_request_id=auth_request_id,
-                                event_data=event_data,
-                            )
-                        )
+            ) as mock_update:
+                sequence = (
+                    await transaction.record_auth_attempt_failed_retryable(
+                        auth_request_id=auth_request_id,
+                        event_data=event_data,
+                    )
+                )
 
         assert sequence == 3
+        # Not terminal - no completion signal
+        mock_connection.execute.assert_not_called()
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=3,
+            event=ANY,
         )
 
 
@@ -317,25 +263,20 @@ class TestAuthRequestExpired:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_expired",
                 return_value=2,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_expired"
-                    ) as mock_update:
-                        sequence = await transaction.record_auth_request_expired(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                        )
+            ) as mock_update:
+                sequence = await transaction.record_auth_request_expired(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                )
 
         assert sequence == 2
         mock_update.assert_called_once_with(
             conn=mock_connection,
             auth_request_id=auth_request_id,
-            sequence_number=2,
+            event=ANY,
+            release_lock_worker_id=None,
         )
 
 
@@ -343,22 +284,22 @@ class TestTransactionAtomicity:
     """Tests to verify transaction atomicity guarantees."""
 
     @pytest.mark.asyncio
-    async def test_sequence_number_fetched_within_transaction(
+    async def test_event_written_within_transaction(
         self, mock_connection, mock_transaction_context
     ):
-        """Verify sequence number is fetched within the transaction context."""
+        """Verify the event (and its sequence number) is written within the transaction."""
         auth_request_id = uuid.uuid4()
         event_data = b"test_event_data"
 
-        sequence_fetch_order = []
+        call_order = []
 
-        async def track_sequence_fetch(conn, agg_id):
-            sequence_fetch_order.append("sequence_fetched")
+        async def track_event_write(conn, **kwargs):
+            call_order.append("event_written")
             return 5
 
         mock_transaction_context.__aenter__ = AsyncMock(
             side_effect=lambda: (
-                sequence_fetch_order.append("transaction_started"),
+                call_order.append("transaction_started"),
                 mock_connection,
             )[1]
         )
@@ -368,65 +309,141 @@ class TestTransactionAtomicity:
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
-                side_effect=track_sequence_fetch,
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
+                side_effect=track_event_write,
             ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event"
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing"
-                    ):
-                        await transaction.record_auth_attempt_started(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                        )
-
-        # Verify sequence was fetched after transaction started
-        assert sequence_fetch_order == ["transaction_started", "sequence_fetched"]
+                sequence = await transaction.record_auth_attempt_started(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                )
+
+        # Verify the event was written after the transaction started
+        assert call_order == ["transaction_started", "event_written"]
+        assert sequence == 5
 
     @pytest.mark.asyncio
-    async def test_all_operations_use_same_connection(
+    async def test_event_and_read_model_share_one_statement(
         self, mock_connection, mock_transaction_context
     ):
-        """Verify all operations use the same connection from transaction context."""
+        """Verify the event is handed to the read model update on the transaction's connection."""
         auth_request_id = uuid.uuid4()
         event_data = b"test_event_data"
 
-        connections_used = []
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction",
+            return_value=mock_transaction_context,
+        ):
+            with patch(
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
+                return_value=2,
+            ) as mock_update:
+                await transaction.record_auth_attempt_started(
+                    auth_request_id=auth_request_id,
+                    event_data=event_data,
+                )
+
+        mock_update.assert_called_once()
+        kwargs = mock_update.call_args.kwargs
+        assert kwargs["conn"] is mock_connection
+        assert kwargs["event"].event_type == transaction.EventType.AUTH_ATTEMPT_STARTED
+        # Nothing else is sent on the connection: no separate sequence lookup or INSERT
+        mock_connection.execute.assert_not_called()
+        mock_connection.fetchval.assert_not_called()
+
+
+class TestSequenceConflictRetry:
+    """Tests for retrying appends that lose the race for a sequence number."""
+
+    @staticmethod
+    def _unique_violation(constraint_name):
+        error = asyncpg.UniqueViolationError("duplicate key value")
+        error.constraint_name = constraint_name
+        return error
 
-        async def track_connection_get_seq(conn, agg_id):
-            connections_used.append(("get_seq", id(conn)))
-            return 2
+    @pytest.mark.asyncio
+    async def test_sequence_conflict_is_retried_in_new_transaction(
+        self, mock_transaction_context
+    ):
+        """Test that a unique_aggregate_sequence violation reruns the transaction."""
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction",
+            return_value=mock_transaction_context,
+        ) as mock_transaction:
+            with patch(
+                "auth_processor_worker.infrastructure.transaction.read_model.update_retry_attempt",
+                side_effect=[self._unique_violation(transaction.SEQUENCE_CONSTRAINT), 4],
+            ) as mock_update:
+                sequence = await transaction.record_auth_attempt_failed_retryable(
+                    auth_request_id=uuid.uuid4(),
+                    event_data=b"test_event_data",
+                )
 
-        async def track_connection_write_event(conn, **kwargs):
-            connections_used.append(("write_event", id(conn)))
+        assert sequence == 4
+        assert mock_update.call_count == 2
+        assert mock_transaction.call_count == 2
 
-        async def track_connection_update(conn, **kwargs):
-            connections_used.append(("update_read_model", id(conn)))
+    @pytest.mark.asyncio
+    async def test_sequence_conflict_retries_are_bounded(self, mock_transaction_context):
+        """Test that the last conflict is raised after SEQUENCE_CONFLICT_ATTEMPTS."""
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction",
+            return_value=mock_transaction_context,
+        ):
+            with patch(
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
+                side_effect=self._unique_violation(transaction.SEQUENCE_CONSTRAINT),
+            ) as mock_update:
+                with pytest.raises(asyncpg.UniqueViolationError):
+                    await transaction.record_auth_attempt_started(
+                        auth_request_id=uuid.uuid4(),
+                        event_data=b"test_event_data",
+                    )
 
+        assert mock_update.call_count == transaction.SEQUENCE_CONFLICT_ATTEMPTS
+
+    @pytest.mark.asyncio
+    async def test_other_unique_violations_are_not_retried(self, mock_transaction_context):
+        """Test that a duplicate event_id is raised without a retry."""
         with patch(
             "auth_processor_worker.infrastructure.transaction.database.transaction",
             return_value=mock_transaction_context,
         ):
             with patch(
-                "auth_processor_worker.infrastructure.transaction.event_store.get_next_sequence_number",
-                side_effect=track_connection_get_seq,
-            ):
-                with patch(
-                    "auth_processor_worker.infrastructure.transaction.event_store.write_event",
-                    side_effect=track_connection_write_event,
-                ):
-                    with patch(
-                        "auth_processor_worker.infrastructure.transaction.read_model.update_to_processing",
-                        side_effect=track_connection_update,
-                    ):
-                        await transaction.record_auth_attempt_started(
-                            auth_request_id=auth_request_id,
-                            event_data=event_data,
-                        )
-
-        # Verify all operations used the same connection
-        conn_ids = [conn_id for _, conn_id in connections_used]
-        assert len(set(conn_ids)) == 1, "All operations must use same connection"
-        assert len(connections_used) == 3, "All three operations should have been called"
+                "auth_processor_worker.infrastructure.transaction.read_model.update_to_failed",
+                side_effect=self._unique_violation("payment_events_event_id_key"),
+            ) as mock_update:
+                with pytest.raises(asyncpg.UniqueViolationError):
+                    await transaction.record_auth_attempt_failed_terminal(
+                        auth_request_id=uuid.uuid4(),
+                        event_data=b"test_event_data",
+                    )
+
+        mock_update.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_acquire_and_start_is_retried_on_sequence_conflict(
+        self, mock_connection, mock_transaction_context
+    ):
+        """Test that a conflicting AuthAttemptStarted reruns the lock's transaction."""
+        mock_connection.fetchrow.return_value = {"acquired": True, "void_detected": False}
+
+        with patch(
+            "auth_processor_worker.infrastructure.transaction.database.transaction",
+            return_value=mock_transaction_context,
+        ) as mock_transaction:
+            with patch(
+                "auth_processor_worker.infrastructure.locking.append_auth_attempt_started",
+                side_effect=[self._unique_violation(transaction.SEQUENCE_CONSTRAINT), 1],
+            ) as mock_append:
+                result = await locking.acquire_and_start(
+                    auth_request_id=uuid.uuid4(),
+                    worker_id="worker-1",
+                    ttl_seconds=30,
+                    started_event_data=b"started",
+                    expired_event_data=b"expired",
+                )
+
+        assert result == locking.LockStartResult.ACQUIRED_STARTED
+        assert mock_connection.fetchrow.call_count == 2
+        assert mock_append.call_count == 2
+        assert mock_transaction.call_count == 2
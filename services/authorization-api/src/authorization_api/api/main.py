@@ -10,6 +10,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from authorization_api.config import settings
+from authorization_api.infrastructure.completion_listener import (
+    start_completion_listener,
+    stop_completion_listener,
+)
 from authorization_api.infrastructure.database import close_pool, get_pool
 from authorization_api.logging_config import configure_logging
 from authorization_api.api.routes import authorize, status
@@ -29,6 +33,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     Handles startup and shutdown:
     - Initialize database pool
+    - Start the completion listener used by /wait
     - Start outbox processor
     - Clean up on shutdown
     """
@@ -48,6 +53,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         logger.error("failed_to_initialize_database", error=str(e))
         raise
 
+    # One LISTEN connection, outside the pool, for all /wait requests
+    await start_completion_listener()
+
     # Start outbox processor if enabled
     global _outbox_processor_task
     if settings.outbox_processor_enabled:
@@ -73,6 +81,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             pass
         logger.info("outbox_processor_stopped")
 
+    await stop_completion_listener()
+
     # Close database pool
     await close_pool()
 
@@ -25,7 +25,7 @@ from authorization_api.domain.read_models import (
     map_status_to_proto,
 )
 from authorization_api.infrastructure.database import transaction
-from authorization_api.infrastructure.event_store import write_event
+from authorization_api.infrastructure.event_store import new_event_id, write_event
 from authorization_api.infrastructure.outbox import write_outbox_message
 
 logger = structlog.get_logger()
@@ -278,7 +278,7 @@ async def post_authorize(request: Request) -> JSONResponse:
 
     # Generate new auth_request_id
     auth_request_id = uuid.uuid4()
-    event_id = uuid.uuid4()
+    event_id = new_event_id()
 
     # Convert metadata to dict
     metadata_dict = auth_request.metadata if auth_request.metadata else None
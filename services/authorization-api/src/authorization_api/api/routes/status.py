@@ -1,5 +1,6 @@
-"""GET /authorize/{id}/status endpoint implementation."""
+"""GET /authorize/{id}/status and /wait endpoint implementations."""
 
+import asyncio
 import uuid
 
 import asyncpg
@@ -8,12 +9,18 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 
 from authorization_api.domain.read_models import get_auth_request_state
+from authorization_api.infrastructure.completion_listener import get_completion_listener
 from authorization_api.infrastructure.database import get_connection
 
 logger = structlog.get_logger()
 
 router = APIRouter()
 
+TERMINAL_STATUSES = ("AUTHORIZED", "DENIED", "FAILED", "VOIDED", "EXPIRED")
+
+# Upper bound on how long a /wait request may wait for completion
+MAX_WAIT_SECONDS = 30.0
+
 
 def _build_result_dict(record) -> dict:
     """Build authorization result dictionary from database record.
@@ -154,3 +161,70 @@ async def get_status(auth_request_id: str, restaurant_id: str) -> JSONResponse:
             content=response,
             status_code=200,
         )
+
+
+@router.get("/v1/authorize/{auth_request_id}/wait")
+async def wait_for_completion(
+    auth_request_id: str, restaurant_id: str, timeout: float = 10.0
+) -> JSONResponse:
+    """Wait for an authorization request to reach a terminal status.
+
+    Subscribes to the shared completion listener before reading the read
+    model, so a completion committed between the read and the wait is not
+    missed. Returns as soon as the worker signals completion, or with the
+    current (non-terminal) status once the timeout elapses; callers should
+    fall back to polling /status in that case.
+
+    Pooled connections are only held for each status read, not while
+    waiting; the timeout is capped at MAX_WAIT_SECONDS.
+
+    Args:
+        auth_request_id: Authorization request UUID (path parameter)
+        restaurant_id: Restaurant UUID (query parameter)
+        timeout: Seconds to wait for completion (query parameter)
+
+    Returns:
+        JSON response with the same body as GET /status
+
+    Raises:
+        HTTPException: 400 if invalid UUIDs, 404 if not found or restaurant mismatch
+    """
+    try:
+        auth_request_uuid = uuid.UUID(auth_request_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid auth_request_id format"
+        )
+
+    try:
+        restaurant_uuid = uuid.UUID(restaurant_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid restaurant_id format")
+
+    timeout = min(max(timeout, 0.0), MAX_WAIT_SECONDS)
+
+    with get_completion_listener().subscribe(auth_request_uuid) as completed:
+        async with get_connection() as conn:
+            response = await build_status_response(
+                conn, auth_request_uuid, restaurant_uuid
+            )
+
+        if response["status"] not in TERMINAL_STATUSES:
+            try:
+                await asyncio.wait_for(completed, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.info(
+                    "wait_for_completion_timeout",
+                    auth_request_id=auth_request_id,
+                    timeout=timeout,
+                )
+            else:
+                async with get_connection() as conn:
+                    response = await build_status_response(
+                        conn, auth_request_uuid, restaurant_uuid
+                    )
+
+    return JSONResponse(
+        content=response,
+        status_code=200,
+    )
@@ -0,0 +1,162 @@
+"""Shared LISTEN connection that wakes /wait requests on auth completion.
+
+The auth processor worker sends NOTIFY on AUTH_COMPLETED_CHANNEL, with the
+auth_request_id as payload, when a request reaches a terminal status. One
+dedicated connection (outside the pool) LISTENs for the whole process and
+resolves the futures of the requests waiting on that auth_request_id, so
+waiting requests hold no pooled connection.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import asyncpg
+import structlog
+
+from authorization_api.config import settings
+
+logger = structlog.get_logger()
+
+# NOTIFY channel the auth processor worker signals on terminal status changes
+AUTH_COMPLETED_CHANNEL = "auth_completed"
+
+# Delay between attempts to re-open a lost listener connection
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class CompletionListener:
+    """Dispatches auth completion notifications to waiting requests."""
+
+    def __init__(self) -> None:
+        self._conn: asyncpg.Connection | None = None
+        self._waiters: dict[uuid.UUID, set[asyncio.Future[None]]] = {}
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Open the listener connection and LISTEN on AUTH_COMPLETED_CHANNEL."""
+        self._stopping = False
+        await self._connect()
+        logger.info("completion_listener_started", channel=AUTH_COMPLETED_CHANNEL)
+
+    async def stop(self) -> None:
+        """Close the listener connection and release all waiters."""
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+        self._wake_all()
+        logger.info("completion_listener_stopped")
+
+    @contextmanager
+    def subscribe(self, auth_request_id: uuid.UUID) -> Iterator[asyncio.Future[None]]:
+        """Register a waiter for auth_request_id for the duration of the block.
+
+        Subscribe before reading the status: a completion committed after
+        the read then resolves the future instead of being missed.
+
+        Yields:
+            Future resolved when the worker signals completion (or when the
+            listener connection is lost, so the caller re-reads the status)
+        """
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(auth_request_id, set())
+        waiters.add(future)
+        try:
+            yield future
+        finally:
+            waiters.discard(future)
+            if not waiters:
+                self._waiters.pop(auth_request_id, None)
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(
+            dsn=settings.database_url,
+            server_settings={"application_name": f"{settings.service_name}-listener"},
+        )
+        await conn.add_listener(AUTH_COMPLETED_CHANNEL, self._on_notification)
+        conn.add_termination_listener(self._on_termination)
+        self._conn = conn
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            auth_request_id = uuid.UUID(payload)
+        except ValueError:
+            logger.warning("invalid_completion_payload", payload=payload)
+            return
+        for future in self._waiters.get(auth_request_id, ()):
+            if not future.done():
+                future.set_result(None)
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopping or connection is not self._conn:
+            return
+        logger.warning("completion_listener_connection_lost")
+        self._conn = None
+        # Notifications may have been missed: let every waiter re-read
+        self._wake_all()
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("completion_listener_reconnect_failed", error=str(e))
+                continue
+            logger.info("completion_listener_reconnected")
+            return
+
+    def _wake_all(self) -> None:
+        for waiters in self._waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_result(None)
+
+
+# Global listener (started and stopped by the app lifespan)
+_listener: CompletionListener | None = None
+
+
+async def start_completion_listener() -> CompletionListener:
+    """Start the global completion listener.
+
+    Returns:
+        CompletionListener: The started listener
+    """
+    global _listener
+    if _listener is None:
+        listener = CompletionListener()
+        await listener.start()
+        _listener = listener
+    return _listener
+
+
+def get_completion_listener() -> CompletionListener:
+    """Get the global completion listener.
+
+    Returns:
+        CompletionListener: The started listener
+
+    Raises:
+        RuntimeError: If the listener has not been started
+    """
+    if _listener is None:
+        raise RuntimeError("Completion listener is not started")
+    return _listener
+
+
+async def stop_completion_listener() -> None:
+    """Stop the global completion listener."""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        await listener.stop()
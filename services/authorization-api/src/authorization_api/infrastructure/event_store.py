@@ -1,6 +1,8 @@
 """Event store implementation for writing and reading events."""
 
 import json
+import os
+import time
 import uuid
 from typing import Any
 
@@ -10,6 +12,24 @@ import structlog
 logger = structlog.get_logger()
 
 
+def new_event_id() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 event ID (RFC 9562).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so IDs
+    generated later sort later. This keeps inserts into the unique index on
+    payment_events.event_id append-mostly instead of scattering them across
+    the btree like random UUIDv4s.
+
+    Returns:
+        New UUIDv7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 9562 variant
+    return uuid.UUID(int=value)
+
+
 async def write_event(
     conn: asyncpg.Connection,
     event_id: uuid.UUID,
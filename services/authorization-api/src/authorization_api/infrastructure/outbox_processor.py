@@ -22,7 +22,8 @@ async def fetch_unprocessed_messages(conn, limit: int) -> list[dict]:
     """Fetch unprocessed outbox messages.
 
     Uses FOR UPDATE SKIP LOCKED to prevent multiple processors from
-    processing the same messages.
+    processing the same messages. Rows are ordered by the identity column,
+    which (unlike created_at) is monotonic across concurrent writers.
 
     Args:
         conn: Database connection
@@ -36,7 +37,7 @@ async def fetch_unprocessed_messages(conn, limit: int) -> list[dict]:
         SELECT id, aggregate_id, message_type, payload
         FROM outbox
         WHERE processed_at IS NULL
-        ORDER BY created_at
+        ORDER BY id
         LIMIT $1
         FOR UPDATE SKIP LOCKED
         """,
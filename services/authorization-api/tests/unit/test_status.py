@@ -1,5 +1,7 @@
-"""Unit tests for GET /authorize/{id}/status endpoint."""
+"""Unit tests for GET /authorize/{id}/status and /wait endpoints."""
 
+import asyncio
+import json
 import uuid
 from datetime import datetime
 from unittest.mock import AsyncMock, patch
@@ -295,3 +297,159 @@ async def test_get_status_400_invalid_restaurant_id():
 
     assert exc_info.value.status_code == 400
     assert "restaurant_id" in str(exc_info.value.detail).lower()
+
+
+def _state_record(auth_request_id, restaurant_id, status):
+    """Build an auth_request_state record for the wait endpoint tests."""
+    return {
+        "auth_request_id": auth_request_id,
+        "restaurant_id": restaurant_id,
+        "status": status,
+        "processor_name": "mock" if status == "AUTHORIZED" else None,
+        "processor_auth_id": "pi_123" if status == "AUTHORIZED" else None,
+        "authorization_code": "ABC123" if status == "AUTHORIZED" else None,
+        "created_at": datetime(2024, 1, 1, 12, 0, 0),
+        "updated_at": datetime(2024, 1, 1, 12, 0, 1),
+    }
+
+
+@pytest.fixture
+def completion_listener():
+    """Provide a started completion listener without a database connection."""
+    from authorization_api.infrastructure.completion_listener import CompletionListener
+
+    listener = CompletionListener()
+    with patch(
+        "authorization_api.api.routes.status.get_completion_listener",
+        return_value=listener,
+    ):
+        yield listener
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_when_completion_is_notified(completion_listener):
+    """Test that GET /wait returns the final status once NOTIFY arrives."""
+    from authorization_api.api.routes.status import wait_for_completion
+
+    auth_request_id = uuid.uuid4()
+    restaurant_id = uuid.uuid4()
+    records = [
+        _state_record(auth_request_id, restaurant_id, "PROCESSING"),
+        _state_record(auth_request_id, restaurant_id, "AUTHORIZED"),
+    ]
+    mock_conn = AsyncMock()
+
+    async def get_state(conn, request_id):
+        record = records.pop(0)
+        if record["status"] == "PROCESSING":
+            # Worker commits while the endpoint is waiting
+            asyncio.get_running_loop().call_soon(
+                completion_listener._on_notification,
+                None,
+                1,
+                "auth_completed",
+                str(auth_request_id),
+            )
+        return record
+
+    with patch(
+        "authorization_api.api.routes.status.get_connection"
+    ) as mock_get_conn, patch(
+        "authorization_api.api.routes.status.get_auth_request_state",
+        side_effect=get_state,
+    ):
+        mock_get_conn.return_value.__aenter__.return_value = mock_conn
+        mock_get_conn.return_value.__aexit__.return_value = None
+
+        response = await wait_for_completion(
+            auth_request_id=str(auth_request_id),
+            restaurant_id=str(restaurant_id),
+            timeout=5.0,
+        )
+
+        # The connection is only held for each read, not while waiting
+        assert mock_get_conn.call_count == 2
+
+    body = json.loads(response.body)
+    assert body["status"] == "AUTHORIZED"
+    assert body["result"]["processor_auth_code"] == "ABC123"
+    assert completion_listener._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_already_complete(completion_listener):
+    """Test that GET /wait does not wait for a request that is already terminal."""
+    from authorization_api.api.routes.status import wait_for_completion
+
+    auth_request_id = uuid.uuid4()
+    restaurant_id = uuid.uuid4()
+    mock_conn = AsyncMock()
+
+    with patch(
+        "authorization_api.api.routes.status.get_connection"
+    ) as mock_get_conn, patch(
+        "authorization_api.api.routes.status.get_auth_request_state"
+    ) as mock_get_state:
+        mock_get_conn.return_value.__aenter__.return_value = mock_conn
+        mock_get_conn.return_value.__aexit__.return_value = None
+        mock_get_state.return_value = _state_record(
+            auth_request_id, restaurant_id, "AUTHORIZED"
+        )
+
+        response = await wait_for_completion(
+            auth_request_id=str(auth_request_id),
+            restaurant_id=str(restaurant_id),
+            timeout=30.0,
+        )
+
+    assert json.loads(response.body)["status"] == "AUTHORIZED"
+    mock_get_state.assert_called_once()
+    assert completion_listener._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_current_status_on_timeout(completion_listener):
+    """Test that GET /wait returns the in-flight status when nothing is notified."""
+    from authorization_api.api.routes.status import wait_for_completion
+
+    auth_request_id = uuid.uuid4()
+    restaurant_id = uuid.uuid4()
+    mock_conn = AsyncMock()
+
+    with patch(
+        "authorization_api.api.routes.status.get_connection"
+    ) as mock_get_conn, patch(
+        "authorization_api.api.routes.status.get_auth_request_state"
+    ) as mock_get_state:
+        mock_get_conn.return_value.__aenter__.return_value = mock_conn
+        mock_get_conn.return_value.__aexit__.return_value = None
+        mock_get_state.return_value = _state_record(
+            auth_request_id, restaurant_id, "PROCESSING"
+        )
+
+        response = await wait_for_completion(
+            auth_request_id=str(auth_request_id),
+            restaurant_id=str(restaurant_id),
+            timeout=0.01,
+        )
+
+    assert response.status_code == 200
+    assert json.loads(response.body)["status"] == "PROCESSING"
+    assert completion_listener._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_completion_wakes_only_waiters_of_that_request():
+    """Test that one NOTIFY resolves the waiters of its auth request only."""
+    from authorization_api.infrastructure.completion_listener import CompletionListener
+
+    listener = CompletionListener()
+    completed_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    with listener.subscribe(completed_id) as first, listener.subscribe(
+        completed_id
+    ) as second, listener.subscribe(other_id) as other:
+        listener._on_notification(None, 1, "auth_completed", str(completed_id))
+
+        assert first.done() and second.done()
+        assert not other.done()
@@ -131,6 +131,34 @@ class AuthorizationAPIClient:
         # Parse and return JSON response
         return response.json()
 
+    async def wait_for_completion(
+        self, auth_request_id: uuid.UUID, restaurant_id: uuid.UUID, timeout: float = 10.0
+    ) -> dict[str, Any]:
+        """Wait server-side for authorization to complete.
+
+        The API holds the request open until the worker signals completion or
+        the timeout elapses, so the returned status may still be in flight.
+
+        Args:
+            auth_request_id: Authorization request UUID
+            restaurant_id: Restaurant UUID
+            timeout: Seconds the server should wait for completion
+
+        Returns:
+            JSON response dict with the same shape as get_status
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        response = await self.client.get(
+            f"/v1/authorize/{auth_request_id}/wait",
+            params={"restaurant_id": str(restaurant_id), "timeout": timeout},
+            timeout=timeout + 5.0,
+        )
+        response.raise_for_status()
+
+        return response.json()
+
     async def poll_until_complete(
         self,
         auth_request_id: uuid.UUID,
@@ -140,11 +168,14 @@ class AuthorizationAPIClient:
     ) -> dict[str, Any]:
         """Poll status until authorization completes.
 
+        Polls with exponential backoff starting at 50ms, so fast completions
+        are seen after a few round trips and slow ones do not hammer the API.
+
         Args:
             auth_request_id: Authorization request UUID
             restaurant_id: Restaurant UUID
             timeout: Maximum time to poll in seconds
-            interval: Time between polls in seconds
+            interval: Maximum time between polls in seconds
 
         Returns:
             JSON response dict when complete
@@ -152,15 +183,18 @@ class AuthorizationAPIClient:
         Raises:
             TimeoutError: If authorization doesn't complete within timeout
         """
-        start = asyncio.get_event_loop().time()
-        while asyncio.get_event_loop().time() - start < timeout:
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        delay = 0.05
+        while (remaining := deadline - loop.time()) > 0:
             status = await self.get_status(auth_request_id, restaurant_id)
 
             # Check if completed (status values are strings: "AUTHORIZED", "DENIED", "FAILED")
             if status["status"] in ("AUTHORIZED", "DENIED", "FAILED"):
                 return status
 
-            await asyncio.sleep(interval)
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 1.6, interval)
 
         raise TimeoutError(
             f"Authorization {auth_request_id} did not complete within {timeout}s"